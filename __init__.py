@@ -1 +1,15 @@
-from nuclide_data import *
+# Everything is read from nuclide_data on each access, rather than copied
+#  here: the data tables are loaded on first access, the settings
+#  (store_file, cache_dir, nominal_only, ...) stay current, and the lookup
+#  functions are the instrumented ones while enable_stats() is on.
+#  Settings must be changed on nuclide_data itself; assigning one on the
+#  package only shadows it here.
+import nuclide_data as _nuclide_data
+
+
+def __getattr__(name):
+    return getattr(_nuclide_data, name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_nuclide_data.__all__))
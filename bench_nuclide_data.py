@@ -0,0 +1,731 @@
+#!/usr/bin/env python
+"""
+Benchmarks for nuclide_data
+
+Run as a script: python bench_nuclide_data.py [-o results.json]
+                     [--compare earlier.json] [names ...]
+
+Only benchmarks whose function name contains one of `names` are run.  With
+-o, the results are saved as JSON, together with the git commit and the
+versions of Python and NumPy, to compare later runs against with --compare.
+Everything runs offline, from the data files in this directory.
+
+"""
+
+import argparse
+import datetime
+import json
+import os
+import os.path
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+basepath = os.path.dirname(os.path.abspath(__file__))
+
+
+def python_env(cache_dir='', nominal_only=False, store_file=''):
+    """
+    Environment for a fresh interpreter.  The nuclide data cache is
+    disabled unless a `cache_dir` is given.
+    """
+    return dict(os.environ, NUCLIDE_DATA_CACHE_DIR=cache_dir,
+                NUCLIDE_DATA_NOMINAL_ONLY='1' if nominal_only else '',
+                NUCLIDE_DATA_STORE=store_file)
+
+
+def time_python(code, repeat=5, cache_dir='', nominal_only=False, store_file=''):
+    """Best wall time in seconds of running `code` in a fresh interpreter."""
+    command = [sys.executable, '-c', code]
+    env = python_env(cache_dir, nominal_only, store_file)
+    return min(timeit.repeat(
+        lambda: subprocess.check_call(command, cwd=basepath, env=env,
+                                      stderr=subprocess.DEVNULL),
+        number=1, repeat=repeat))
+
+
+def peak_memory(code, cache_dir='', nominal_only=False, store_file=''):
+    """Peak resident memory in bytes of running `code` in a fresh interpreter."""
+    code += "\nimport resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=basepath,
+                                     env=python_env(cache_dir, nominal_only,
+                                                    store_file),
+                                     stderr=subprocess.DEVNULL)
+    # ru_maxrss is in kilobytes on Linux
+    return 1024 * int(output.split()[-1])
+
+
+def time_call(func, number=None):
+    """Best time in seconds per call of `func()`, in this interpreter."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def bench_import():
+    """Import time, with lazy loading and with every data source loaded."""
+    return {
+        'interpreter + numpy, uncertainties': time_python(
+            'import numpy, uncertainties'),
+        'import (lazy)': time_python('import nuclide_data'),
+        'import + load_all()': time_python(
+            'import nuclide_data; nuclide_data.load_all()'),
+        'import + mats': time_python(
+            'import nuclide_data; nuclide_data.mats'),
+        'import + weight("U-235")': time_python(
+            'import nuclide_data; nuclide_data.weight("U-235")'),
+    }
+
+
+def bench_cache():
+    """Load time of every data source, parsed and from the cache."""
+    cache_dir = tempfile.mkdtemp()
+    try:
+        code = 'import nuclide_data; nuclide_data.load_all()'
+        results = {'parse data files': time_python(code)}
+
+        # Write the cache, then time reading it
+        time_python(code, repeat=1, cache_dir=cache_dir)
+        results['read cache'] = time_python(
+            'import nuclide_data; nuclide_data.nuclides; nuclide_data.mats',
+            cache_dir=cache_dir)
+    finally:
+        shutil.rmtree(cache_dir)
+
+    return results
+
+
+def bench_nominal_only():
+    """Load time of every data source, with ufloats and nominal only."""
+    cache_dir = tempfile.mkdtemp()
+    code = 'import nuclide_data; nuclide_data.load_all()'
+    results = {}
+    try:
+        for nominal_only, mode in [(False, 'ufloat'), (True, 'nominal only')]:
+            results['parse data files, ' + mode] = time_python(
+                code, nominal_only=nominal_only)
+            time_python(code, repeat=1, cache_dir=cache_dir,
+                        nominal_only=nominal_only)
+            results['read cache, ' + mode] = time_python(
+                'import nuclide_data; nuclide_data.nuclides; nuclide_data.mats',
+                cache_dir=cache_dir, nominal_only=nominal_only)
+    finally:
+        shutil.rmtree(cache_dir)
+    return results
+
+
+def store_code(store_file):
+    """Code that writes a memory-mapped store of the data to `store_file`."""
+    return 'import nuclide_data; nuclide_data.write_store({!r})'.format(store_file)
+
+
+# A few lookups of each kind the store serves
+store_lookups = ("import nuclide_data as nd\n"
+                 "nd.nuc(92, 235); nd.weight('U-235'); nd.isomers(95, 242)\n"
+                 "nd.Nuclide('Am242m')")
+
+
+def bench_store():
+    """Lookups in a fresh interpreter, from the cache and from a store."""
+    cache_dir = tempfile.mkdtemp()
+    store_file = os.path.join(cache_dir, 'nuclides.store')
+    try:
+        time_python(store_code(store_file), repeat=1, cache_dir=cache_dir)
+        return {'read cache': time_python(store_lookups, cache_dir=cache_dir),
+                'memory-mapped store': time_python(store_lookups,
+                                                   store_file=store_file)}
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def bench_parallel_load():
+    """Cold start, load_all() parsing every data file, by load_workers."""
+    results = {}
+    for workers, processes in [(1, False), (2, False), (4, False), (4, True)]:
+        name = '{} {}'.format(workers, 'processes' if processes else
+                              'threads' if workers > 1 else 'worker')
+        results[name] = time_python(
+            'import nuclide_data; nuclide_data.load_all(workers={}, processes={})'
+            .format(workers, processes))
+    return results
+
+
+def bench_tables():
+    """Export of tables() and import with read_tables(), by format."""
+    import nuclide_data
+
+    nuclide_data.load_all()
+    table_dir = tempfile.mkdtemp()
+    results = {'tables()': time_call(nuclide_data.tables, number=1)}
+    try:
+        for format, name in [('npz', 'tables.npz'), ('csv', 'csv')]:
+            path = os.path.join(table_dir, name)
+            results['write_tables(), ' + format] = time_call(
+                lambda: nuclide_data.write_tables(path, format), number=1)
+            results['read_tables(), ' + format] = time_call(
+                lambda: nuclide_data.read_tables(path, format), number=1)
+    finally:
+        shutil.rmtree(table_dir)
+    return results
+
+
+def bench_memory():
+    """Peak resident memory of import, load_all() and a memory-mapped store."""
+    code = 'import nuclide_data; nuclide_data.load_all()'
+    return {'interpreter + numpy, uncertainties': peak_memory(
+                'import numpy, uncertainties'),
+            'import (lazy)': peak_memory('import nuclide_data'),
+            'load_all(), ufloat': peak_memory(code),
+            'load_all(), nominal only': peak_memory(code, nominal_only=True),
+            'lookups, memory-mapped store': store_memory()}
+
+bench_memory.unit = 'MiB'
+
+
+def store_memory():
+    """Peak resident memory of a few lookups from a memory-mapped store."""
+    store_dir = tempfile.mkdtemp()
+    store_file = os.path.join(store_dir, 'nuclides.store')
+    try:
+        time_python(store_code(store_file), repeat=1)
+        return peak_memory(store_lookups, store_file=store_file)
+    finally:
+        shutil.rmtree(store_dir)
+
+
+def bench_parse_files():
+    """Data file parsing, per wallet card line and per NIST nuclide."""
+    import nuclide_data
+
+    lines = nuclide_data.wallet_lines
+    chunks = nuclide_data.nist_nuclide_raw_list
+
+    def parse_lines():
+        return [nuclide_data.parse_one_wallet_line(line) for line in lines]
+
+    def parse_chunks():
+        return [nuclide_data.parse_one_chunk(chunk) for chunk in chunks]
+
+    return {'parse_one_wallet_line': time_call(parse_lines, number=1) / len(lines),
+            'parse_one_chunk': time_call(parse_chunks, number=1) / len(chunks)}
+
+bench_parse_files.unit = 'us'
+
+
+def bench_wallet_columns():
+    """The whole wallet card file, per line and in columns."""
+    import nuclide_data
+
+    lines = nuclide_data.wallet_lines
+    byte_lines = [line.encode('ascii') for line in lines]
+
+    return {'parse_one_wallet_line, every line': time_call(
+                lambda: [nuclide_data.parse_one_wallet_line(line) for line in lines],
+                number=1),
+            'parse_wallet_columns': time_call(
+                lambda: nuclide_data.parse_wallet_columns(byte_lines), number=1),
+            'read_wallet_columns (decompress + parse)': time_call(
+                nuclide_data.read_wallet_columns, number=1)}
+
+
+def bench_construction():
+    """Nuclide construction for each identifier form."""
+    import warnings
+    import nuclide_data
+
+    class Identifier:
+        Z, A = 92, 235
+
+    forms = [('U235',), ('U-235',), ('235U',), ('235-U',), ('u235',),
+             (92235,), ('92235',), ((92, 235),), ([92, 235],),
+             ({'Z': 92, 'A': 235},), (Identifier(),), ((13, 26, 0.2283),),
+             ('Al26', 0.2283), ('Am242m',), ((95, 242), 0., True)]
+
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for args in forms:
+            name = 'Nuclide({})'.format(', '.join(
+                type(arg).__name__ if isinstance(arg, Identifier) else repr(arg)
+                for arg in args))
+            results[name] = time_call(lambda: nuclide_data.Nuclide(*args))
+    return results
+
+bench_construction.unit = 'us'
+
+
+def bench_lookups():
+    """Scalar lookups: weight(), nuc(), isomers() and isomer matching, MATs."""
+    import nuclide_data
+
+    nuclide_data.load_all()
+    u235 = nuclide_data.Nuclide('U235')
+    return {
+        "weight('U')": time_call(lambda: nuclide_data.weight('U')),
+        "weight(92)": time_call(lambda: nuclide_data.weight(92)),
+        "weight('U-235')": time_call(lambda: nuclide_data.weight('U-235')),
+        "weight('U', 235)": time_call(lambda: nuclide_data.weight('U', 235)),
+        "weight(92, 235)": time_call(lambda: nuclide_data.weight(92, 235)),
+        "return_nominal_value(92, 235, 0., 'half-life')": time_call(
+            lambda: nuclide_data.return_nominal_value(92, 235, 0., 'half-life')),
+        "Nuclide('U235').half_life()": time_call(u235.half_life),
+        "Nuclide('U235').decay_const()": time_call(u235.decay_const),
+        "nuc(92, 235)": time_call(lambda: nuclide_data.nuc(92, 235)),
+        "nuc(95, 242, 0.0486)": time_call(lambda: nuclide_data.nuc(95, 242, 0.0486)),
+        "isomers(95, 242)": time_call(lambda: nuclide_data.isomers(95, 242)),
+        "nuc(95, 242, 0.04860001, tolerance=1e-6)": time_call(
+            lambda: nuclide_data.nuc(95, 242, 0.04860001, tolerance=1e-6)),
+        "closest of isomers(7, 14) to 8.9639999": time_call(
+            lambda: min(nuclide_data.isomers(7, 14),
+                        key=lambda E: abs(E - 8.9639999))),
+        "nearest_isomer(7, 14, 8.9639999)": time_call(
+            lambda: nuclide_data.nearest_isomer(7, 14, 8.9639999)),
+        "isomer_index(7, 14, 8.9639999)": time_call(
+            lambda: nuclide_data.isomer_index(7, 14, 8.9639999)),
+        "mat_nuclides()[9228]": time_call(lambda: nuclide_data.mat_nuclides()[9228]),
+        "library_mats()[(92, 235, False)]": time_call(
+            lambda: nuclide_data.library_mats()[(92, 235, False)]),
+        }
+
+bench_lookups.unit = 'us'
+
+
+def bench_stats():
+    """Lookup overhead of the instrumentation, disabled and enabled."""
+    import nuclide_data
+
+    nuclide_data.load_all()
+    results = {}
+    for enabled in [False, True]:
+        nuclide_data.enable_stats(enabled)
+        state = 'enabled' if enabled else 'disabled'
+        results["weight(92, 235), stats " + state] = time_call(
+            lambda: nuclide_data.weight(92, 235))
+        results["nuc(92, 235), stats " + state] = time_call(
+            lambda: nuclide_data.nuc(92, 235))
+    nuclide_data.enable_stats(False)
+    return results
+
+bench_stats.unit = 'us'
+
+
+def bench_table():
+    """Half-life range query, dictionary scan against the columnar table."""
+    import nuclide_data
+
+    nuclides = nuclide_data.nuclides
+    table = nuclide_data.nuclide_table
+
+    def scan():
+        return [ (Z, A, E) for (Z, A) in nuclides
+                 for E, isomer in nuclides[(Z,A)].items()
+                 if 1. < isomer['half-life'] < 86400. ]
+
+    def vectorized():
+        return table[(table['half_life'] > 1.) & (table['half_life'] < 86400.)]
+
+    return {'dictionary scan': time_call(scan),
+            'nuclide_table mask': time_call(vectorized)}
+
+
+def bench_query():
+    """Property queries, dictionary scan against query()."""
+    import nuclide_data
+
+    nuclides = nuclide_data.nuclides
+
+    def scan(condition):
+        return [ (Z, A, E) for (Z, A) in nuclides
+                 for E, isomer in nuclides[(Z,A)].items()
+                 if condition(Z, A, E, isomer) ]
+
+    queries = [
+        ('1 s <= half-life <= 1 day',
+         lambda Z, A, E, n: 1. <= n['half-life'] <= 86400.,
+         dict(half_life=(1., 86400.))),
+        ('E >= 1 MeV',
+         lambda Z, A, E, n: E >= 1.,
+         dict(E=(1., None))),
+        ('decays by SF',
+         lambda Z, A, E, n: 'SF' in n['decay modes'],
+         dict(decay_mode='SF')),
+        ('50 <= Z <= 60, 100 <= A <= 140, B- or EC',
+         lambda Z, A, E, n: (50 <= Z <= 60 and 100 <= A <= 140
+             and ('B-' in n['decay modes'] or 'EC' in n['decay modes'])),
+         dict(Z=(50, 60), A=(100, 140), decay_mode=['B-', 'EC'])),
+        ]
+
+    nuclide_data.query()
+    results = {}
+    for name, condition, predicates in queries:
+        results[name + ', scan'] = time_call(lambda: scan(condition))
+        results[name + ', query'] = time_call(
+            lambda: nuclide_data.query(**predicates))
+    return results
+
+
+def bench_batch():
+    """Weights and half-lives of 10000 ZAIDs, per call and in one batch."""
+    import numpy as np
+    import nuclide_data
+
+    table = nuclide_data.nuclide_table
+    ground = table[(table['E'] == 0.) & (table['Z'] > 0)]
+    zaids = np.resize(ground['Z'] * 1000 + ground['A'], 10000)
+    zas = [ (int(zaid) // 1000, int(zaid) % 1000) for zaid in zaids ]
+
+    def scalar():
+        for Z, A in zas:
+            try:
+                nuclide_data.weight(Z, A)
+            except KeyError:
+                pass
+
+    return {'weight() loop': time_call(scalar, number=1),
+            'weights(zaids)': time_call(lambda: nuclide_data.weights(zaids)),
+            'half_lives(zaids)': time_call(lambda: nuclide_data.half_lives(zaids)),
+           }
+
+
+def bench_intern():
+    """Nuclide construction per identifier, new instances against interned."""
+    import warnings
+    import nuclide_data
+
+    ids = ['U235', 'U-235', '235U', 'Am242m', 92235, (92, 235), 'Pu239']
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results['Nuclide(id)'] = time_call(
+            lambda: [nuclide_data.Nuclide(nuc_id) for nuc_id in ids]) / len(ids)
+
+        def cold():
+            nuclide_data.intern_nuclide.cache_clear()
+            return [nuclide_data.intern_nuclide(nuc_id) for nuc_id in ids]
+
+        results['intern_nuclide(id), cold'] = time_call(cold) / len(ids)
+        results['intern_nuclide(id), warm'] = time_call(
+            lambda: [nuclide_data.intern_nuclide(nuc_id)
+                     for nuc_id in ids]) / len(ids)
+    return results
+
+bench_intern.unit = 'us'
+
+
+def bench_parse():
+    """Identifier parsing, per call and per item of 100000-long lists."""
+    import nuclide_data
+
+    forms = ['U235', 'U-235', '235U', '235-U', 'Am242m', '92235', '92235.80c']
+    results = {}
+    for form in forms:
+        results['parse_nuclide_id({!r})'.format(form)] = time_call(
+            lambda: nuclide_data.parse_nuclide_id(form))
+
+    table = nuclide_data.nuclide_table
+    ground = table[(table['E'] == 0.) & (table['Z'] > 0)]
+    distinct = ['{}-{}'.format(nuclide_data.z2sym[Z], A)
+                for Z, A in zip(ground['Z'], ground['A'])]
+
+    repeated = (distinct[:50] * 2000)
+    results['parse_nuclide_ids, 50 distinct'] = time_call(
+        lambda: nuclide_data.parse_nuclide_ids(repeated)) / len(repeated)
+
+    unique = (distinct * 100)[:100000]
+    results['parse_nuclide_ids, 3000 distinct'] = time_call(
+        lambda: nuclide_data.parse_nuclide_ids(unique)) / len(unique)
+    return results
+
+bench_parse.unit = 'us'
+
+
+def bench_zaids():
+    """ZAID conversion per item, one at a time and in 1000000-long arrays."""
+    import numpy as np
+    import nuclide_data
+
+    table = nuclide_data.nuclide_table
+    ground = table[table['Z'] > 0]
+    rows = np.random.RandomState(0).randint(len(ground), size=1000000)
+    Z, A = ground['Z'][rows], ground['A'][rows]
+    m = (ground['E'][rows] > 0).astype(int)
+    zaids = nuclide_data.zam2zaids(Z, A, m)
+    names = nuclide_data.zam2zaids(Z, A, m, suffix='80c')
+
+    few = zaids[:10000].tolist()
+    results = {'zaid2za, per ZAID': time_call(
+                   lambda: [nuclide_data.zaid2za(zaid) for zaid in few],
+                   number=1) / len(few)}
+    for convention in nuclide_data.zaid_conventions:
+        results['zaids2zam({!r})'.format(convention)] = time_call(
+            lambda: nuclide_data.zaids2zam(zaids, convention),
+            number=1) / len(zaids)
+        results['zam2zaids({!r})'.format(convention)] = time_call(
+            lambda: nuclide_data.zam2zaids(Z, A, m, convention),
+            number=1) / len(zaids)
+    results["zaids2zam('92235.80c' strings)"] = time_call(
+        lambda: nuclide_data.zaids2zam(names), number=1) / len(zaids)
+    results["zam2zaids(suffix='80c')"] = time_call(
+        lambda: nuclide_data.zam2zaids(Z, A, m, suffix='80c'),
+        number=1) / len(zaids)
+    return results
+
+bench_zaids.unit = 'us'
+
+
+def bench_nuclide_ops():
+    """Nuclide hash, eq and sort, over 3000 shuffled nuclides."""
+    import random
+    import warnings
+    import nuclide_data
+
+    table = nuclide_data.nuclide_table[10:3010]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        nuclides = [nuclide_data.Nuclide((int(Z), int(A), float(E)))
+                    for Z, A, E in zip(table['Z'], table['A'], table['E'])]
+        copies = [nuclide_data.Nuclide((n.Z, n.A, n.E)) for n in nuclides]
+
+    random.seed(0)
+    random.shuffle(nuclides)
+
+    n = len(nuclides)
+    return {'hash, per nuclide': time_call(
+                lambda: [hash(x) for x in nuclides]) / n,
+            'eq, per comparison': time_call(
+                lambda: [x == y for x, y in zip(nuclides, copies)]) / n,
+            'set intersection': time_call(
+                lambda: set(nuclides) & set(copies)),
+            'sorted()': time_call(lambda: sorted(nuclides)),
+           }
+
+
+def bench_decay():
+    """Decay of 200 random inventories of 20 nuclides, to 10 times."""
+    import numpy as np
+    import nuclide_decay
+
+    rng = np.random.RandomState(0)
+    n = len(nuclide_decay.nuclide_data.nuclide_table)
+    inventories = np.zeros((200, n))
+    for inventory in inventories:
+        inventory[rng.choice(n, 20, replace=False)] = rng.rand(20)
+    times = np.logspace(0, 9, 10)
+
+    nuclide_decay.decay_levels()
+    return {'decay_transitions(), uncached': time_call(
+                lambda: nuclide_decay.decay_transitions.__wrapped__(), number=1),
+            'decay(), 1 inventory': time_call(
+                lambda: nuclide_decay.decay(inventories[0], times)),
+            'decay(), 200 inventories': time_call(
+                lambda: nuclide_decay.decay(inventories, times), number=1),
+           }
+
+
+def bench_activity():
+    """Activity and decay heat of 200 inventories at 10 times."""
+    import numpy as np
+    import nuclide_decay
+
+    rng = np.random.RandomState(0)
+    n = len(nuclide_decay.nuclide_data.nuclide_table)
+    inventories = rng.rand(10, 200, n)
+
+    nuclide_decay.decay_heat_by_mode(inventories[0, 0])
+    return {'coefficients, uncached': time_call(
+                lambda: nuclide_decay._mode_coefficients.__wrapped__(), number=1),
+            'activity()': time_call(lambda: nuclide_decay.activity(inventories)),
+            'decay_heat()': time_call(lambda: nuclide_decay.decay_heat(inventories)),
+            'activity_by_mode()': time_call(
+                lambda: nuclide_decay.activity_by_mode(inventories)),
+            'decay_heat_by_mode()': time_call(
+                lambda: nuclide_decay.decay_heat_by_mode(inventories)),
+           }
+
+
+def bench_decay_graph():
+    """Decay graph queries: parents of Pb-206 and chains of U-238."""
+    import nuclide_data
+    import nuclide_decay
+
+    nuclides = nuclide_data.nuclides
+
+    def scan():
+        # Parents of Pb-206 by alpha or beta decay, from the dictionary
+        return [ (Z, A, E) for (Z, A) in nuclides
+                 for E, isomer in nuclides[(Z,A)].items()
+                 if ((Z, A) == (84, 210) and 'A' in isomer['decay modes'])
+                 or ((Z, A) == (81, 206) and 'B-' in isomer['decay modes']) ]
+
+    pb206 = int(nuclide_data.table_index(82, 206))
+    u238 = int(nuclide_data.table_index(92, 238))
+    nuclide_decay.decay_chains(u238)
+    return {'dictionary scan': time_call(scan),
+            'parents(row)': time_call(lambda: nuclide_decay.parents(pb206)),
+            'decay_chains(U-238)': time_call(
+                lambda: nuclide_decay.decay_chains(u238)),
+           }
+
+
+def bench_masses():
+    """Q-values and binding energies over the whole chart."""
+    import nuclide_masses
+
+    nuclide_masses.q_value('(n,g)')
+    return {'ground_state_mass_excesses(), uncached': time_call(
+                lambda: nuclide_masses.ground_state_mass_excesses.__wrapped__()),
+            "q_value('(n,2n)'), whole chart": time_call(
+                lambda: nuclide_masses.q_value('(n,2n)')),
+            "q_value('(n,g)', 3 ids)": time_call(
+                lambda: nuclide_masses.q_value('(n,g)', ['U235', 'U238', 'Pu239'])),
+            "separation_energy('n'), whole chart": time_call(
+                lambda: nuclide_masses.separation_energy('n')),
+            'binding_energy_per_nucleon(), whole chart': time_call(
+                nuclide_masses.binding_energy_per_nucleon),
+           }
+
+
+def bench_materials():
+    """Number densities of 1000 materials, per material and in one batch."""
+    import numpy as np
+    import nuclide_data
+    import nuclide_materials
+
+    rng = np.random.RandomState(0)
+    elements = ['H', 'B', 'C', 'N', 'O', 'Si', 'Cr', 'Mn', 'Fe', 'Ni', 'Zr',
+                'Nb', 'Mo', 'Gd', 'U235', 'U238']
+    compositions = [ dict((e, rng.rand())
+                          for e in rng.choice(elements, 6, replace=False))
+                     for _ in range(1000) ]
+    densities = 10. * rng.rand(1000)
+
+    def loop():
+        # Expand each element of each material with nist_per_element
+        results = []
+        for composition, density in zip(compositions, densities):
+            isotopes = {}
+            for component, fraction in composition.items():
+                if component.startswith('U'):
+                    isotopes[(92, int(component[1:]))] = fraction
+                    continue
+                Z = nuclide_data.sym2z[component]
+                for nuclide in nuclide_data.nist_per_element[Z]:
+                    abundance = nuclide['Isotopic Composition']
+                    if type(abundance) is not str:
+                        isotopes[(Z, nuclide['Mass Number'])] = (
+                            fraction * abundance.nominal_value)
+            total = sum(isotopes.values())
+            molar_mass = sum(f * nuclide_data.weight(Z, A)
+                             for (Z, A), f in isotopes.items()) / total
+            results.append(dict(
+                (za, density * nuclide_materials.avogadro * nuclide_materials.barn
+                     * f / total / molar_mass)
+                for za, f in isotopes.items()))
+        return results
+
+    nuclide_materials.number_densities(compositions, densities)
+    return {'loop over materials': time_call(loop, number=1),
+            'number_densities(compositions)': time_call(
+                lambda: nuclide_materials.number_densities(compositions,
+                                                           densities))}
+
+
+benchmarks = [bench_import, bench_cache, bench_nominal_only, bench_store,
+              bench_tables, bench_parallel_load, bench_memory,
+              bench_parse_files, bench_wallet_columns, bench_construction,
+              bench_lookups, bench_stats, bench_table, bench_query, bench_batch,
+              bench_intern, bench_parse, bench_zaids, bench_nuclide_ops,
+              bench_decay, bench_activity, bench_decay_graph, bench_materials,
+              bench_masses]
+
+
+# Benchmarks return seconds, unless they have a `unit` attribute
+scales = {'ms': 1e3, 'us': 1e6, 'MiB': 2.**-20}
+
+
+def run(selected=benchmarks):
+    """
+    Run benchmarks and return the results as a JSON-compatible dictionary
+    {benchmark name: {'doc', 'unit', 'values': {name: value}}}, with values
+    in the unit given.
+    """
+    # The in-process benchmarks parse the data files, like the fresh
+    #  interpreters, rather than reading or writing the user's cache
+    import nuclide_data
+    nuclide_data.cache_dir = ''
+
+    results = {}
+    for benchmark in selected:
+        unit = getattr(benchmark, 'unit', 'ms')
+        values = benchmark()
+        results[benchmark.__name__] = {
+            'doc': benchmark.__doc__,
+            'unit': unit,
+            'values': dict( (name, scales[unit] * value)
+                            for name, value in values.items() )}
+    return results
+
+
+def metadata():
+    """Where and on what the benchmarks ran."""
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         cwd=basepath, stderr=subprocess.DEVNULL,
+                                         universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import numpy
+    return {'commit': commit,
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count()}
+
+
+def report(results, earlier=None):
+    """Print results, with the ratio to `earlier` results where available."""
+    earlier = earlier or {}
+    for benchmark, result in results.items():
+        print(result['doc'])
+        before = earlier.get(benchmark, {}).get('values', {})
+        for name, value in result['values'].items():
+            line = "  {0:48s} {1:12.4f} {2}".format(name, value, result['unit'])
+            if before.get(name):
+                line += "  {0:6.2f}x".format(value / before[name])
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for nuclide_data")
+    parser.add_argument('names', nargs='*',
+                        help="run only benchmarks whose name contains one of these")
+    parser.add_argument('-o', '--output', help="save the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of earlier results")
+    args = parser.parse_args(argv)
+
+    selected = [ benchmark for benchmark in benchmarks
+                 if not args.names
+                 or any(name in benchmark.__name__ for name in args.names) ]
+
+    earlier = None
+    if args.compare:
+        with open(args.compare) as f:
+            earlier = json.load(f)['results']
+
+    results = run(selected)
+    report(results, earlier)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': metadata(), 'results': results}, f,
+                      indent=1, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,56 @@ Data from NIST and NNDC
  * http://physics.nist.gov/cgi-bin/Compositions/stand_alone.pl?ele=&ascii=ascii2&isotype=all
  * http://www.nndc.bnl.gov/wallet/
 
+The data files are parsed lazily: the module-level tables (``nuclides``,
+``nist_nuclides``, ``mats``, ``isotopes``, ...) are built the first time
+they are accessed, one data source at a time.  Call ``load_all()`` to
+build everything up front.
+
+The parsed tables are cached in ``cache_dir`` and reloaded from there by
+later processes, until the data files change.
+
+``write_store(filename)`` saves the numeric tables to a flat binary file;
+with ``store_file`` set to it (or $NUCLIDE_DATA_STORE), the tables are
+memory-mapped from the file instead, shared by every process that uses
+it, and nuc(), weight(), isomers() and Nuclide work from them.
+
+``enable_stats()`` (or $NUCLIDE_DATA_STATS=1) records the time taken by
+each loading phase and counts lookups; ``stats()`` returns the records.
+
+With ``nominal_only`` set (or $NUCLIDE_DATA_NOMINAL_ONLY=1), values with
+uncertainties are stored as plain floats, with the standard deviations
+under a parallel '<key> sigma' key and in the '_sigma' table fields.
+
 """
 
+import os
 import os.path
 import warnings
 import re
+import bisect
+import concurrent.futures
+import csv
+import gc
 import gzip
-import copy
-import string
-from functools import total_ordering
+import hashlib
+import itertools
+import json
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, total_ordering, wraps
+
+try:
+    import resource
+except ImportError:
+    # Not on Windows; peak memory is then not recorded
+    resource = None
 
 import numpy as np
 
@@ -27,14 +68,470 @@ basepath = os.path.dirname(__file__)
 mev_per_c_2_amu = 1. / 931.494061
 
 
+# Lazy loading -----------------------------------------------------------
+#  Each data source has a loader that returns a dictionary of module-level
+#  names.  The names are inserted into the module namespace the first time
+#  one of them is requested, through the module __getattr__ (PEP 562) for
+#  outside access, or through _require() for functions in this module.
+
+# data source name -> (loader, names of required data sources)
+_loaders = {}
+
+# module attribute name -> data source name
+_lazy_attributes = {}
+
+_loaded_sources = set()
+_load_lock = threading.RLock()
+
+# Directory of the cache of parsed tables; None or '' disables the cache.
+#  Defaults to $NUCLIDE_DATA_CACHE_DIR, or else $XDG_CACHE_HOME/nuclide_data.
+cache_dir = os.environ.get('NUCLIDE_DATA_CACHE_DIR',
+    os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+                 'nuclide_data'))
+
+# Store plain float nominal values instead of ufloats, which is faster to
+#  load and smaller.  Standard deviations go to '<key> sigma' entries.
+#  Set before any data is loaded, or through load_all(nominal_only=...).
+nominal_only = os.environ.get('NUCLIDE_DATA_NOMINAL_ONLY', '') not in ('', '0')
+
+# Suffix of the keys holding standard deviations when nominal_only
+sigma_suffix = ' sigma'
+
+# Flat binary store of the numeric tables, memory-mapped read-only; None
+#  or '' to parse the data files (or read the cache) as usual.  Set before
+#  any data is loaded, or through use_store().
+store_file = os.environ.get('NUCLIDE_DATA_STORE') or None
+
+# Number of threads loading independent data sources (the NIST file, the
+#  wallet cards, the ENDF list, ...) concurrently; 1 loads them one at a
+#  time.  Set before loading, or through load_all(workers=...).
+load_workers = int(os.environ.get('NUCLIDE_DATA_LOAD_WORKERS') or 1)
+
+# Parse the data files in worker processes instead of threads, so that the
+#  parsing itself runs in parallel, at the cost of starting the processes
+#  and sending the results back.
+load_processes = os.environ.get('NUCLIDE_DATA_LOAD_PROCESSES', '') not in ('', '0')
+
+# Bump when the layout of the parsed tables changes.
+_cache_version = 3
+
+# Data sources stored in the cache.  The raw wallet card text is cheap
+#  to reread and is not needed once the master dictionary is built.  The
+#  element symbols and the ENDF list take a millisecond or so to parse,
+#  much less than reading the whole cache, so a job that only needs them
+#  reads them directly.
+_cached_sources = ('nist', 'nuclides', 'table', 'elements table')
+_cache_checked = False
+
+
+# Instrumentation ------------------------------------------------------
+#  Disabled by default.  When enabled, each loading phase records its wall
+#  time and the growth of the peak resident memory, and the lookup
+#  functions listed in _instrumented_functions are replaced by wrappers that
+#  count calls, time and failures.  Disabling puts the original functions
+#  back, so there is no overhead in the lookups when disabled.
+
+_stats_lock = threading.Lock()
+_stats_enabled = False
+_stats = {'load': OrderedDict(), 'calls': OrderedDict(), 'warnings': OrderedDict()}
+
+# name in stats() -> (owner, attribute name) of the instrumented function
+_instrumented_functions = OrderedDict()
+_uninstrumented = {}
+
+
+def _peak_rss():
+    """Peak resident memory of this process in bytes, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if os.uname().sysname == 'Darwin' else 1024 * peak
+
+
+@contextmanager
+def _phase(name):
+    """Record the time and peak memory growth of a loading phase."""
+    if not _stats_enabled:
+        yield
+        return
+
+    start, rss = time.perf_counter(), _peak_rss()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        rss_growth = None if rss is None else _peak_rss() - rss
+        with _stats_lock:
+            _stats['load'][name] = {'seconds': seconds, 'rss_growth': rss_growth}
+
+
+def _count_warning(kind):
+    if _stats_enabled:
+        with _stats_lock:
+            _stats['warnings'][kind] = _stats['warnings'].get(kind, 0) + 1
+
+
+def _instrument(name, func):
+    """
+    Wrap func to count its calls, time and failures under `name`.
+
+    The record, [count, seconds, failures], is updated without a lock,
+    which would cost more than the rest of the wrapper, so concurrent
+    threads may occasionally lose an update.
+    """
+    record = _stats['calls'].setdefault(name, [0, 0., 0])
+    perf_counter = time.perf_counter
+
+    @wraps(func)
+    def instrumented(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            record[2] += 1
+            raise
+        finally:
+            record[0] += 1
+            record[1] += perf_counter() - start
+    return instrumented
+
+
+def enable_stats(enabled=True):
+    """
+    Start (or with enabled=False, stop) recording loading phases, lookup
+    counts and warnings.  Load phases are only recorded for data loaded
+    while enabled, so enable before accessing any data, or set
+    $NUCLIDE_DATA_STATS=1.
+    """
+    global _stats_enabled
+    with _load_lock:
+        if bool(enabled) == _stats_enabled:
+            return
+        for name, (owner, attribute) in _instrumented_functions.items():
+            if enabled:
+                func = getattr(owner, attribute)
+                _uninstrumented[name] = func
+                setattr(owner, attribute, _instrument(name, func))
+            else:
+                setattr(owner, attribute, _uninstrumented.pop(name))
+        _stats_enabled = bool(enabled)
+
+
+def stats():
+    """
+    Return a copy of the instrumentation records:
+
+     * 'enabled' : whether recording is on
+     * 'load' : {phase: {'seconds', 'rss_growth'}}, in the order the phases
+       finished; rss_growth is the growth of the peak resident memory in
+       bytes (None where unavailable)
+     * 'calls' : {function: {'count', 'seconds', 'failures'}}
+     * 'warnings' : {kind: count} of warnings issued
+    """
+    with _stats_lock:
+        return {'enabled': _stats_enabled,
+                'load': OrderedDict( (k, dict(v)) for k, v in _stats['load'].items() ),
+                'calls': OrderedDict( (k, dict(zip(['count', 'seconds', 'failures'], v)))
+                                      for k, v in _stats['calls'].items() ),
+                'warnings': dict(_stats['warnings'])}
+
+
+def reset_stats():
+    """Clear the instrumentation records, except the load phases."""
+    with _stats_lock:
+        for record in _stats['calls'].values():
+            record[:] = [0, 0., 0]
+        _stats['warnings'].clear()
+
+
+def _data_source(name, provides, requires=()):
+    """Register a loader for data source `name`, providing `provides`."""
+    def register(loader):
+        _loaders[name] = (loader, tuple(requires))
+        for attribute in provides:
+            _lazy_attributes[attribute] = name
+        return loader
+    return register
+
+
+def _require(*sources):
+    """Make sure the given data sources are loaded."""
+    for source in sources:
+        if source in _loaded_sources:
+            continue
+
+        with _load_lock:
+            if load_workers > 1:
+                _load_concurrently(sources)
+            if not (source in _loaded_sources):
+                _load(source)
+
+
+def _load(source):
+    """Load a data source, and what it requires; call with _load_lock."""
+    global _cache_checked
+
+    # The store provides its sources all at once
+    if store_file and source in _store_sources:
+        with _phase('read store'):
+            globals().update(_read_store(store_file))
+        _loaded_sources.update(_store_sources)
+        return
+
+    # The first cached source to be requested loads all of them,
+    #  from the cache if it is current, or else by parsing the
+    #  data files and then writing the cache.
+    if source in _cached_sources and not _cache_checked:
+        _cache_checked = True
+        with _phase('read cache'):
+            read = _read_cache()
+        if read:
+            return
+        if _cache_filename() is not None:
+            _require(*_cached_sources)
+            with _phase('write cache'):
+                _write_cache()
+            return
+
+    loader, requires = _loaders[source]
+    _require(*requires)
+    with _phase(source):
+        globals().update(loader())
+    _loaded_sources.add(source)
+
+
+def _pending(sources):
+    """The data sources, and all they require, that are not loaded yet."""
+    pending = set()
+    stack = list(sources)
+    while stack:
+        source = stack.pop()
+        if not (source in _loaded_sources or source in pending):
+            pending.add(source)
+            stack.extend(_loaders[source][1])
+    return pending
+
+
+def _run_loader(source):
+    with _phase(source):
+        return _loaders[source][0]()
+
+
+# Module settings the loaders read, passed to worker processes, which
+#  otherwise start from the defaults (unless forked)
+_loader_settings = ('nominal_only', 'sigma_suffix', 'data_file',
+                    'wallet_filename', 'mat_file')
+
+
+def _run_loader_in_process(source, settings):
+    """Run a loader in a worker process, with the parent's loader settings."""
+    globals().update(settings)
+    return _loaders[source][0]()
+
+
+def _load_concurrently(sources):
+    """
+    Load the data sources and all they require, in load_workers threads (or
+    processes): each round loads every source whose requirements are
+    loaded, e.g., the NIST file, the wallet cards and the ENDF list
+    together, then the master dictionary.  Call with _load_lock.
+
+    Worker processes get the loader settings (_loader_settings) from this
+    process explicitly, whatever the multiprocessing start method.  The
+    parallel_load benchmark has only been run on a single CPU, so there is
+    no evidence yet that processes are faster on several cores.
+    """
+    # The store and the cache provide several sources at once, and a cache
+    #  that has to be built comes back here for the sources it needs
+    while True:
+        pending = _pending(sources)
+        special = sorted( source for source in pending
+                          if (store_file and source in _store_sources)
+                          or (source in _cached_sources and not _cache_checked) )
+        if not special:
+            break
+        _load(special[0])
+
+    processes = None
+    try:
+        while pending:
+            ready = sorted( source for source in pending
+                            if _loaded_sources.issuperset(_loaders[source][1]) )
+            workers = min(load_workers, len(ready))
+
+            # Only sources that need nothing else can load in another process
+            if load_processes and not any(_loaders[source][1] for source in ready):
+                if processes is None:
+                    processes = concurrent.futures.ProcessPoolExecutor(load_workers)
+                settings = {name: globals()[name] for name in _loader_settings}
+                futures = [processes.submit(_run_loader_in_process, source,
+                                            settings)
+                           for source in ready]
+                results = [future.result() for future in futures]
+            else:
+                with concurrent.futures.ThreadPoolExecutor(workers) as threads:
+                    results = list(threads.map(_run_loader, ready))
+
+            for source, names in zip(ready, results):
+                globals().update(names)
+                _loaded_sources.add(source)
+            pending.difference_update(ready)
+    finally:
+        if processes is not None:
+            processes.shutdown()
+
+
+def _cache_filename():
+    """
+    Return the cache file for the current data files, or None if caching
+    is disabled.
+
+    The name is a hash of the size and modification time of each data file
+    and of this module, so any change to them selects a new cache file.
+    """
+    if not cache_dir:
+        return None
+
+    key = [_cache_version, np.__version__, unc.__version__, bool(nominal_only)]
+    for filename in [data_file, wallet_filename, __file__]:
+        stat = os.stat(filename)
+        key.append((os.path.abspath(filename), stat.st_size, stat.st_mtime_ns))
+
+    digest = hashlib.sha1(repr(key).encode('utf8')).hexdigest()
+    return os.path.join(cache_dir, '{}{}.pickle'.format(
+        _cache_prefix(nominal_only), digest))
+
+
+def _cache_prefix(nominal):
+    """Start of the cache file names of a mode, which each has its own."""
+    return 'nuclide_data-{}-'.format('nominal' if nominal else 'ufloat')
+
+
+def _read_cache():
+    """Load the cached data sources; return False if there is no cache."""
+    filename = _cache_filename()
+    if filename is None:
+        return False
+
+    # Collecting garbage while unpickling thousands of small containers
+    #  triples the load time, and none of them is garbage.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(filename, 'rb') as cache_file:
+            cached = pickle.load(cache_file)
+    except Exception:
+        # Missing, truncated, or written by an incompatible version
+        return False
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # Sources already loaded, e.g. from the store, are kept
+    globals().update( (name, value) for name, value in cached.items()
+                      if not (_lazy_attributes[name] in _loaded_sources) )
+    _loaded_sources.update(_cached_sources)
+    return True
+
+
+def _write_cache():
+    """Pickle the loaded cached data sources to the cache file."""
+    filename = _cache_filename()
+
+    cached = dict( [ (name, globals()[name])
+                     for name, source in _lazy_attributes.items()
+                     if source in _cached_sources ] )
+
+    # Write to a temporary file first, so that concurrent processes
+    #  never read a partially written cache.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(fd, 'wb') as cache_file:
+            pickle.dump(cached, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_filename, filename)
+    except OSError as e:
+        warnings.warn("could not write nuclide data cache: {}".format(e))
+        return
+
+    # Remove the caches of older data files in this mode, which would
+    #  otherwise pile up with every edit, and keep the other mode's
+    other_mode = _cache_prefix(not nominal_only)
+    for name in os.listdir(cache_dir):
+        stale = os.path.join(cache_dir, name)
+        if (name.startswith('nuclide_data-') and name.endswith('.pickle')
+                and not name.startswith(other_mode) and stale != filename):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def __getattr__(name):
+    if name == '__all__':
+        return _public_names + [ table for table in _public_tables
+                                 if not store_file
+                                 or _lazy_attributes[table] in _store_sources ]
+    try:
+        source = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name))
+
+    _require(source)
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
+
+
+def load_all(nominal_only=None, workers=None, processes=None):
+    """
+    Load every data source now instead of on first access.
+
+    If nominal_only is given, it sets the module's nominal_only mode, which
+    can only be changed before any data is loaded.  workers and processes,
+    if given, set load_workers and load_processes: the number of data
+    sources loaded concurrently, and whether in processes or threads.
+    """
+    global load_workers, load_processes
+    if nominal_only is not None:
+        _set_nominal_only(nominal_only)
+    if workers is not None:
+        load_workers = int(workers)
+    if processes is not None:
+        load_processes = bool(processes)
+    _require(*_loaders)
 
 
-    
+def _set_nominal_only(flag):
+    global nominal_only
+    with _load_lock:
+        if bool(flag) != bool(nominal_only) and _loaded_sources:
+            raise ValueError("nominal_only cannot change after data is loaded")
+        nominal_only = bool(flag)
+
 
 # NIST data -------------------------------------------------------------
 def split_line(line):
     return map(str.strip, line.split('='))
 
+def parse_uncertain(string):
+    """
+    Return (nominal value, standard deviation) of a number in the NIST
+    notation '1.2345(67)', the uncertainty applying to the last digits.
+    Without an uncertainty it is 1 in the last digit, like
+    uncertainties.ufloat_fromstr.
+    """
+    value, _, uncertainty = string.partition('(')
+    decimals = len(value) - value.find('.') - 1 if '.' in value else 0
+    uncertainty = uncertainty.rstrip(')') or '1'
+    if not ('.' in uncertainty):
+        uncertainty = '{}e-{}'.format(uncertainty, decimals)
+    return float(value), float(uncertainty)
+
 def parse_one_chunk(chunk):
     d = {}
     for line in chunk:
@@ -42,7 +539,10 @@ def parse_one_chunk(chunk):
         if v.find('.') >= 0:
             if v.endswith('#'):
                 v = v[:-1]
-            d[k] = unc.ufloat_fromstr(v)
+            if nominal_only:
+                d[k], d[k + sigma_suffix] = parse_uncertain(v)
+            else:
+                d[k] = unc.ufloat_fromstr(v)
         else:
             try:
                 d[k] = int(v)
@@ -54,48 +554,71 @@ def parse_one_chunk(chunk):
 # NIST data file
 data_file = os.path.join(basepath, "nist-nuclide-data.txt")
 
-# chunk file into nuclides
-nist_nuclide_raw_list = []
-current_nuclide = []
-for line in open(data_file):
-    if line == '\n':
-        nist_nuclide_raw_list.append(current_nuclide)
-        current_nuclide = []
-    else:
-        current_nuclide.append(line.rstrip())
-
-
-nist_nuclide_processed_list = []
-for raw_chunk in nist_nuclide_raw_list:
-    nist_nuclide_processed_list.append( parse_one_chunk(raw_chunk) )
-
-nist_per_element = {}
-for nuclide in nist_nuclide_processed_list:
-    Z = nuclide['Atomic Number']
-    try:
-        nist_per_element[Z].append(nuclide)
-    except KeyError:
-        nist_per_element[Z] = []
-        nist_per_element[Z].append(nuclide)
 
-nist_nuclides = {}
-for nuclide in nist_nuclide_processed_list:
-    Z = nuclide['Atomic Number']
-    A = nuclide['Mass Number']
+@_data_source('elements', ['z2sym', 'sym2z'])
+def _load_elements():
+    # Only the element symbols are needed, so skip parsing the numbers.
+    #  The symbol of an element is that of its first listed isotope
+    #  (H rather than D or T).
+    z2sym = {}
+    Z = None
+    for line in open(data_file):
+        if line.startswith('Atomic Number'):
+            Z = int(line.split('=')[1])
+        elif line.startswith('Atomic Symbol') and not (Z in z2sym):
+            z2sym[Z] = line.split('=')[1].strip()
 
-    nist_nuclides[(Z,A)] = nuclide
+    sym2z = dict( [ (z2sym[k], k) for k in z2sym ] )
 
-z2sym = dict(
-          [ (Z, nist_per_element[Z][0]['Atomic Symbol']) for Z in range(1,119) ]
-            )
+    return {'z2sym': z2sym, 'sym2z': sym2z}
 
-sym2z = dict( [ (z2sym[k], k) for k in z2sym ] )
 
-atomic_weights = {}
-for Z in nist_per_element:
-    w = nist_per_element[Z][0]['Standard Atomic Weight']
-    if type(w) is not str:
-        atomic_weights[Z] = w
+@_data_source('nist', ['nist_nuclide_raw_list', 'nist_nuclide_processed_list',
+                       'nist_per_element', 'nist_nuclides', 'atomic_weights'])
+def _load_nist():
+    # chunk file into nuclides
+    with _phase('nist: chunking'):
+        nist_nuclide_raw_list = []
+        current_nuclide = []
+        for line in open(data_file):
+            if line == '\n':
+                nist_nuclide_raw_list.append(current_nuclide)
+                current_nuclide = []
+            else:
+                current_nuclide.append(line.rstrip())
+
+    with _phase('nist: parsing'):
+        nist_nuclide_processed_list = []
+        for raw_chunk in nist_nuclide_raw_list:
+            nist_nuclide_processed_list.append( parse_one_chunk(raw_chunk) )
+
+    nist_per_element = {}
+    for nuclide in nist_nuclide_processed_list:
+        Z = nuclide['Atomic Number']
+        try:
+            nist_per_element[Z].append(nuclide)
+        except KeyError:
+            nist_per_element[Z] = []
+            nist_per_element[Z].append(nuclide)
+
+    nist_nuclides = {}
+    for nuclide in nist_nuclide_processed_list:
+        Z = nuclide['Atomic Number']
+        A = nuclide['Mass Number']
+
+        nist_nuclides[(Z,A)] = nuclide
+
+    atomic_weights = {}
+    for Z in nist_per_element:
+        w = nist_per_element[Z][0]['Standard Atomic Weight']
+        if type(w) is not str:
+            atomic_weights[Z] = w
+
+    return {'nist_nuclide_raw_list': nist_nuclide_raw_list,
+            'nist_nuclide_processed_list': nist_nuclide_processed_list,
+            'nist_per_element': nist_per_element,
+            'nist_nuclides': nist_nuclides,
+            'atomic_weights': atomic_weights}
 
 # Nuclear wallet cards data ------------------------------
 
@@ -114,7 +637,7 @@ def do_if_present(string, func, default=None):
         return func(string)
     else:
         return default
-    
+
 def process_branch(s):
     try:
         return float(s) / 100.
@@ -127,15 +650,30 @@ def process_abundance(s):
     else:
         return nndc_abun(s,'%') / 100.
 
+def abundance_and_sigma(s):
+    """Nominal value and standard deviation of an abundance, as fractions."""
+    if s.startswith('100'):
+        return 1., 0.
+    a, b = s.split('%')
+    abundance, sigma = parse_uncertain("{0}({1})".format(float(a), int(b)))
+    # sigma * 0.01 rounds like the ufloat division in process_abundance
+    return abundance / 100., sigma * 0.01
+
 def parse_one_wallet_line(line):
     d = {}
     d['A'] = int(line[1:4])
     d['Z'] = int(line[6:9])
     d['symbol'] = line[10:12].strip().title()
 
-    d['mass excess'] = unc.ufloat(*map(float, (line[97:105], line[105:113]))) # in MeV
+    if nominal_only:
+        d['mass excess'] = float(line[97:105]) # in MeV
+        d['mass excess sigma'] = float(line[105:113])
+        d['abundance'], d['abundance sigma'] = do_if_present(
+            line[81:96], abundance_and_sigma, default=(0., 0.))
+    else:
+        d['mass excess'] = unc.ufloat(*map(float, (line[97:105], line[105:113]))) # in MeV
+        d['abundance'] = do_if_present(line[81:96], process_abundance, default=0.)
     d['systematics mass'] = (line[114] == 'S')
-    d['abundance'] = do_if_present(line[81:96], process_abundance, default=0.)
 
     d['Jpi'] = line[16:26].strip()
 
@@ -155,83 +693,291 @@ def parse_one_wallet_line(line):
     return d
 
 
+# Nuclear wallet cards data file
+wallet_filename = os.path.join(basepath, 'nuclear-wallet-cards.txt.gz')
+
+# Fixed-width layout of the wallet card lines: field -> (start, end), the
+#  same slices as parse_one_wallet_line
+wallet_layout = OrderedDict([
+    ('A', (1, 4)), ('isomeric', (4, 5)), ('Z', (6, 9)), ('symbol', (10, 12)),
+    ('Jpi', (16, 26)), ('decay mode', (30, 34)), ('branch fraction', (35, 41)),
+    ('excitation energy', (42, 49)), ('Q-value', (49, 56)),
+    ('half-life string', (63, 80)), ('abundance', (81, 96)),
+    ('mass excess', (97, 105)), ('mass excess sigma', (105, 113)),
+    ('systematics mass', (114, 115)), ('half-life', (124, 133)),
+    ])
+
+# Lines decoded per block when streaming
+wallet_block_lines = 4096
+
+
+def _fixed_width_columns(lines, layout):
+    """
+    Split byte string lines into fixed-width byte string columns, one
+    array per field of `layout`.  Short lines are padded with spaces.
+    """
+    width = max(end for start, end in layout.values())
+    records = np.array([line.rstrip(b'\r\n') for line in lines],
+                       dtype='S{}'.format(width))
+    # Padding the array pads with NUL; the fields are blank there
+    chars = records.view(np.uint8).reshape(len(records), width).copy()
+    chars[chars == 0] = ord(' ')
+    return dict( (name, np.ascontiguousarray(chars[:, start:end]).view(
+                      'S{}'.format(end - start)).reshape(len(records)))
+                 for name, (start, end) in layout.items() )
+
+
+def _float_or_none(s):
+    """float(s), or None if s is not a number."""
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+def _parse_floats(column, default=np.nan, parse=float):
+    """
+    Parse a byte string column to floats in one pass, with `default` for
+    blank fields.  If the column has values numpy cannot parse, each
+    distinct value is parsed with `parse` instead, which returns None for
+    a missing value.
+    """
+    column = np.char.strip(column)
+    blank = column == b''
+    try:
+        values = np.where(blank, b'0', column).astype(float)
+    except ValueError:
+        unique, inverse = np.unique(column, return_inverse=True)
+        parsed = [parse(value.decode('ascii')) if value else None
+                  for value in unique.tolist()]
+        values = np.array([np.nan if value is None else value
+                           for value in parsed])[inverse.reshape(-1)]
+        blank = blank | np.isnan(values)
+    values[blank] = default
+    return values
+
+
+def parse_wallet_columns(lines):
+    """
+    Parse wallet card lines (byte strings) in bulk, to a dictionary of
+    arrays with the keys of parse_one_wallet_line.  Numbers are float or
+    int arrays, with NaN for missing values (None in parse_one_wallet_line),
+    and text is fixed-width byte strings, b'' when missing.  Abundances are
+    nominal values, with standard deviations under 'abundance sigma'.
+    """
+    fields = _fixed_width_columns(lines, wallet_layout)
+    columns = {}
+
+    columns['A'] = fields['A'].astype(np.int64)
+    columns['Z'] = fields['Z'].astype(np.int64)
+    columns['symbol'] = np.char.title(np.char.strip(fields['symbol']))
+    columns['Jpi'] = np.char.strip(fields['Jpi'])
+    columns['isomeric'] = fields['isomeric'] == b'M'
+    columns['systematics mass'] = fields['systematics mass'] == b'S'
+
+    columns['excitation energy'] = _parse_floats(fields['excitation energy'], 0.)
+    columns['decay mode'] = np.char.strip(fields['decay mode'])
+    # Percentages; process_branch would divide those numpy cannot parse twice
+    columns['branch fraction'] = _parse_floats(fields['branch fraction'],
+                                               parse=_float_or_none)
+    columns['branch fraction'] /= 100.
+    columns['Q-value'] = _parse_floats(fields['Q-value'])
+
+    columns['mass excess'] = fields['mass excess'].astype(float)
+    columns['mass excess sigma'] = fields['mass excess sigma'].astype(float)
+
+    # Few lines have abundances, so parse them one distinct value at a time
+    abundance = np.char.strip(fields['abundance'])
+    unique, inverse = np.unique(abundance, return_inverse=True)
+    parsed = np.array([abundance_and_sigma(value.decode('ascii')) if value else (0., 0.)
+                       for value in unique.tolist()]).reshape(-1, 2)
+    columns['abundance'], columns['abundance sigma'] = parsed[inverse.reshape(-1)].T
+
+    columns['half-life string'] = np.char.strip(fields['half-life string'])
+    columns['stable'] = columns['half-life string'] == b'STABLE'
+    columns['half-life'] = np.where(columns['stable'], np.inf,
+                                    fields['half-life'].astype(float))
+    return columns
+
+
+def read_wallet_columns(filename=None):
+    """
+    Read a gzipped wallet card file (by default wallet_filename), or any
+    edition with the same fixed-width format, with parse_wallet_columns(),
+    decompressing and parsing wallet_block_lines lines at a time.
+    """
+    blocks = []
+    with gzip.open(filename or wallet_filename, 'rb') as wallet_file:
+        while True:
+            lines = list(itertools.islice(wallet_file, wallet_block_lines))
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip()]
+            if lines:
+                blocks.append(parse_wallet_columns(lines))
+
+    # An empty file gives empty columns
+    if not blocks:
+        return parse_wallet_columns([])
+    return dict( (name, np.concatenate([block[name] for block in blocks]))
+                 for name in blocks[0] )
+
 def load_wallet_content():
-    wallet_filename = os.path.join(basepath, 'nuclear-wallet-cards.txt.gz')
     wallet_file = gzip.open(wallet_filename, 'rt', encoding='utf8')
     try:
         return wallet_file.read()
     finally:
         wallet_file.close()
 
-wallet_content = load_wallet_content()
-wallet_lines = wallet_content.split('\n')[:-1]
 
-wallet_nuclide_processed_list = []
-for line in wallet_lines:
-    d = parse_one_wallet_line(line)
-    wallet_nuclide_processed_list.append(d)
+@_data_source('wallet', ['wallet_content', 'wallet_lines',
+                         'wallet_nuclide_processed_list'])
+def _load_wallet():
+    with _phase('wallet: decompression'):
+        wallet_content = load_wallet_content()
+    wallet_lines = wallet_content.split('\n')[:-1]
+
+    with _phase('wallet: parsing'):
+        wallet_nuclide_processed_list = []
+        for line in wallet_lines:
+            d = parse_one_wallet_line(line)
+            wallet_nuclide_processed_list.append(d)
+
+    return {'wallet_content': wallet_content,
+            'wallet_lines': wallet_lines,
+            'wallet_nuclide_processed_list': wallet_nuclide_processed_list}
 
 
 isomer_keys = ['symbol', 'mass excess', 'abundance', 'isomeric',
                'Jpi', 'stable', 'half-life string', 'half-life']
 
+# Keys of standard deviations, when nominal_only
+isomer_sigma_keys = ['mass excess sigma', 'abundance sigma']
+
 decay_keys = ['branch fraction', 'Q-value']
 
+meta_suffixes = 'mnopqrs'
+
+
+class ReadOnlyDict(dict):
+    """
+    A dict that cannot be modified, for the data that nuc() hands out.  It
+    is shared, not copied, by every caller; copy() of it gives a modifiable
+    dict, down to the nested dictionaries, while dict() of it is shallow.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("nuclide data is read-only; modify a copy() instead")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict( (k, v.copy() if isinstance(v, ReadOnlyDict) else v)
+                     for k, v in self.items() )
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def _read_only(value):
+    """A ReadOnlyDict of dictionary `value`, and of the dictionaries in it."""
+    if not isinstance(value, dict):
+        return value
+    return ReadOnlyDict((k, _read_only(v)) for k, v in value.items())
+
 # -------------------------------------------------------------------------
 # Build master dictionary
-nuclides = {}
-for el in wallet_nuclide_processed_list:
-    Z, A, E = [el[i] for i in ['Z', 'A', 'excitation energy']]
+@_data_source('nuclides', ['nuclides', 'default_isomer_E', 'isotopes',
+                          'isomer_levels'],
+              requires=['elements', 'nist', 'wallet'])
+def _build_nuclides():
+    nuclides = {}
+    for el in wallet_nuclide_processed_list:
+        Z, A, E = [el[i] for i in ['Z', 'A', 'excitation energy']]
+
+        # Pick the nuclide (Z,A) (or create new entry)
+        if not ((Z,A) in nuclides):
+            nuclides[(Z,A)] = {}
+
+        isomers = nuclides[(Z,A)]
+
+        # Pick the isomer [(Z,A)][E] (or create new entry)
+        if not (E in isomers):
+            isomers[E] = {}
+            isomers[E]['decay modes'] = {}
+
+            isomer = isomers[E]
+
+            # nuclide data not associated with decay
+            for k in isomer_keys:
+                isomer[k] = el[k]
+            if nominal_only:
+                for k in isomer_sigma_keys:
+                    isomer[k] = el[k]
+
+            if isomer['half-life'] == 0.:
+                isomer['lambda'] = np.inf
+            else:
+                isomer['lambda'] = np.log(2.) / isomer['half-life']
+
+            # A few NIST entries have a blank mass, which is missing
+            #  too, as in the store
+            if nist_nuclides.get((Z,A), {}).get('Relative Atomic Mass', '') != '':
+                nist = nist_nuclides[(Z,A)]
+                isomer['weight'] = nist['Relative Atomic Mass']
+                if nominal_only:
+                    isomer['weight sigma'] = nist.get('Relative Atomic Mass sigma', 0.)
 
-    # Pick the nuclide (Z,A) (or create new entry)
-    if not ((Z,A) in nuclides):
-        nuclides[(Z,A)] = {}
+        else:
+            isomer = isomers[E]
 
-    isomers = nuclides[(Z,A)]
+        # decay data
+        isomer['decay modes'][el['decay mode']] = {}
+        for k in decay_keys:
+            isomer['decay modes'][el['decay mode']][k] = el[k]
 
-    # Pick the isomer [(Z,A)][E] (or create new entry)
-    if not (E in isomers):
-        isomers[E] = {}
-        isomers[E]['decay modes'] = {}
 
-        isomer = isomers[E]
+    # nuc() hands out the isomer dictionaries themselves
+    for isomers in nuclides.values():
+        for E in isomers:
+            isomers[E] = _read_only(isomers[E])
 
-        # nuclide data not associated with decay
-        for k in isomer_keys:
-            isomer[k] = el[k]
+    default_isomer_E = {}
+    for n in nuclides:
+        Es = list(nuclides[n].keys())
 
-        if isomer['half-life'] == 0.:
-            isomer['lambda'] = np.inf
-        else:
-            isomer['lambda'] = np.log(2.) / isomer['half-life']
+        if n[0] == 0: continue
 
-        if (Z,A) in nist_nuclides:
-            isomer['weight'] = nist_nuclides[(Z,A)]['Relative Atomic Mass']
+        nuc_string = '{}-{}'.format(z2sym[n[0]], n[1])
 
-    else:
-        isomer = isomers[E]
+        if len(Es) > 1:
+            for i,E in enumerate(Es[1:]):
+                default_isomer_E[nuc_string+meta_suffixes[i]] = E
 
-    # decay data
-    isomer['decay modes'][el['decay mode']] = {}
-    for k in decay_keys:
-        isomer['decay modes'][el['decay mode']][k] = el[k]
+    # list_of_As = isotopes[Z]
+    isotopes = {}
+    for (Z,A) in nuclides:
 
+        if not (Z in isotopes):
+            isotopes[Z] = []
 
-default_isomer_E = {}
-meta_suffixes = 'mnopqrs'
-for n in nuclides:
-    Es = list(nuclides[n].keys())
+        isotopes[Z].append(A)
 
-    if n[0] == 0: continue
+    for Z in isotopes:
+        isotopes[Z].sort()
 
-    nuc_string = '{}-{}'.format(z2sym[n[0]], n[1])
+    # isomer_levels[(Z,A)] = sorted tuple of the energies of its states
+    isomer_levels = dict( (n, tuple(sorted(nuclides[n]))) for n in nuclides )
 
-    if len(Es) > 1:
-        for i,E in enumerate(Es[1:]):
-            default_isomer_E[nuc_string+meta_suffixes[i]] = E
+    return {'nuclides': nuclides,
+            'default_isomer_E': default_isomer_E,
+            'isotopes': isotopes,
+            'isomer_levels': isomer_levels}
 
 
-def return_nominal_value(Z_or_symbol, A, E, attribute):
+def return_nominal_value(Z_or_symbol, A, E, attribute, tolerance=0.):
     """
     Input
     -----
@@ -240,67 +986,865 @@ def return_nominal_value(Z_or_symbol, A, E, attribute):
      * A : atomic mass number
      * E : excitation energy of isomer
      * attribute : a valid nuclide data dictionary key
+     * tolerance : if given, E is matched to the nearest isomer within
+       this many MeV, as in nuc()
+    """
+    # Integer Z, A and a tabulated E take a single dictionary lookup
+    if not tolerance:
+        try:
+            if A is None:
+                value = _nominal_values[None].get(Z_or_symbol, _missing)
+            else:
+                value = _nominal_values[attribute].get((Z_or_symbol, A, E),
+                                                       _missing)
+            if value is not _missing:
+                return value
+        except KeyError:
+            pass
+
+    Z, A = _canonical_za(Z_or_symbol, A)
+
+    # testing for no A, then return elemental value
+    if A is None:
+        value = _nominal_values_table(None).get(Z, _missing)
+        if value is not _missing:
+            return value
+        if store_file:
+            return _store_element_weight(Z)
+        _require('nist')
+        return _nominal(atomic_weights[Z])
+
+    if tolerance:
+        E = nearest_isomer(Z, A, E, tolerance)
+    value = _nominal_values_table(attribute).get((Z, A, E), _missing)
+    if value is not _missing:
+        return value
+
+    # Not tabulated: an E matched to within E_quantum in the store, or an
+    #  error from the data itself
+    if store_file:
+        return _store_value(Z, A, E, attribute)
+
+    _require('nuclides')
+    return _nominal(nuclides[(Z,A)][E][attribute])
+
+
+@lru_cache(maxsize=8192)
+def _canonical_za(Z_or_symbol, A):
+    """
+    (Z, A) of the nuclide arguments of return_nominal_value, e.g.,
+    ('U-235', None), ('U', 235) or (92, 235).
     """
     try:
         # Is Z_or_symbol a fully specified nuclide, e.g., 'U-235'
         if Z_or_symbol.find('-') > -1:
             symbol, A = Z_or_symbol.split('-')
             A = int(A)
-            Z = sym2z[symbol.title()]
+            Z = _sym2z(symbol.title())
         else:
-            Z = sym2z[Z_or_symbol.title()]
+            Z = _sym2z(Z_or_symbol.title())
     except AttributeError:
         Z = Z_or_symbol
-   
-    # testing for no A, then return elemental value
-    if A is None:
-        return atomic_weights[Z].nominal_value
-        
+    return Z, A
+
+
+# Nominal values of the nuc() dictionaries for return_nominal_value:
+#  _nominal_values[attribute][(Z, A, E)], with the element weights in
+#  _nominal_values[None][Z].  Each table is built the first time its
+#  attribute is asked for.
+_nominal_values = {}
+
+_missing = object()
+
+
+def _nominal_values_table(attribute):
+    """Return _nominal_values[attribute], building it if need be."""
+    if attribute in _nominal_values:
+        return _nominal_values[attribute]
+
+    # The thousands of new key tuples would otherwise set off a full
+    #  collection of the loaded data, which takes longer than the build
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        values = _build_nominal_values(attribute)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    _nominal_values[attribute] = values
+    return values
+
+
+def _build_nominal_values(attribute):
+    if attribute is None:
+        if store_file:
+            _require('elements table')
+            Z = np.flatnonzero(~np.isnan(element_table['weight']))
+            Z = Z[Z > 0]
+            return dict(zip(Z.tolist(), element_table['weight'][Z].tolist()))
+        _require('nist')
+        return dict( (Z, _nominal(atomic_weights[Z])) for Z in atomic_weights )
+
+    # Attributes with a column in nuclide_table come from the column, with
+    #  its missing values left to the slow path of return_nominal_value.
+    #  Without the cache or the store, building the table just for this
+    #  takes longer than walking the dictionaries.
+    if attribute in _store_fields and (store_file or 'table' in _loaded_sources):
+        _require('table')
+        column = nuclide_table[_store_fields[attribute]]
+        tabulated = (column == column)
+        keys = zip(nuclide_table['Z'][tabulated].tolist(),
+                   nuclide_table['A'][tabulated].tolist(),
+                   nuclide_table['E'][tabulated].tolist())
+        return dict(zip(keys, column[tabulated].tolist()))
+
+    if store_file:
+        return {}
+    _require('nuclides')
+    return dict( ((Z, A, E), _nominal(isomer[attribute]))
+                 for (Z, A), isomers in nuclides.items()
+                 for E, isomer in isomers.items() if attribute in isomer )
+
+
+def _nominal(value):
+    """Nominal value of a ufloat; anything else is returned as it is."""
+    try:
+        return value.nominal_value
+    except AttributeError:
+        return value
+
+
+# Columnar tables ---------------------------------------------------------
+#  nuclide_table is a structured array with one row per isomer, sorted by
+#  (Z, A, E).  Missing values are NaN, and ufloats are split into nominal
+#  value and standard deviation fields.
+#
+#  decay_table has one row per decay mode.  The decay modes of
+#  nuclide_table[i] are decay_table[decay_offsets[i]:decay_offsets[i+1]],
+#  and decay_table['parent'] holds the row i.
+nuclide_table_dtype = np.dtype([
+    ('Z', 'i4'), ('A', 'i4'), ('E', 'f8'),
+    ('half_life', 'f8'), ('lambda', 'f8'),
+    ('abundance', 'f8'), ('abundance_sigma', 'f8'),
+    ('weight', 'f8'), ('weight_sigma', 'f8'),
+    ('mass_excess', 'f8'), ('mass_excess_sigma', 'f8'),
+    ('stable', '?'), ('isomeric', '?'),
+    ])
+
+decay_table_dtype = np.dtype([
+    ('parent', 'i4'), ('mode', 'U4'), ('branch', 'f8'), ('Q', 'f8'),
+    ])
+
+# Excitation energies are matched to within this quantum, in MeV.  The
+#  wallet cards give them to 0.1 keV.
+E_quantum = 1e-6
+
+_per_E_quantum = 1. / E_quantum
+_inf = float('inf')
+
+
+def _nominal_and_sigma(value, sigma=0.):
+    """
+    Split a ufloat, or a float with standard deviation `sigma`, into
+    (nominal value, standard deviation).  Anything else, e.g., None or an
+    empty string, is a missing value.
+    """
+    try:
+        return value.nominal_value, value.std_dev
+    except AttributeError:
+        try:
+            return float(value), float(sigma)
+        except (TypeError, ValueError):
+            return np.nan, np.nan
+
+
+def _state_keys(Z, A, E):
+    """
+    Integer keys that sort like (Z, A, E), with E rounded to E_quantum.
+    Infinite E, meaning an unspecified isomer, has no key and gives -1.
+    """
+    Z, A, E = np.broadcast_arrays(np.asarray(Z, dtype=np.int64),
+                                  np.asarray(A, dtype=np.int64),
+                                  np.asarray(E, dtype=float))
+    finite = np.isfinite(E)
+    levels = np.rint(np.where(finite, E, 0.) / E_quantum).astype(np.int64)
+    return np.where(finite, (Z * 1000 + A) * 10**9 + levels, -1)
+
+
+@_data_source('table', ['nuclide_table', 'decay_table', 'decay_offsets',
+                        '_table_keys'],
+              requires=['nuclides'])
+def _build_tables():
+    rows = []
+    decay_rows = []
+    decay_offsets = [0]
+    for (Z, A) in sorted(nuclides):
+        for E in sorted(nuclides[(Z,A)]):
+            isomer = nuclides[(Z,A)][E]
+            row = ( (Z, A, E, isomer['half-life'], isomer['lambda'])
+                  + _nominal_and_sigma(isomer['abundance'],
+                                       isomer.get('abundance sigma', 0.))
+                  + _nominal_and_sigma(isomer.get('weight'),
+                                       isomer.get('weight sigma', 0.))
+                  + _nominal_and_sigma(isomer['mass excess'],
+                                       isomer.get('mass excess sigma', 0.))
+                  + (isomer['stable'], isomer['isomeric']) )
+
+            for mode, decay in isomer['decay modes'].items():
+                if mode is None: continue
+                decay_rows.append( (len(rows), mode)
+                    + _nominal_and_sigma(decay['branch fraction'])[:1]
+                    + _nominal_and_sigma(decay['Q-value'])[:1] )
+
+            rows.append(row)
+            decay_offsets.append(len(decay_rows))
+
+    nuclide_table = np.array(rows, dtype=nuclide_table_dtype)
+    decay_table = np.array(decay_rows, dtype=decay_table_dtype)
+
+    return {'nuclide_table': nuclide_table,
+            'decay_table': decay_table,
+            'decay_offsets': np.array(decay_offsets, dtype=np.int64),
+            '_table_keys': _state_keys(nuclide_table['Z'], nuclide_table['A'],
+                                       nuclide_table['E'])}
+
+
+def table_index(Z, A, E=0.):
+    """
+    Return the rows of nuclide_table for arrays of Z, A and (optionally) E.
+
+    Arguments are broadcast against each other.  E is matched to within
+    E_quantum; E = np.inf selects the first isomeric state.  Rows of
+    nuclides not in the table are -1.
+    """
+    _require('table')
+    Z, A, E = np.broadcast_arrays(np.asarray(Z, dtype=np.int64),
+                                  np.asarray(A, dtype=np.int64),
+                                  np.asarray(E, dtype=float))
+
+    # An unspecified isomer is the first state above the ground state
+    first_isomer = np.isinf(E)
+    ground_keys = _state_keys(Z, A, 0.)
+    keys = _state_keys(Z, A, E)
+
+    rows = np.where(first_isomer,
+                    np.searchsorted(_table_keys, ground_keys, side='right'),
+                    np.searchsorted(_table_keys, keys))
+    rows = np.minimum(rows, len(_table_keys) - 1)
+    table_keys = _table_keys[rows]
+
+    found = np.where(first_isomer,
+                     (table_keys > ground_keys)
+                        & (table_keys // 10**9 == ground_keys // 10**9),
+                     table_keys == keys)
+    return np.where(found, rows, -1)
+
+
+# Property queries --------------------------------------------------------
+#  Each numeric field of nuclide_table has a sorted index, (rows in order
+#  of the field, sorted values), without NaN values, so a range of values
+#  is found by bisection.  Decay modes, stable and isomeric have a boolean
+#  mask over the rows.
+
+@_data_source('indexes', ['_range_indexes', '_row_masks'], requires=['table'])
+def _build_indexes():
+    range_indexes = {}
+    for field in nuclide_table.dtype.names:
+        if nuclide_table.dtype[field].kind in 'if':
+            values = nuclide_table[field]
+            order = np.argsort(values, kind='stable')
+            order = order[~np.isnan(values[order])]
+            range_indexes[field] = (order, values[order])
+
+    row_masks = {'stable': nuclide_table['stable'],
+                 'isomeric': nuclide_table['isomeric']}
+    for mode in np.unique(decay_table['mode']):
+        mask = np.zeros(len(nuclide_table), dtype=bool)
+        mask[decay_table['parent'][decay_table['mode'] == mode]] = True
+        row_masks[str(mode)] = mask
+
+    return {'_range_indexes': range_indexes, '_row_masks': row_masks}
+
+
+def query(decay_mode=None, stable=None, isomeric=None, **ranges):
+    """
+    Return the rows of nuclide_table, in order, that satisfy every given
+    condition:
+
+     * field=(low, high) for a numeric field of nuclide_table ('Z', 'A',
+       'E', 'half_life', 'mass_excess', ...): low <= value <= high, where
+       None leaves that end open.  field=value is the same as (value, value).
+     * decay_mode='SF' or a list of modes: decays by any of the modes
+     * stable=True/False, isomeric=True/False
+
+    For example, query(half_life=(1., 86400.), Z=(50, 60)).  Missing (NaN)
+    values never match.
+    """
+    _require('indexes')
+
+    # Each condition gives either candidate rows from an index, or a mask
+    #  to filter candidates with.  Start from the fewest candidates.
+    candidates = []
+    masks = []
+    for field, bounds in ranges.items():
+        if not (field in _range_indexes):
+            raise TypeError("query() got an unexpected keyword argument "
+                            "{!r}".format(field))
+        low, high = bounds if isinstance(bounds, (tuple, list)) else (bounds, bounds)
+        order, values = _range_indexes[field]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right')
+        candidates.append(order[start:end])
+
+    if decay_mode is not None:
+        modes = [decay_mode] if isinstance(decay_mode, str) else decay_mode
+        masks.append(np.any([_row_masks[mode] if mode in _row_masks
+                             else np.zeros(len(nuclide_table), dtype=bool)
+                             for mode in modes], axis=0))
+    for flag, name in [(stable, 'stable'), (isomeric, 'isomeric')]:
+        if flag is not None:
+            masks.append(_row_masks[name] if flag else ~_row_masks[name])
+
+    if not candidates:
+        candidates.append(np.arange(len(nuclide_table)))
+    candidates.sort(key=len)
+
+    rows = candidates[0]
+    for mask in masks:
+        rows = rows[mask[rows]]
+    for other in candidates[1:]:
+        keep = np.zeros(len(nuclide_table), dtype=bool)
+        keep[other] = True
+        rows = rows[keep[rows]]
+
+    return np.sort(rows)
+
+
+# Memory-mapped store ------------------------------------------------------
+#  A flat binary file: the magic string, the length of a JSON header as a
+#  little-endian uint64, the header, then each array's raw data at a
+#  64-byte aligned offset.  The header lists {name, dtype, shape, offset}
+#  for each array.  The arrays are memory-mapped read-only, so processes
+#  that use the same file share one physical copy.
+#
+#  The store provides the data sources in _store_sources, and nuc(),
+#  isomers(), return_nominal_value() and Nuclide use the tables instead of
+#  the nuclides dictionary.  The other module-level tables (nuclides,
+#  nist_nuclides, ...) are still parsed if accessed.
+
+_store_magic = b'NUCDATA\x00'
+_store_version = 1
+_store_alignment = 64
+_store_sources = ('elements', 'table', 'elements table', 'mats')
+
+# Text fields of nuc() dictionaries, parallel to nuclide_table
+_nuclide_strings_dtype = np.dtype([
+    ('symbol', 'U3'), ('Jpi', 'U16'), ('half_life_string', 'U24')])
+
+# Decay modes of nuc() dictionaries, in their order, with '' for the None
+#  mode that decay_table leaves out
+_store_decays_dtype = np.dtype([('mode', 'U4'), ('branch', 'f8'), ('Q', 'f8')])
+
+_mat_table_dtype = np.dtype([
+    ('Z', 'i4'), ('A', 'i4'), ('metastable', '?'), ('mat', 'i4')])
+
+# nuc() dictionaries built from the store, by row of nuclide_table
+_store_nuclides = {}
+
+
+def use_store(filename):
+    """
+    Memory-map the tables from a file written by write_store(), instead of
+    parsing the data files.  Must be called before any data is loaded.
+    """
+    global store_file
+    with _load_lock:
+        if _loaded_sources.intersection(_store_sources) and filename != store_file:
+            raise ValueError("the store must be chosen before data is loaded")
+        store_file = filename
+
+
+def _table_isomers():
+    """The nuc() dictionaries of the rows of nuclide_table."""
+    _require('nuclides', 'table')
+    return [ nuclides[(Z,A)][E] for Z, A, E in
+             zip(nuclide_table['Z'].tolist(), nuclide_table['A'].tolist(),
+                 nuclide_table['E'].tolist()) ]
+
+
+def _nuclide_strings_table(isomers=None):
+    """The text fields of the nuc() dictionaries, parallel to nuclide_table."""
+    if store_file:
+        _require('table')
+        return _nuclide_strings
+    return np.array([ (isomer['symbol'], isomer['Jpi'], isomer['half-life string'])
+                      for isomer in (isomers or _table_isomers()) ],
+                    dtype=_nuclide_strings_dtype)
+
+
+def _mat_records():
+    """mats as an array of (Z, A, metastable, mat), sorted."""
+    _require('mats')
+    return np.array([ key + (mat,) for key, mat in sorted(mats.items()) ],
+                    dtype=_mat_table_dtype)
+
+
+def write_store(filename):
+    """Write the numeric tables to a flat binary file, for use_store()."""
+    _require('nuclides', 'table', 'elements table', 'mats')
+
+    isomers = _table_isomers()
+    strings = _nuclide_strings_table(isomers)
+
+    decays = []
+    decay_starts = [0]
+    for isomer in isomers:
+        for mode, decay in isomer['decay modes'].items():
+            decays.append( (mode or '',)
+                + _nominal_and_sigma(decay['branch fraction'])[:1]
+                + _nominal_and_sigma(decay['Q-value'])[:1] )
+        decay_starts.append(len(decays))
+    decays = np.array(decays, dtype=_store_decays_dtype)
+    mat_table = _mat_records()
+
+    arrays = [('nuclide_table', nuclide_table), ('decay_table', decay_table),
+              ('decay_offsets', decay_offsets), ('_table_keys', _table_keys),
+              ('element_table', element_table), ('_nuclide_strings', strings),
+              ('_store_decays', decays),
+              ('_store_decay_offsets', np.array(decay_starts, dtype=np.int64)),
+              ('_mat_table', mat_table)]
+
+    # Offsets are relative to the end of the header, which is padded to
+    #  the alignment
+    specs = []
+    offset = 0
+    for name, array in arrays:
+        dtype = array.dtype.str if array.dtype.names is None else array.dtype.descr
+        specs.append({'name': name, 'dtype': dtype, 'shape': array.shape,
+                      'offset': offset})
+        offset += -(-array.nbytes // _store_alignment) * _store_alignment
+
+    header = {'version': _store_version, 'arrays': specs}
+    header = json.dumps(header).encode('utf8')
+    start = -(-(len(_store_magic) + 8 + len(header)) // _store_alignment) * _store_alignment
+    header += b' ' * (start - len(_store_magic) - 8 - len(header))
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as store:
+            store.write(_store_magic + struct.pack('<Q', len(header)) + header)
+            for (name, array), spec in zip(arrays, specs):
+                store.seek(start + spec['offset'])
+                store.write(np.ascontiguousarray(array).tobytes())
+        os.replace(temp_filename, filename)
+    except BaseException:
+        os.remove(temp_filename)
+        raise
+
+
+def _read_store(filename):
+    """Memory-map the store, and return the module-level names it provides."""
+    with open(filename, 'rb') as store:
+        magic = store.read(len(_store_magic))
+        length, = struct.unpack('<Q', store.read(8))
+        header = json.loads(store.read(length).decode('utf8'))
+    if magic != _store_magic or header.get('version') != _store_version:
+        raise ValueError("{} is not a nuclide data store of version {}".format(
+            filename, _store_version))
+    start = len(_store_magic) + 8 + length
+
+    buffer = np.memmap(filename, dtype=np.uint8, mode='r')
+    arrays = {}
+    for spec in header['arrays']:
+        dtype = spec['dtype']
+        dtype = np.dtype(dtype if isinstance(dtype, str)
+                         else [tuple(field) for field in dtype])
+        arrays[spec['name']] = np.ndarray(tuple(spec['shape']), dtype=dtype,
+                                          buffer=buffer,
+                                          offset=start + spec['offset'])
+
+    # The small dictionaries are rebuilt from the arrays
+    element_table = arrays['element_table']
+    z2sym = dict( (Z, symbol) for Z, symbol in
+                  zip(element_table['Z'].tolist(), element_table['symbol'].tolist())
+                  if Z > 0 and symbol )
+    sym2z = dict( (z2sym[k], k) for k in z2sym )
+
+    mat_table = arrays['_mat_table']
+    mats = dict( ((Z, A, metastable), mat) for Z, A, metastable, mat in
+                 mat_table[['Z', 'A', 'metastable', 'mat']].tolist() )
+
+    # nuclide_table is sorted by (Z, A, E)
+    states = arrays['nuclide_table'][['Z', 'A', 'E']].tolist()
+    isomer_levels = dict( (ZA, tuple(E for _, _, E in rows)) for ZA, rows in
+                          itertools.groupby(states, key=lambda row: row[:2]) )
+
+    arrays.update(z2sym=z2sym, sym2z=sym2z, mats=mats,
+                  isomer_levels=isomer_levels)
+    return arrays
+
+
+def _store_row(Z, A, E):
+    """
+    Row of nuclide_table for (Z, A, E), matched like a dictionary key:
+    E must equal the energy of the row, not just round to it.
+    """
+    row = table_index(Z, A, E) if E != _inf else -1
+    if row < 0 or nuclide_table['E'][row] != E:
+        raise KeyError((Z, A, E))
+    return int(row)
+
+
+# nuc() keys -> nuclide_table fields
+_store_fields = {'half-life': 'half_life', 'lambda': 'lambda',
+                 'abundance': 'abundance', 'weight': 'weight',
+                 'mass excess': 'mass_excess',
+                 'stable': 'stable', 'isomeric': 'isomeric'}
+
+
+def _store_value(Z, A, E, attribute):
+    """return_nominal_value() from the store."""
+    row = _store_row(Z, A, E)
+    field = _store_fields.get(attribute)
+    if field is None:
+        return _nominal(_store_nuclide(row)[attribute])
+
+    value = nuclide_table[field][row]
+    if value.dtype.kind == 'b':
+        return bool(value)
+    if np.isnan(value):
+        # Missing from the nuc() dictionary
+        raise KeyError(attribute)
+    return float(value)
+
+
+def _store_element_weight(Z):
+    _require('elements table')
+    if not (0 < Z < len(element_table)) or np.isnan(element_table['weight'][Z]):
+        raise KeyError(Z)
+    return float(element_table['weight'][Z])
+
+
+def _store_uncertain(value, sigma, always=True):
+    """A ufloat, or a plain float if sigma is 0 and not `always`."""
+    if always or sigma > 0.:
+        return unc.ufloat(value, sigma)
+    return value
+
+
+def _store_nuclide(row):
+    """Build the nuc() dictionary of a row of nuclide_table from the store."""
+    isomer = _store_nuclides.get(row)
+    if isomer is not None:
+        return isomer
+
+    values = dict(zip(nuclide_table.dtype.names, nuclide_table[row].tolist()))
+    symbol, Jpi, half_life_string = _nuclide_strings[row].tolist()
+
+    isomer = {'symbol': symbol, 'Jpi': Jpi, 'half-life string': half_life_string,
+              'isomeric': values['isomeric'], 'stable': values['stable'],
+              'half-life': values['half_life'],
+              # As in _build_nuclides: inf, or log(2) / half-life
+              'lambda': (np.inf if values['half_life'] == 0.
+                         else np.float64(values['lambda']))}
+
+    for key, always in [('mass excess', True), ('abundance', False),
+                        ('weight', True)]:
+        field = _store_fields[key]
+        if np.isnan(values[field]):
+            continue
+        if nominal_only:
+            isomer[key] = values[field]
+            isomer[key + sigma_suffix] = values[field + '_sigma']
+        else:
+            isomer[key] = _store_uncertain(values[field],
+                                           values[field + '_sigma'], always)
+
+    def missing_as_none(value):
+        return None if np.isnan(value) else value
+
+    isomer['decay modes'] = dict(
+        (mode or None, {'branch fraction': missing_as_none(branch),
+                        'Q-value': missing_as_none(Q)})
+        for mode, branch, Q in _store_decays[
+            _store_decay_offsets[row]:_store_decay_offsets[row+1]].tolist() )
+
+    return _store_nuclides.setdefault(row, _read_only(isomer))
+
+
+# Table export -------------------------------------------------------------
+#  The whole dataset as flat tables, structured arrays named by
+#  table_names, written to and read back from
+#   * 'npz' : one NumPy .npz file
+#   * 'csv' : a directory with one <name>.csv per table, with a header of
+#     field names
+#   * 'parquet' : a directory with one <name>.parquet per table, if pyarrow
+#     is installed
+
+table_names = ('nuclides', 'decays', 'elements', 'nist', 'mats')
+
+# Relative atomic masses and isotopic compositions from the NIST file;
+#  the standard atomic weights are in the 'elements' table
+nist_table_dtype = np.dtype([
+    ('Z', 'i4'), ('A', 'i4'), ('symbol', 'U3'),
+    ('mass', 'f8'), ('mass_sigma', 'f8'),
+    ('composition', 'f8'), ('composition_sigma', 'f8'),
+    ('notes', 'U16'),
+    ])
+
+
+def _nist_table():
+    _require('nist')
+    rows = []
+    for Z, A in sorted(nist_nuclides):
+        nuclide = nist_nuclides[(Z,A)]
+        rows.append( (Z, A, nuclide['Atomic Symbol'])
+            + _nominal_and_sigma(nuclide['Relative Atomic Mass'], nuclide.get(
+                'Relative Atomic Mass' + sigma_suffix, 0.))
+            + _nominal_and_sigma(nuclide['Isotopic Composition'], nuclide.get(
+                'Isotopic Composition' + sigma_suffix, 0.))
+            + (nuclide['Notes'],) )
+    return np.array(rows, dtype=nist_table_dtype)
+
+
+def tables():
+    """
+    Return the whole dataset as a dictionary of structured arrays:
+
+     * 'nuclides' : nuclide_table, with the text fields symbol, Jpi and
+       half_life_string of the nuc() dictionaries
+     * 'decays' : decay_table, whose parent field is a row of 'nuclides'
+     * 'elements' : element_table
+     * 'nist' : the NIST isotopes, with nist_table_dtype
+     * 'mats' : the ENDF/B-VII.1 MATs, as (Z, A, metastable, mat)
+    """
+    _require('table', 'elements table', 'mats')
+    strings = _nuclide_strings_table()
+
+    nuclide_records = np.empty(len(nuclide_table), dtype=np.dtype(
+        nuclide_table.dtype.descr + strings.dtype.descr))
+    for array in [nuclide_table, strings]:
+        for field in array.dtype.names:
+            nuclide_records[field] = array[field]
+
+    return {'nuclides': nuclide_records, 'decays': decay_table.copy(),
+            'elements': element_table.copy(), 'nist': _nist_table(),
+            'mats': _mat_records()}
+
+
+def _table_format(path, format):
+    if format is None:
+        format = 'npz' if path.endswith('.npz') else 'csv'
+    if not (format in ('npz', 'csv', 'parquet')):
+        raise ValueError("unknown table format {!r}".format(format))
+    return format
+
+
+def _import_pyarrow():
     try:
-        return nuclides[(Z,A)][E][attribute].nominal_value
-    except (ValueError, AttributeError):
-        return nuclides[(Z,A)][E][attribute]
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("the 'parquet' table format requires pyarrow")
+    return pyarrow
+
+
+def write_tables(path, format=None):
+    """
+    Write tables() to `path`, in `format` 'npz', 'csv' or 'parquet'; by
+    default 'npz' if path ends with '.npz', and otherwise 'csv'.  The csv
+    and parquet formats write one file per table into the directory path.
+    """
+    format = _table_format(path, format)
+    arrays = tables()
+
+    if format == 'npz':
+        np.savez(path, **arrays)
+        return
+
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    if format == 'parquet':
+        pyarrow = _import_pyarrow()
+        for name, array in arrays.items():
+            table = pyarrow.table(dict( (field, array[field])
+                                        for field in array.dtype.names ))
+            pyarrow.parquet.write_table(table, os.path.join(path, name + '.parquet'))
+        return
+
+    # repr() writes floats exactly, including nan and inf
+    for name, array in arrays.items():
+        columns = [ [repr(value) for value in array[field].tolist()]
+                    if array.dtype[field].kind == 'f' else array[field].tolist()
+                    for field in array.dtype.names ]
+        with open(os.path.join(path, name + '.csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(array.dtype.names)
+            writer.writerows(zip(*columns))
+
+
+def read_tables(path, format=None):
+    """
+    Read tables written by write_tables(), without parsing the data files,
+    and return them as a dictionary of structured arrays like tables().
+    """
+    format = _table_format(path, format)
+
+    if format == 'npz':
+        with np.load(path, allow_pickle=False) as npz:
+            return dict( (name, npz[name]) for name in table_names )
+
+    dtypes = {'nuclides': np.dtype(nuclide_table_dtype.descr
+                                   + _nuclide_strings_dtype.descr),
+              'decays': decay_table_dtype, 'elements': _element_table_dtype,
+              'nist': nist_table_dtype, 'mats': _mat_table_dtype}
+
+    arrays = {}
+    for name in table_names:
+        if format == 'parquet':
+            pyarrow = _import_pyarrow()
+            table = pyarrow.parquet.read_table(os.path.join(path, name + '.parquet'))
+            columns = dict( (field, table.column(field).to_numpy())
+                            for field in table.column_names )
+        else:
+            with open(os.path.join(path, name + '.csv'), newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                columns = dict(zip(header, map(np.array, zip(*reader))))
+
+        dtype = dtypes[name]
+        array = np.empty(len(columns[dtype.names[0]]), dtype=dtype)
+        for field in dtype.names:
+            if dtype[field].kind == 'b' and columns[field].dtype.kind == 'U':
+                array[field] = columns[field] == 'True'
+            else:
+                array[field] = columns[field]
+        arrays[name] = array
+    return arrays
 
 
 # ENDF-6 MAT data -------------------------------------------------------
 #  mats is dictionary with
 #    key : (Z, A, metastable), Z, A are int, metastable is bool
 #    value : MAT nuclide id, integer, from ENDF-6 list
+#
+#  Other libraries are registered by name in endf_libraries, with the NNDC
+#  list file of each (sub)library, and are read the first time one of
+#  their MATs is looked up.  Each has a dictionary like mats and its
+#  reverse, MAT -> (Z, A, metastable).
 mat_file = os.path.join(basepath, "n-ENDF-B-VII.1.endf.list")
-mats = {}
-for line in open(mat_file):
-    # Skip comment line
-    if line.startswith('#'): continue
 
-    # Grab Z, A, and MAT
-    Z = int(line[6:9])
-    A = int(line[13:16])
-    mat = int(line[72:76])
+default_library = 'ENDF/B-VII.1'
 
-    # Is it metastable?
-    metastable = (line[16] == 'M')
+# library name -> list file
+endf_libraries = {default_library: mat_file}
 
-    key = (Z, A, metastable)
+# library name -> (mats, MAT -> (Z, A, metastable)), once read
+_library_indexes = {}
 
-    mats[key] = int(mat)
 
+def _parse_mat_list(filename):
+    mats = {}
+    for line in open(filename):
+        # Skip comment line
+        if line.startswith('#'): continue
 
+        # Grab Z, A, and MAT
+        Z = int(line[6:9])
+        A = int(line[13:16])
+        mat = int(line[72:76])
+
+        # Is it metastable?
+        metastable = (line[16] == 'M')
+
+        key = (Z, A, metastable)
+
+        mats[key] = int(mat)
+
+    return mats
+
+
+@_data_source('mats', ['mats'])
+def _load_mats():
+    return {'mats': _parse_mat_list(mat_file)}
+
+
+def register_library(name, filename):
+    """
+    Register the NNDC list file of an ENDF-6 (sub)library under `name`,
+    e.g., register_library('ENDF/B-VIII.0', 'n-ENDF-B-VIII.0.endf.list').
+    The file is read the first time the library is used.
+    """
+    with _load_lock:
+        if name == default_library and filename != mat_file:
+            raise ValueError("{} is the default library".format(name))
+        endf_libraries[name] = filename
+        _library_indexes.pop(name, None)
+
+
+def _library_index(library):
+    """(mats, MAT -> (Z, A, metastable)) of a library, read on first use."""
+    if library is None:
+        library = default_library
+    index = _library_indexes.get(library)
+    if index is not None:
+        return index
+
+    with _load_lock:
+        index = _library_indexes.get(library)
+        if index is None:
+            if not (library in endf_libraries):
+                raise KeyError("no ENDF library {!r} registered".format(library))
+            if library == default_library:
+                _require('mats')
+                library_mats = mats
+            else:
+                library_mats = _parse_mat_list(endf_libraries[library])
+
+            # Keep the first nuclide of a MAT listed more than once
+            nuclides_by_mat = {}
+            for key, mat in library_mats.items():
+                nuclides_by_mat.setdefault(mat, key)
+
+            # Read-only views, since the default library's is mats itself
+            index = _library_indexes[library] = (
+                types.MappingProxyType(library_mats),
+                types.MappingProxyType(nuclides_by_mat))
+    return index
+
+
+def library_mats(library=None):
+    """
+    Return a read-only mapping (Z, A, metastable) -> MAT of an ENDF
+    library, by default ENDF/B-VII.1, like mats.
+    """
+    return _library_index(library)[0]
+
+
+def mat_nuclides(library=None):
+    """
+    Return a read-only mapping MAT -> (Z, A, metastable) of an ENDF
+    library, by default ENDF/B-VII.1.
+    """
+    return _library_index(library)[1]
 
-# ---------------------------------------------------------------------------- #
-# means intended for public access of data
 
-# list_of_As = isotopes[Z]
-isotopes = {}
-for (Z,A) in nuclides:
+def _sym2z(symbol):
+    _require('elements')
+    return sym2z[symbol]
 
-    if not (Z in isotopes):
-        isotopes[Z] = []
-    
-    isotopes[Z].append(copy.copy(A))
 
-    isotopes[Z].sort()
+def _z2sym(Z):
+    _require('elements')
+    return z2sym[Z]
 
 
+# ---------------------------------------------------------------------------- #
+# means intended for public access of data
+
 def zaid2za(zaid):
     """
     Convert ZZAAA to (Z,A) tuple.
@@ -314,12 +1858,115 @@ def zaid2za(zaid):
     return (Z, A)
 
 
+# ZAID conventions for zaids2zam and zam2zaids, with m the isomeric state
+#  (0 for the ground state, 1 for the first metastable state, ...)
+#   * 'zaid' : Z*1000 + A, with no isomeric state
+#   * 'mcnp' : Z*1000 + A, plus 400 for a metastable state, e.g., 95642
+#     for Am-242m, as in Nuclide.zaid(alternate=True); every m > 0 is
+#     written as 400 and read back as m = 1
+#   * 'zzaaas' : Z*10000 + A*10 + m, e.g., 952421 for Am-242m
+zaid_conventions = ('zaid', 'mcnp', 'zzaaas')
+
+
+def _zaid_integers(zaids):
+    """ZAIDs as an int64 array, without decimal library suffixes."""
+    zaids = np.asarray(zaids)
+    if zaids.dtype.kind in 'SU':
+        # e.g. '92235.80c'
+        dot = b'.' if zaids.dtype.kind == 'S' else '.'
+        zaids = np.char.partition(np.char.strip(zaids), dot)[..., 0]
+    elif zaids.dtype.kind == 'f':
+        zaids = np.floor(zaids)
+    return zaids.astype(np.int64)
+
+
+def zaids2zam(zaids, convention='mcnp'):
+    """
+    Convert an array of ZAIDs to (Z, A, m) int64 arrays, m being the
+    isomeric state.  ZAIDs may be integers, or floats or strings with a
+    decimal library suffix, e.g., 92235.80 or '92235.80c', which is
+    ignored.  See zaid_conventions.
+    """
+    zaids = _zaid_integers(zaids)
+    if convention == 'zzaaas':
+        Z, rest = np.divmod(zaids, 10000)
+        A, m = np.divmod(rest, 10)
+        return Z, A, m
+
+    Z, A = np.divmod(zaids, 1000)
+    if convention == 'zaid':
+        return Z, A, np.zeros_like(A)
+    if convention == 'mcnp':
+        metastable = A > 400
+        return Z, np.where(metastable, A - 400, A), metastable.astype(np.int64)
+    raise ValueError("unknown ZAID convention {!r}".format(convention))
+
+
+def zam2zaids(Z, A, m=0, convention='mcnp', suffix=None):
+    """
+    Convert arrays of Z, A and isomeric state m to integer ZAIDs, or, with
+    a library suffix, e.g., suffix='80c', to strings such as '92235.80c'.
+    See zaid_conventions.
+    """
+    Z, A, m = np.broadcast_arrays(np.asarray(Z, dtype=np.int64),
+                                  np.asarray(A, dtype=np.int64),
+                                  np.asarray(m, dtype=np.int64))
+    if convention == 'zzaaas':
+        zaids = Z * 10000 + A * 10 + m
+    elif convention == 'zaid':
+        zaids = Z * 1000 + A
+    elif convention == 'mcnp':
+        zaids = Z * 1000 + A + np.where(m > 0, 400, 0)
+    else:
+        raise ValueError("unknown ZAID convention {!r}".format(convention))
+
+    if suffix is None:
+        return zaids
+    return np.char.add(zaids.astype(str), '.' + suffix.lstrip('.'))
+
+
+def isomer_states(Z, A, E):
+    """
+    Return the isomeric state m of arrays Z, A, E: the index of E among the
+    states of (Z, A) in nuclide_table, so 0 for the ground state.  E = inf
+    (a metastable state of unspecified energy) gives 1, and E not in
+    nuclide_table gives -1.
+    """
+    Z, A, E = np.broadcast_arrays(np.asarray(Z, dtype=np.int64),
+                                  np.asarray(A, dtype=np.int64),
+                                  np.asarray(E, dtype=float))
+    rows = table_index(Z, A, np.where(np.isinf(E), 0., E))
+    ground = np.searchsorted(_table_keys, (Z * 1000 + A) * 10**9)
+    states = np.where(rows >= 0, rows - ground, -1)
+    return np.where(np.isinf(E) & (rows >= 0), 1, states)
+
 
-def nuc(Z, A, E=0.):
+def nuc(Z, A, E=0., tolerance=0.):
     """
-    Return nuclide data for Z, A, and (optionally) E of isomeric state.
+    Return nuclide data for Z, A, and (optionally) E of isomeric state, as
+    a ReadOnlyDict shared by every caller.
+
+    E must be an energy of isomers(Z, A), unless a tolerance in MeV is
+    given, when the nearest state within the tolerance is taken.
     """
-    return nuclides[(Z,A)][E]
+    if store_file:
+        if tolerance:
+            E = nearest_isomer(Z, A, E, tolerance)
+        return _store_nuclide(_store_row(Z, A, E))
+
+    _require('nuclides')
+    try:
+        return nuclides[(Z,A)][E]
+    except KeyError:
+        if not tolerance:
+            raise
+    return nuclides[(Z,A)][nearest_isomer(Z, A, E, tolerance)]
+
+
+def _isomer_levels(Z, A):
+    """Sorted energies of the states of (Z, A); KeyError if none."""
+    _require('table' if store_file else 'nuclides')
+    return isomer_levels[(Z,A)]
 
 
 def isomers(Z, A):
@@ -328,9 +1975,43 @@ def isomers(Z, A):
 
     Energies in MeV.
     """
-    isom = list(nuclides[(Z,A)].keys())
-    isom.sort()
-    return isom
+    _require('table' if store_file else 'nuclides')
+    return list(isomer_levels[(Z,A)])
+
+
+def isomer_index(Z, A, E, tolerance=E_quantum):
+    """
+    Return the isomeric state (0 for the ground state, 1 for the first
+    metastable state, ...) of the level of Z & A nearest to E, by
+    bisection.  Raises KeyError if it is more than `tolerance` MeV from E.
+    """
+    levels = _isomer_levels(Z, A)
+    i = bisect.bisect_left(levels, E)
+    if i == len(levels) or (i > 0 and E - levels[i - 1] <= levels[i] - E):
+        i -= 1
+    if not (abs(levels[i] - E) <= tolerance):
+        raise KeyError((Z, A, E))
+    return i
+
+
+def nearest_isomer(Z, A, E, tolerance=_inf):
+    """
+    Return the energy of the level of Z & A nearest to E, e.g., to match
+    an energy from another data source.  Raises KeyError if it is more
+    than `tolerance` MeV from E.
+    """
+    return _isomer_levels(Z, A)[isomer_index(Z, A, E, tolerance)]
+
+
+def isomer_energy(Z, A, state):
+    """
+    Return the energy of isomeric state `state` of Z & A (0 for the ground
+    state, 1 for the first metastable state, ...).
+    """
+    levels = _isomer_levels(Z, A)
+    if not (0 <= state < len(levels)):
+        raise KeyError((Z, A, state))
+    return levels[state]
 
 
 def weight(Z_or_symbol, A=None, E=0.):
@@ -340,6 +2021,268 @@ def weight(Z_or_symbol, A=None, E=0.):
     return return_nominal_value(Z_or_symbol, A, E, 'weight')
 
 
+# Identifier parsing --------------------------------------------------------
+#  One pattern for every string form of a nuclide identifier:
+#    symbol first: 'U235', 'U-235', 'Co- 58M', 'Am242m' (trailing M = metastable)
+#    number first: '235U', '235-U'
+#    ZAID: '92235', '08016', and MCNP '92235.80c'
+#  Letters may be upper or lower case.  As for integer ZAIDs, A > 400
+#  means metastable with A - 400 nucleons.
+_nuclide_id_pattern = re.compile(r"""
+    \s*(?:
+        (?P<symbol>[A-Z]{1,3}) \s*-?\s* (?P<A>\d{1,3}) \s*(?P<m>M)?
+      | (?P<A_first>\d{1,3}) \s*-?\s* (?P<symbol_last>[A-Z]{1,3})
+      | (?P<zaid>\d{4,6}) (?:\.\d*[A-Z]*)?
+    )\s*""", re.IGNORECASE | re.VERBOSE)
+
+
+def _parse_nuclide_id(nuc_id):
+    """Return (Z, A, E) for an identifier string, or None if it is invalid."""
+    match = _nuclide_id_pattern.fullmatch(nuc_id)
+    if match is None:
+        return None
+
+    symbol, A, m, A_first, symbol_last, zaid = match.groups()
+
+    if zaid is not None:
+        Z, A = divmod(int(zaid), 1000)
+    else:
+        _require('elements')
+        Z = sym2z.get((symbol or symbol_last).title())
+        if Z is None:
+            return None
+        A = int(A or A_first)
+
+    metastable = m is not None
+    if A > 400:
+        metastable = True
+        A -= 400
+
+    return Z, A, (np.inf if metastable else 0.)
+
+
+def parse_nuclide_id(nuc_id):
+    """
+    Return (Z, A, E) for a nuclide identifier string, e.g., 'U235',
+    'u-235', '235U', 'Am242m', '92235', '95642' or '92235.80c'.
+
+    E is 0 for the ground state and np.inf for a metastable state.
+    Raises ValueError if the string is not a nuclide identifier.
+    """
+    parsed = _parse_nuclide_id(nuc_id)
+    if parsed is None:
+        raise ValueError("unrecognized nuclide identifier {!r}".format(nuc_id))
+    return parsed
+
+
+def parse_nuclide_ids(nuc_ids):
+    """
+    Return (Z, A, E) arrays for a list of nuclide identifier strings, as
+    accepted by parse_nuclide_id.  Each distinct string is parsed once.
+    """
+    # distinct identifier -> position in the list of parsed identifiers
+    codes = {}
+    index = np.fromiter((codes.setdefault(nuc_id, len(codes))
+                         for nuc_id in nuc_ids), dtype=np.intp)
+
+    parsed = [_parse_nuclide_id(nuc_id) for nuc_id in codes]
+    if None in parsed:
+        raise ValueError("unrecognized nuclide identifier {!r}".format(
+            list(codes)[parsed.index(None)]))
+
+    Z, A, E = _zae_columns(parsed)
+    return Z[index], A[index], E[index]
+
+
+# Batch lookups -----------------------------------------------------------
+#  Each function takes either arrays of Z, A and (optionally) E, which are
+#  broadcast against each other, or a list/array of nuclide identifiers
+#  (anything accepted by Nuclide, or integer ZAIDs) with A=None.  The
+#  result is a float array, with NaN where data is unavailable: for any
+#  well-formed identifier (string or ZAID) of a nuclide that is not in the
+#  data.  An identifier that cannot be parsed at all, such as a malformed
+#  string or an unknown element symbol, raises ValueError for the whole
+#  batch, since it is a mistake in the input rather than missing data.
+
+def nuclide_arrays(nuc_ids):
+    """
+    Return (Z, A, E) arrays for a list or array of nuclide identifiers.
+
+    Integer arrays are converted as ZAIDs without a Python loop; strings
+    are parsed with parse_nuclide_ids.  A metastable state of
+    unspecified energy has E = np.inf.
+    """
+    if not isinstance(nuc_ids, np.ndarray):
+        nuc_ids = list(nuc_ids)
+        if nuc_ids and not isinstance(nuc_ids[0], (str, bytes, int, np.integer)):
+            # e.g. (Z, A) tuples or Nuclide objects
+            return _zae_columns([_identify(nuc_id) for nuc_id in nuc_ids])
+
+    ids = np.asarray(nuc_ids)
+
+    if ids.dtype.kind in 'iu':
+        Z, A = np.divmod(ids.astype(np.int64), 1000)
+        metastable = A > 400
+        return (Z, np.where(metastable, A - 400, A),
+                np.where(metastable, np.inf, 0.))
+
+    if ids.dtype.kind == 'S':
+        ids = ids.astype(str)
+
+    Z, A, E = parse_nuclide_ids(ids.ravel().tolist())
+    return Z.reshape(ids.shape), A.reshape(ids.shape), E.reshape(ids.shape)
+
+
+def _zae_columns(identified):
+    """Transpose a list of (Z, A, E) into arrays."""
+    Z, A, E = zip(*identified) if identified else ((), (), ())
+    return (np.array(Z, dtype=np.int64), np.array(A, dtype=np.int64),
+            np.array(E, dtype=float))
+
+
+_element_table_dtype = np.dtype([
+    ('Z', 'i4'), ('symbol', 'U3'), ('weight', 'f8'), ('weight_sigma', 'f8')])
+
+
+@_data_source('elements table', ['element_table'], requires=['elements', 'nist'])
+def _build_element_table():
+    # Row Z holds element Z; row 0 is the neutron
+    element_table = np.zeros(max(z2sym) + 1, dtype=_element_table_dtype)
+
+    element_table['Z'] = np.arange(len(element_table))
+    element_table['symbol'][0] = 'n'
+    element_table['weight'] = np.nan
+    element_table['weight_sigma'] = np.nan
+    for Z in z2sym:
+        element_table['symbol'][Z] = z2sym[Z]
+    for Z in atomic_weights:
+        element_table['weight'][Z], element_table['weight_sigma'][Z] = \
+            _nominal_and_sigma(atomic_weights[Z], nist_per_element[Z][0].get(
+                'Standard Atomic Weight' + sigma_suffix, 0.))
+
+    return {'element_table': element_table}
+
+
+def _batch_lookup(field, Z_or_ids, A, E, elements=None):
+    """
+    Return `field` of nuclide_table for a batch of nuclides.  Where A is 0
+    the value is taken from the `elements` field of element_table.
+    """
+    if A is None:
+        Z, A, E = nuclide_arrays(Z_or_ids)
+    else:
+        Z, A, E = np.broadcast_arrays(np.asarray(Z_or_ids, dtype=np.int64),
+                                      np.asarray(A, dtype=np.int64),
+                                      np.asarray(E, dtype=float))
+
+    _require('table')
+    rows = table_index(Z, A, E)
+    values = np.where(rows >= 0, nuclide_table[field][rows], np.nan)
+
+    if elements is not None:
+        _require('elements table')
+        element = (A == 0) & (Z >= 0) & (Z < len(element_table))
+        values[element] = element_table[elements][Z[element]]
+
+    return values
+
+
+def weights(Z_or_ids, A=None, E=0.):
+    """
+    Return an array of atomic weights for a batch of nuclides.
+
+    A = 0 (e.g., ZAID 92000) gives the standard atomic weight of element Z.
+    Nuclides not in the data give NaN; identifiers that cannot be parsed
+    raise ValueError.
+    """
+    return _batch_lookup('weight', Z_or_ids, A, E, elements='weight')
+
+
+def half_lives(Z_or_ids, A=None, E=0.):
+    """
+    Return an array of half-lives in seconds for a batch of nuclides.
+    Nuclides not in the data give NaN; identifiers that cannot be parsed
+    raise ValueError.
+    """
+    return _batch_lookup('half_life', Z_or_ids, A, E)
+
+
+def decay_consts(Z_or_ids, A=None, E=0.):
+    """
+    Return an array of decay constants in 1/seconds for a batch of nuclides.
+    Nuclides not in the data give NaN; identifiers that cannot be parsed
+    raise ValueError.
+    """
+    return _batch_lookup('lambda', Z_or_ids, A, E)
+
+
+def _identify(nuc_id, E=0., metastable=False):
+    """
+    Return (Z, A, E) of a nuclide identifier, as accepted by Nuclide.
+
+    E is np.inf for a metastable state of unspecified energy.
+    """
+    Z = A = None
+
+    try:
+        # Object with attributes
+        Z, A = nuc_id.Z, nuc_id.A
+        try:
+            E = nuc_id.E
+        except AttributeError:
+            E = 0.
+    except AttributeError:
+
+        try:
+            # Dictionary
+            Z, A = nuc_id['Z'], nuc_id['A']
+            try:
+                E = nuc_id['E']
+            except (KeyError, TypeError):
+                E = 0.
+        except (KeyError, TypeError):
+
+            # Integer ZAID
+            if type(nuc_id) is int:
+                Z, A = zaid2za(nuc_id)
+
+            # List or tuple
+            if type(nuc_id) in [list, tuple]:
+                if len(nuc_id) == 2:
+                    Z, A = nuc_id
+                if len(nuc_id) == 3:
+                    Z, A, E = nuc_id
+
+            # String
+            if type(nuc_id) is str:
+                parsed = _parse_nuclide_id(nuc_id)
+                if parsed is not None:
+                    Z, A, E_parsed = parsed
+                    metastable = metastable or E_parsed > 0.
+                else:
+                    # An unknown symbol is a KeyError, as from sym2z
+                    match = _nuclide_id_pattern.fullmatch(nuc_id)
+                    if match is not None and match.group('zaid') is None:
+                        raise KeyError((match.group('symbol')
+                                        or match.group('symbol_last')).title())
+
+    if A is None:
+        raise ValueError("unrecognized nuclide identifier {!r}".format(nuc_id))
+
+    # Metastable can be specified by either E, metastable flag, or A > 400.
+    #  If flag is given but E is not, then set E to inf as
+    #  an indication that it is not stable, but that the exact
+    #  E value isn't given.
+    if A > 400:
+        metastable = True
+        A -= 400
+
+    if metastable and E==0.:
+        E = np.inf
+
+    return Z, A, E
+
+
 @total_ordering
 class Nuclide:
     """
@@ -349,8 +2292,8 @@ class Nuclide:
        * Alphanumeric: 'U235', 'U-235', '235U', '235-U'
            -- letters may be lower or uppercase
        * ZAID: 92235, "92235"
-       * Tuple/list: (92, 235), [92, 235] 
-       * Tuple/list with energy: (92, 235, 0.5), [92, 235, 0.5] 
+       * Tuple/list: (92, 235), [92, 235]
+       * Tuple/list with energy: (92, 235, 0.5), [92, 235, 0.5]
        * Dictionary: {'Z':92, 'A':235}
        * Object x with x.Z and x.A integer attributes
        * Metastable, only as "Am242m" or "AM-242M"
@@ -365,114 +2308,57 @@ class Nuclide:
 
     If E is provides as part of nuc_id, then it overrides the value
     provided to the keyword.
+
+    Nuclides compare and hash by (Z, A, E), with E rounded to E_quantum.
     """
 
+    __slots__ = ('Z', 'A', 'E', 'metastable', 'element', 'weight', 'mat')
 
     def __init__(self, nuc_id, E=0., metastable=False):
 
-        try:
-            # Object with attributes
-            self.Z, self.A = nuc_id.Z, nuc_id.A
-            try:
-                E = nuc_id.E
-            except AttributeError:
-                E = 0.
-        except AttributeError:
-
-            try:
-                # Dictionary
-                self.Z, self.A = nuc_id['Z'], nuc_id['A']
-                try:
-                    E = nuc_id['E']
-                except (KeyError, TypeError):
-                    E = 0.
-            except (KeyError, TypeError):
-
-                # Integer ZAID
-                if type(nuc_id) is int:
-                    self.Z, self.A = zaid2za(nuc_id)
-
-                # List or tuple
-                if type(nuc_id) in [list, tuple]:
-                    if len(nuc_id) == 2:
-                        self.Z, self.A = nuc_id
-                    if len(nuc_id) == 3:
-                        self.Z, self.A, E = nuc_id
-
-                # String
-                if type(nuc_id) is str:
-
-                    # Alphanumeric
-                    if re.search('[a-zA-Z]', nuc_id):
-
-                        # upper case to make comparison easier
-                        nuc_id = nuc_id.upper()
-
-                        # Metastable
-                        if ( nuc_id[0] in string.ascii_letters 
-                                          and nuc_id[-1] == 'M'):
-                            metastable = True
-                            nuc_id = nuc_id[:-1]
-
-
-                        # Hyphenated
-                        if re.search('-', nuc_id):
-                            s1, s2 = nuc_id.split('-')
-                            s1 = s1.strip()
-                            s2 = s2.strip()
-                        else:
-                            s1 = ''.join(filter(lambda x: x in string.ascii_letters, nuc_id))
-                            s2 = ''.join(filter(lambda x: not (x in string.ascii_letters), nuc_id)).strip()
-                            
-
-                        # Not sure of the order of s1 & s2,
-                        #  so try one, then the other.
-                        try:
-                            self.Z = sym2z[s1.title()]
-                            self.A = int(s2)
-                        except:
-                            self.Z = sym2z[s2.title()]
-                            self.A = int(s1)
-                                
-                        
-                    else: # assume it is a ZAID string
-                        self.Z, self.A = zaid2za(nuc_id)
-        
-        # Metastable can be specified by either E, metastable flag, or A > 400.
-        #  If flag is given but E is not, then set E to inf as
-        #  an indication that it is not stable, but that the exact
-        #  E value isn't given.
-        if self.A > 400:
-            metastable = True
-            self.A -= 400
-
-        if metastable and E==0.:
-            E = np.inf
+        self.Z, self.A, E = _identify(nuc_id, E, metastable)
 
         self.metastable = E > 0.
 
         # Assign E, unless it has already been set
         self.E = E
 
-        self.element = z2sym[self.Z]
+        self.element = _z2sym(self.Z)
 
         # Assign E for list of metastable nuclides if E wasn't provided
-        if (self.E is np.inf and 
-               self.__repr__() in default_isomer_E.keys()):
-            self.E = default_isomer_E[self.__repr__()]
-            
-            
+        if self.E is np.inf:
+            if store_file:
+                # The default isomer is the first state above the ground state
+                row = table_index(self.Z, self.A, np.inf)
+                if row >= 0:
+                    self.E = float(nuclide_table['E'][row])
+            else:
+                _require('nuclides')
+                if self.__repr__() in default_isomer_E.keys():
+                    self.E = default_isomer_E[self.__repr__()]
+
+
         try:
             self.weight = return_nominal_value(self.Z, self.A, self.E, 'weight')
         except:
+            _count_warning('weight not available')
             warnings.warn("nuclide weight not available for {}".format(self))
 
         # Set MAT for ENDF6
+        _require('mats')
         try:
             self.mat = mats[(self.Z, self.A, self.metastable)]
         except:
+            _count_warning('not on ENDF/B-VII.1 library')
             warnings.warn("nuclide {} not on ENDFB-VII.1 neutron library".format(self))
 
+    def library_mat(self, library=None):
+        """
+        Return the MAT of this nuclide in a registered ENDF library; the
+        default library's MAT is also the mat attribute.
+        """
+        return library_mats(library)[(self.Z, self.A, self.metastable)]
+
     def zaid(self, alternate=False):
         if self.metastable and alternate:
             return self.Z*1000 + self.A + 400
@@ -492,7 +2378,7 @@ class Nuclide:
             return "{x.element}-{x.A}m".format(x=self)
 
     def __key__(self):
-        return (self.Z, self.A, self.E)
+        return _nuclide_key(self.Z, self.A, self.E)
 
 
     def __hash__(self):
@@ -500,11 +2386,190 @@ class Nuclide:
 
 
     def __eq__(self, other):
-        E_test = np.allclose([self.E,], [other.E])
-        return ( (self.Z, self.A) == (other.Z, other.A) ) and E_test
+        other_key = _other_key(other)
+        if other_key is None:
+            return NotImplemented
+        return self.__key__() == other_key
 
 
     def __lt__(self, other):
-        return ( (self.Z, self.A, self.E) < (other.Z, other.A, other.E) )
+        try:
+            # Only round E when needed to break a tie
+            ZA, other_ZA = (self.Z, self.A), (other.Z, other.A)
+        except AttributeError:
+            return NotImplemented
+        if ZA != other_ZA:
+            return ZA < other_ZA
+        other_key = _other_key(other)
+        if other_key is None:
+            return NotImplemented
+        return self.__key__() < other_key
 
 
+def _other_key(other):
+    """
+    Key of a Nuclide, or of any other object with Z, A and E attributes,
+    for comparisons; None if other has neither.
+    """
+    try:
+        return other.__key__()
+    except AttributeError:
+        pass
+    try:
+        return _nuclide_key(other.Z, other.A, other.E)
+    except AttributeError:
+        return None
+
+
+def _nuclide_key(Z, A, E):
+    """(Z, A, E) with E rounded to E_quantum, so that equal nuclides hash equally."""
+    return (Z, A, E if E == _inf else round(E * _per_E_quantum))
+
+
+class _InternedNuclide(Nuclide):
+    """A Nuclide shared through intern_nuclide(), which cannot be modified."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("interned {!r} is read-only".format(self))
+
+    def __delattr__(self, name):
+        raise AttributeError("interned {!r} is read-only".format(self))
+
+    # Copies and unpickled instances are the shared instance, e.g., in the
+    #  results of a process pool
+    def __reduce__(self):
+        return (_interned_nuclide, (self.Z, self.A, self.E))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class _NuclideInterner:
+    """
+    Return a shared, read-only Nuclide for nuc_id, E and metastable,
+    constructing it only the first time.
+
+    Instances are cached in a bounded LRU keyed on the identifier as given
+    (for strings, integers and tuples) and on the canonical (Z, A, E), with
+    E rounded to E_quantum as in Nuclide.__hash__, so that 'U235', 'u-235'
+    and 92235 all return the same instance.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self.cache_clear()
+
+    def __call__(self, nuc_id, E=0., metastable=False):
+        if type(nuc_id) in (str, int, tuple):
+            raw_key = (type(nuc_id), nuc_id, E, metastable)
+        else:
+            raw_key = None
+
+        with self._lock:
+            try:
+                nuclide = self._by_id[raw_key]
+            except (KeyError, TypeError):
+                pass
+            else:
+                self._by_id.move_to_end(raw_key)
+                self._hits += 1
+                return nuclide
+
+        # Identify first, in case another spelling was interned already
+        Z, A, E = _identify(nuc_id, E, metastable)
+        key = _nuclide_key(Z, A, E)
+
+        with self._lock:
+            nuclide = self._by_key.get(key)
+            if nuclide is not None:
+                self._by_key.move_to_end(key)
+                self._canonical_hits += 1
+            else:
+                self._misses += 1
+
+        if nuclide is None:
+            nuclide = Nuclide((Z, A, E))
+            nuclide.__class__ = _InternedNuclide
+
+        with self._lock:
+            # An unspecified isomer energy (np.inf) that Nuclide resolved
+            #  to a known one is keyed both ways
+            nuclide = self._by_key.setdefault(nuclide.__key__(), nuclide)
+            self._store(self._by_key, key, nuclide)
+            if raw_key is not None:
+                try:
+                    self._store(self._by_id, raw_key, nuclide)
+                except TypeError:
+                    # e.g. a tuple holding a list
+                    pass
+
+        return nuclide
+
+    def _store(self, cache, key, nuclide):
+        cache[key] = nuclide
+        cache.move_to_end(key)
+        while len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+    def cache_info(self):
+        """
+        Return a dictionary of cache statistics: hits by identifier,
+        hits by (Z, A, E) after identifying, misses, and cache sizes.
+        """
+        with self._lock:
+            return {'hits': self._hits,
+                    'canonical_hits': self._canonical_hits,
+                    'misses': self._misses,
+                    'maxsize': self.maxsize,
+                    'ids': len(self._by_id),
+                    'nuclides': len(set(map(id, self._by_key.values())))}
+
+    def cache_clear(self):
+        """Empty the cache and reset the statistics."""
+        with self._lock:
+            self._by_id = OrderedDict()
+            self._by_key = OrderedDict()
+            self._hits = self._canonical_hits = self._misses = 0
+
+
+intern_nuclide = _NuclideInterner(maxsize=8192)
+
+
+def _interned_nuclide(Z, A, E):
+    """intern_nuclide((Z, A, E)), for unpickling interned nuclides."""
+    return intern_nuclide((Z, A, E))
+
+
+_instrumented_functions.update([
+    ('return_nominal_value', (sys.modules[__name__], 'return_nominal_value')),
+    ('nuc', (sys.modules[__name__], 'nuc')),
+    ('Nuclide', (Nuclide, '__init__')),
+    ])
+
+if os.environ.get('NUCLIDE_DATA_STATS', '') not in ('', '0'):
+    enable_stats()
+
+# Names exported by ``from nuclide_data import *``: the functions, classes
+#  and settings defined here, without imported helpers, and the public data
+#  tables, which a star import loads.  The intermediate results of parsing
+#  are left out.  __all__ itself comes from __getattr__, so that in store
+#  mode it only lists the tables of the store.
+_public_names = [ name for name, value in list(globals().items())
+                  if not (name.startswith('_')
+                          or isinstance(value, types.ModuleType)
+                          or (callable(value) and
+                              getattr(value, '__module__', __name__) != __name__)) ]
+
+_parse_intermediates = ('nist_nuclide_raw_list', 'nist_nuclide_processed_list',
+                        'wallet_content', 'wallet_lines',
+                        'wallet_nuclide_processed_list')
+
+_public_tables = sorted( name for name in _lazy_attributes
+                         if not (name.startswith('_')
+                                 or name in _parse_intermediates) )
@@ -0,0 +1,665 @@
+#!/usr/bin/env python
+"""
+Radioactive decay of nuclide inventories, from the Nuclear Wallet Card
+decay modes in nuclide_data.
+
+Inventories are arrays over the rows of nuclide_data.nuclide_table, one
+row per isomer.  The decay modes are assembled once into a sparse
+transition matrix A, with dN/dt = A N, and batches of inventories are
+decayed with the order-16 Chebyshev rational approximation (CRAM) of
+exp(A t).  Since the decay graph is acyclic, each linear system of CRAM is
+triangular, and is solved level by level of the graph.
+
+Activities and decay heat of inventories, per nuclide or per decay mode,
+come from coefficients computed once from the decay constants, branch
+fractions and Q-values.
+
+"""
+
+import functools
+
+import numpy as np
+
+import nuclide_data
+
+NEUTRON, PROTON, ALPHA = (0, 1), (1, 1), (2, 4)
+
+# decay mode -> (change of Z, change of A, emitted light nuclides)
+#  The daughter is taken in its ground state.  Emitted light nuclides are
+#  tracked as (Z, A).  Fission ('SF', 'BF', 'EF') and cluster emission of
+#  unspecified mass ('Ne', 'Mg') have no tracked products.
+decay_mode_products = {
+    'B-':   ( 1,   0, ()),
+    '2B-':  ( 2,   0, ()),
+    'EC':   (-1,   0, ()),
+    '2EC':  (-2,   0, ()),
+    'IT':   ( 0,   0, ()),
+    'A':    (-2,  -4, (ALPHA,)),
+    'A<':   (-2,  -4, (ALPHA,)),
+    '2A':   (-4,  -8, (ALPHA, ALPHA)),
+    'N':    ( 0,  -1, (NEUTRON,)),
+    '2N':   ( 0,  -2, (NEUTRON, NEUTRON)),
+    '2N?':  ( 0,  -2, (NEUTRON, NEUTRON)),
+    'P':    (-1,  -1, (PROTON,)),
+    '2P':   (-2,  -2, (PROTON, PROTON)),
+    'BN':   ( 1,  -1, (NEUTRON,)),
+    'B2N':  ( 1,  -2, (NEUTRON, NEUTRON)),
+    'B3N':  ( 1,  -3, (NEUTRON,) * 3),
+    'B4N':  ( 1,  -4, (NEUTRON,) * 4),
+    'BA':   (-1,  -4, (ALPHA,)),
+    'BNA':  (-1,  -5, (NEUTRON, ALPHA)),
+    'B3A':  (-5, -12, (ALPHA,) * 3),
+    'EP':   (-2,  -1, (PROTON,)),
+    'E2P':  (-3,  -2, (PROTON, PROTON)),
+    'E3P':  (-4,  -3, (PROTON,) * 3),
+    'EA':   (-3,  -4, (ALPHA,)),
+    '12C':  (-6, -12, ((6, 12),)),
+    '14C':  (-6, -14, ((6, 14),)),
+    '20O':  (-8, -20, ((8, 20),)),
+    '22Ne': (-10, -22, ((10, 22),)),
+    '24Ne': (-10, -24, ((10, 24),)),
+    '28Mg': (-12, -28, ((12, 28),)),
+    '34Si': (-14, -34, ((14, 34),)),
+    }
+
+# Beta-delayed modes are listed as a part of their primary mode, e.g.,
+#  'B- 100%, BN 50%' means half the decays emit a neutron.
+primary_modes = {
+    'BN': 'B-', 'B2N': 'B-', 'B3N': 'B-', 'B4N': 'B-', 'BA': 'B-',
+    'BNA': 'B-', 'B3A': 'B-', 'BF': 'B-',
+    'EP': 'EC', 'E2P': 'EC', 'E3P': 'EC', 'EA': 'EC', 'EF': 'EC',
+    }
+
+# Decay constant in 1/s used for states listed without a half-life, which
+#  are mostly particle-unbound (nuclide_table['lambda'] is inf).
+prompt_decay_const = 1e12
+
+# Order-16 CRAM in incomplete partial fraction form, from
+#  M. Pusa, "Higher-Order Chebyshev Rational Approximation Method and
+#  Application to Burnup Equations", Nucl. Sci. Eng. 182 (2016)
+_cram_alpha0 = 2.124853710495224e-16
+_cram_alpha = np.array([
+    +5.464930576870210e+3 - 3.797983575308356e+4j,
+    +9.045112476907548e+1 - 1.115537522430261e+3j,
+    +2.344818070467641e+2 - 4.228020157070496e+2j,
+    +9.453304067358312e+1 - 2.951294291446048e+2j,
+    +7.283792954673409e+2 - 1.205646080220011e+5j,
+    +3.648229059594851e+1 - 1.155509621409682e+2j,
+    +2.547321630156819e+1 - 2.639500283021502e+1j,
+    +2.394538338734709e+1 - 5.650522971778156e+0j])
+_cram_theta = np.array([
+    +3.509103608414918 + 8.436198985884374j,
+    +5.948152268951177 + 3.587457362018322j,
+    -5.264971343442647 + 16.22022147316793j,
+    +1.419375897185666 + 10.92536348449672j,
+    +6.416177699099435 + 1.194122393370139j,
+    +4.993174737717997 + 5.996881713603942j,
+    -1.413928462488886 + 13.49772569889275j,
+    -10.84391707869699 + 19.27744616718165j])
+
+# Number of inventories decayed together
+_block_size = 64
+
+
+def _read_only(*arrays):
+    for a in arrays:
+        a.setflags(write=False)
+    return arrays
+
+
+def _branch_fractions(modes, branches):
+    """
+    Return the fraction of decays by each mode.
+
+    Beta-delayed branches are taken out of their primary branch, unknown
+    branches share what the known ones leave, and the total is at most 1.
+    """
+    fractions = dict(zip(modes, np.nan_to_num(branches)))
+    for mode in modes:
+        primary = primary_modes.get(mode)
+        if primary in fractions:
+            fractions[primary] -= fractions[mode]
+
+    unknown = [mode for mode, b in zip(modes, branches) if np.isnan(b)]
+    if unknown:
+        remainder = max(0., 1. - sum(fractions.values()))
+        for mode in unknown:
+            fractions[mode] = remainder / len(unknown)
+
+    fractions = dict((mode, max(f, 0.)) for mode, f in fractions.items())
+    total = sum(fractions.values())
+    if total > 1.:
+        fractions = dict((mode, f / total) for mode, f in fractions.items())
+    return fractions
+
+
+@functools.lru_cache(maxsize=None)
+def decay_transitions():
+    """
+    Return the decay transitions as arrays (parent, product, yield, mode).
+
+    parent and product are rows of nuclide_table, and yield is the number
+    of product nuclides per decay of the parent by that mode.  Products
+    include emitted light nuclides (n, p, alpha, clusters).  Products that
+    are not in nuclide_table are left out.
+    """
+    table = nuclide_data.nuclide_table
+    decays = nuclide_data.decay_table
+    offsets = nuclide_data.decay_offsets
+
+    parents, dZ, dA, yields, modes = [], [], [], [], []
+    for parent in np.nonzero(np.diff(offsets))[0]:
+        decay = decays[offsets[parent]:offsets[parent+1]]
+        modes_of_parent = list(decay['mode'])
+        fractions = _branch_fractions(modes_of_parent, decay['branch'])
+
+        for mode in modes_of_parent:
+            if not (mode in decay_mode_products) or fractions[mode] == 0.:
+                continue
+            change_Z, change_A, emitted = decay_mode_products[mode]
+
+            # Daughter and emitted light nuclides, relative to the parent
+            changes = [(change_Z, change_A)]
+            for Z, A in emitted:
+                changes.append((Z - table['Z'][parent], A - table['A'][parent]))
+
+            for change in set(changes):
+                parents.append(parent)
+                dZ.append(change[0])
+                dA.append(change[1])
+                yields.append(fractions[mode] * changes.count(change))
+                modes.append(mode)
+
+    parents = np.array(parents, dtype=np.int64)
+    products = nuclide_data.table_index(table['Z'][parents] + np.array(dZ, dtype=int),
+                                        table['A'][parents] + np.array(dA, dtype=int))
+
+    # Leave out products off the chart, and isomeric transitions of ground
+    #  states to themselves, which come from isomers of unknown energy
+    #  merged into the ground state.
+    keep = (products >= 0) & (products != parents)
+
+    return _read_only(parents[keep], products[keep],
+                      np.array(yields)[keep], np.array(modes)[keep])
+
+
+def _decay_consts():
+    """
+    Return the decay constants, in 1/s, used for each row of nuclide_table,
+    with prompt_decay_const for states without a half-life.
+    """
+    lambdas = nuclide_data.nuclide_table['lambda']
+    return np.where(np.isinf(lambdas), prompt_decay_const, lambdas)
+
+
+def decay_matrix():
+    """
+    Return the decay matrix A, dN/dt = A N, in coordinate form as arrays
+    (rows, cols, values) over rows of nuclide_table.
+    """
+    parents, products, yields, modes = decay_transitions()
+    lambdas = _decay_consts()
+    n = len(lambdas)
+
+    rows = np.concatenate([np.arange(n), products])
+    cols = np.concatenate([np.arange(n), parents])
+    values = np.concatenate([-lambdas, lambdas[parents] * yields])
+    return rows, cols, values
+
+
+@functools.lru_cache(maxsize=None)
+def decay_levels():
+    """
+    Return the level of each row of nuclide_table in the decay graph: 0 for
+    nuclides that no other nuclide decays to, and otherwise one more than
+    the highest level of a parent.
+    """
+    parents, products, yields, modes = decay_transitions()
+    levels = _graph_levels(parents, products, len(nuclide_data.nuclide_table))
+    if levels is None:
+        cycle = _graph_cycle(parents, products, len(nuclide_data.nuclide_table))
+        raise ValueError("decay graph has a cycle: {}".format(
+            ' -> '.join(map(repr, map(_table_nuclide, cycle)))))
+    return _read_only(levels)[0]
+
+
+def _graph_levels(parents, products, n):
+    """
+    Return the levels of the n nodes of the graph with edges parents ->
+    products, or None if the graph has a cycle.
+    """
+    levels = np.zeros(n, dtype=np.int64)
+
+    # Relax along every edge until nothing changes; the number of passes is
+    #  the length of the longest decay chain.
+    for _ in range(n + 1):
+        new_levels = levels.copy()
+        np.maximum.at(new_levels, products, levels[parents] + 1)
+        if (new_levels == levels).all():
+            return levels
+        levels = new_levels
+    return None
+
+
+def _graph_cycle(parents, products, n):
+    """
+    Return the nodes of a cycle of the graph with edges parents -> products,
+    in order, or None if it is acyclic.
+    """
+    # Take away nodes without parents until only cycles and the nodes they
+    #  lead to are left; each of those has a parent left
+    parent_counts = np.bincount(products, minlength=n)
+    left = np.ones(n, dtype=bool)
+    removed = np.nonzero(parent_counts == 0)[0].tolist()
+    daughters = [[] for _ in range(n)]
+    for parent, product in zip(parents.tolist(), products.tolist()):
+        daughters[parent].append(product)
+    while removed:
+        node = removed.pop()
+        left[node] = False
+        for product in daughters[node]:
+            parent_counts[product] -= 1
+            if parent_counts[product] == 0:
+                removed.append(product)
+    if not left.any():
+        return None
+
+    # Walk back along parents that are left until a node repeats
+    parent_left = {}
+    for parent, product in zip(parents.tolist(), products.tolist()):
+        if left[parent] and left[product]:
+            parent_left.setdefault(product, parent)
+    path = [int(np.argmax(left))]
+    seen = {path[0]: 0}
+    while True:
+        node = parent_left[path[-1]]
+        if node in seen:
+            return path[seen[node]:][::-1]
+        seen[node] = len(path)
+        path.append(node)
+
+
+@functools.lru_cache(maxsize=None)
+def decay_order():
+    """
+    Return the rows of nuclide_table in topological order of the decay
+    graph: every nuclide comes before the nuclides it decays to.
+    """
+    return _read_only(np.argsort(decay_levels(), kind='stable'))[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _decay_graph(particles):
+    """
+    Return the decay graph as two tuples indexed by row of nuclide_table,
+    (daughters, parents), with daughters[row] and parents[row] tuples of
+    (row, yield).  Transitions by several modes to the same product are
+    combined.  Emitted light nuclides are left out unless `particles`.
+    """
+    table = nuclide_data.nuclide_table
+    parents, products, yields, modes = decay_transitions()
+
+    if not particles:
+        change = np.array([decay_mode_products[mode][:2] for mode in modes],
+                          dtype=int).reshape(-1, 2)
+        daughter = ((table['Z'][products] - table['Z'][parents] == change[:, 0])
+                    & (table['A'][products] - table['A'][parents] == change[:, 1]))
+        parents, products, yields = (parents[daughter], products[daughter],
+                                     yields[daughter])
+
+    combined = {}
+    for parent, product, y in zip(parents.tolist(), products.tolist(),
+                                  yields.tolist()):
+        combined[parent, product] = combined.get((parent, product), 0.) + y
+
+    daughter_lists = [[] for _ in range(len(table))]
+    parent_lists = [[] for _ in range(len(table))]
+    for (parent, product), y in combined.items():
+        daughter_lists[parent].append((product, y))
+        parent_lists[product].append((parent, y))
+
+    return (tuple(tuple(d) for d in daughter_lists),
+            tuple(tuple(sorted(p)) for p in parent_lists))
+
+
+def daughters(row, particles=False):
+    """
+    Return the nuclides that row `row` of nuclide_table decays to, as a
+    tuple of (row, yield), with yield the number per decay.  Emitted
+    neutrons, protons, alphas and clusters are included if `particles`.
+    """
+    return _decay_graph(particles)[0][row]
+
+
+def parents(row, particles=False):
+    """
+    Return the nuclides that decay to row `row` of nuclide_table, as a tuple
+    of (row, yield), with yield the number of `row` per decay of the parent.
+    Parents that only emit `row` as a light particle are included if
+    `particles`.
+    """
+    return _decay_graph(particles)[1][row]
+
+
+def decay_chains(row, max_depth=None, min_branch=0.):
+    """
+    Return the decay chains starting from row `row` of nuclide_table, as a
+    list of (chain, branch), with chain a tuple of rows and branch the
+    fraction of decays of `row` that follow it.
+
+    A chain ends at a nuclide with no tracked daughters, after `max_depth`
+    decays, or where following it further would leave a branch of
+    `min_branch` or less.
+    """
+    daughter_lists = _decay_graph(False)[0]
+    chains = []
+    stack = [((int(row),), 1.)]
+    while stack:
+        chain, branch = stack.pop()
+        following = []
+        if max_depth is None or len(chain) <= max_depth:
+            following = [ (chain + (daughter,), branch * y)
+                          for daughter, y in daughter_lists[chain[-1]]
+                          if branch * y > min_branch ]
+        if following:
+            stack.extend(reversed(following))
+        else:
+            chains.append((chain, branch))
+    return chains
+
+
+def _table_nuclide(row):
+    """Interned Nuclide of a row of nuclide_table."""
+    Z, A, E = nuclide_data.nuclide_table[['Z', 'A', 'E']][row].tolist()
+    return nuclide_data.intern_nuclide((Z, A, E))
+
+
+def _nuclide_row(nuc_id):
+    """Row of nuclide_table of a nuclide identifier, as accepted by Nuclide."""
+    nuclide = nuclide_data.Nuclide(nuc_id)
+    row = int(nuclide_data.table_index(nuclide.Z, nuclide.A, nuclide.E))
+    if row < 0:
+        raise KeyError("no decay data for {}".format(nuclide))
+    return row
+
+
+def daughter_nuclides(nuc_id, particles=False):
+    """daughters() of a nuclide identifier, as a list of (Nuclide, yield)."""
+    return [ (_table_nuclide(row), y)
+             for row, y in daughters(_nuclide_row(nuc_id), particles) ]
+
+
+def parent_nuclides(nuc_id, particles=False):
+    """parents() of a nuclide identifier, as a list of (Nuclide, yield)."""
+    return [ (_table_nuclide(row), y)
+             for row, y in parents(_nuclide_row(nuc_id), particles) ]
+
+
+def nuclide_decay_chains(nuc_id, max_depth=None, min_branch=0.):
+    """
+    decay_chains() of a nuclide identifier, as a list of (chain, branch),
+    chain a tuple of Nuclides.
+    """
+    return [ (tuple(_table_nuclide(row) for row in chain), branch)
+             for chain, branch in decay_chains(_nuclide_row(nuc_id),
+                                               max_depth, min_branch) ]
+
+
+def inventory(amounts):
+    """
+    Return an inventory array from a dictionary {nuclide id: amount}, or an
+    array of shape (len(amounts), n) from a list of such dictionaries.
+    Nuclide ids are anything accepted by nuclide_data.nuclide_arrays.
+    """
+    if isinstance(amounts, dict):
+        return inventory([amounts])[0]
+
+    n = len(nuclide_data.nuclide_table)
+    inventories = np.zeros((len(amounts), n))
+    for i, composition in enumerate(amounts):
+        rows = nuclide_data.table_index(*nuclide_data.nuclide_arrays(list(composition)))
+        if (rows < 0).any():
+            missing = np.array(list(composition), dtype=object)[rows < 0]
+            raise KeyError("no decay data for {}".format(list(missing)))
+        np.add.at(inventories[i], rows, list(composition.values()))
+    return inventories
+
+
+class _TriangularSystem:
+    """
+    The decay matrix restricted to the nuclides reachable from some set,
+    ordered by decay level so that each level is a contiguous block that
+    depends only on earlier blocks.
+    """
+
+    def __init__(self, reachable):
+        parents, products, yields, modes = decay_transitions()
+        levels = decay_levels()
+
+        self.rows = np.nonzero(reachable)[0]
+        self.rows = self.rows[np.argsort(levels[self.rows], kind='stable')]
+        local = np.full(len(reachable), -1)
+        local[self.rows] = np.arange(len(self.rows))
+
+        self.lambdas = _decay_consts()[self.rows]
+        self.level_bounds = np.searchsorted(levels[self.rows],
+                                            np.arange(levels[self.rows].max() + 2))
+
+        # Off-diagonal entries, sorted by local row
+        edges = reachable[parents]
+        rows, cols = local[products[edges]], local[parents[edges]]
+        values = _decay_consts()[parents[edges]] * yields[edges]
+        order = np.argsort(rows, kind='stable')
+        self.entry_rows = rows[order]
+        self.entry_cols = cols[order]
+        self.entry_values = values[order]
+
+    def solve(self, dt, theta, b):
+        """Solve (A dt - theta I) x = b for a matrix b of local rows."""
+        x = np.empty(b.shape, dtype=complex)
+        diagonal = (-dt * self.lambdas - theta)[:, np.newaxis]
+
+        bounds = np.searchsorted(self.entry_rows, self.level_bounds)
+        for level in range(len(self.level_bounds) - 1):
+            start, end = self.level_bounds[level], self.level_bounds[level + 1]
+            rhs = b[start:end].astype(complex)
+
+            first, last = bounds[level], bounds[level + 1]
+            if last > first:
+                entry_rows = self.entry_rows[first:last]
+                products = ((dt * self.entry_values[first:last])[:, np.newaxis]
+                            * x[self.entry_cols[first:last]])
+                segments = np.flatnonzero(np.diff(entry_rows, prepend=-1))
+                rhs[entry_rows[segments] - start] -= np.add.reduceat(
+                    products, segments, axis=0)
+
+            x[start:end] = rhs / diagonal[start:end]
+        return x
+
+    def exp(self, dt, y):
+        """Return exp(A dt) y for a matrix y of local rows."""
+        for alpha, theta in zip(_cram_alpha, _cram_theta):
+            y = y + 2. * np.real(alpha * self.solve(dt, theta, y))
+        return _cram_alpha0 * y
+
+
+def decay(inventories, times):
+    """
+    Return the inventories after decaying for times in seconds.
+
+    inventories has shape (n,) or (m, n), with n = len(nuclide_table), e.g.
+    from inventory().  times is a scalar, or a 1-D array of nondecreasing
+    times for which the result has an extra leading axis.
+
+    Only the nuclides reachable by decay from the initial inventories are
+    computed, so decaying a few nuclides is cheap.  Inventories that hold
+    similar nuclides are best passed next to each other.
+    """
+    inventories = np.asarray(inventories, dtype=float)
+    scalar_time = np.ndim(times) == 0
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    if (times < 0.).any() or (np.diff(times) < 0.).any():
+        raise ValueError("times must be nonnegative and nondecreasing")
+
+    # (n, m) with one column per inventory
+    y = np.atleast_2d(inventories).T
+    results = np.zeros((len(times),) + y.shape[::-1])
+
+    # Decay the inventories in blocks, which keeps the working arrays of the
+    #  solves in cache, and limits each block to the nuclides it can reach
+    for first in range(0, y.shape[1], _block_size):
+        block = slice(first, first + _block_size)
+        initial = (y[:, block] != 0.).any(axis=1)
+        if not initial.any():
+            continue
+        system = _TriangularSystem(_reachable(initial))
+
+        local = y[system.rows, block]
+        previous = 0.
+        for i, t in enumerate(times):
+            if t > previous:
+                local = system.exp(t - previous, local)
+                previous = t
+            results[i, block][:, system.rows] = local.T
+
+    results = results.reshape((len(times),) + inventories.shape)
+    return results[0] if scalar_time else results
+
+
+def _reachable(initial):
+    """Return a mask of the rows reachable by decay from the `initial` rows."""
+    parents, products, yields, modes = decay_transitions()
+    reachable = initial.copy()
+    for _ in range(decay_levels().max()):
+        reachable[products[reachable[parents]]] = True
+    return reachable
+
+
+# Energy of 1 MeV in J
+joules_per_mev = 1.602176634e-13
+
+
+@functools.lru_cache(maxsize=None)
+def _mode_coefficients():
+    """
+    Return, for each row of nuclide_data.decay_table, the index of its mode
+    in mode_names(), the decays per second per nuclide by that mode, and
+    the energy released per second per nuclide in MeV.
+    """
+    decays = nuclide_data.decay_table
+    offsets = nuclide_data.decay_offsets
+
+    fractions = np.zeros(len(decays))
+    for parent in np.nonzero(np.diff(offsets))[0]:
+        start, end = offsets[parent], offsets[parent+1]
+        modes = list(decays['mode'][start:end])
+        by_mode = _branch_fractions(modes, decays['branch'][start:end])
+        fractions[start:end] = [by_mode[mode] for mode in modes]
+
+    rates = _decay_consts()[decays['parent']] * fractions
+    energies = rates * np.nan_to_num(decays['Q'])
+    names, mode_index = np.unique(decays['mode'], return_inverse=True)
+    return _read_only(names, mode_index.reshape(-1), rates, energies)
+
+
+@functools.lru_cache(maxsize=None)
+def _nuclide_coefficients():
+    """
+    Return the decays per second and the MeV per second released, per
+    nuclide, for each row of nuclide_table.  States without a half-life
+    decay at prompt_decay_const, as in decay().
+    """
+    names, mode_index, rates, energies = _mode_coefficients()
+    parents = nuclide_data.decay_table['parent']
+    n = len(nuclide_data.nuclide_table)
+
+    return _read_only(_decay_consts(), np.bincount(parents, energies, minlength=n))
+
+
+def mode_names():
+    """Return the names of the decay modes, the last axis of *_by_mode()."""
+    return _mode_coefficients()[0]
+
+
+def _rows(amounts, nuc_ids):
+    """
+    Return amounts as an array, and the rows of nuclide_table of its last
+    axis: nuc_ids, or all of nuclide_table if None.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    if nuc_ids is None:
+        rows = np.arange(len(nuclide_data.nuclide_table))
+    else:
+        rows = nuclide_data.table_index(*nuclide_data.nuclide_arrays(nuc_ids))
+        if (rows < 0).any():
+            missing = np.array(nuc_ids, dtype=object)[rows < 0]
+            raise KeyError("no decay data for {}".format(list(missing)))
+    if amounts.shape[-1:] != rows.shape:
+        raise ValueError("the last axis of amounts has length {}, not {}".format(
+            amounts.shape[-1:], len(rows)))
+    return amounts, rows
+
+
+def activity(amounts, nuc_ids=None):
+    """
+    Return the activity in Bq of each nuclide of amounts, in atoms.
+
+    amounts has any shape, e.g., (times, inventories, n) from decay(), with
+    the last axis over the rows of nuclide_table, or over nuc_ids if given
+    (anything accepted by nuclide_data.nuclide_arrays).
+    """
+    amounts, rows = _rows(amounts, nuc_ids)
+    return amounts * _nuclide_coefficients()[0][rows]
+
+
+def decay_heat(amounts, nuc_ids=None):
+    """
+    Return the decay heat in W of each nuclide of amounts, in atoms, like
+    activity().  This is the total decay energy Q of each mode, including
+    what neutrinos carry away; modes without a Q-value give none.
+    """
+    amounts, rows = _rows(amounts, nuc_ids)
+    return amounts * (joules_per_mev * _nuclide_coefficients()[1][rows])
+
+
+@functools.lru_cache(maxsize=None)
+def _mode_matrices():
+    """
+    Return the decays per second and the MeV per second released, per
+    nuclide and by each decay mode, as (n, len(mode_names())) matrices.
+    """
+    names, mode_index, rates, energies = _mode_coefficients()
+    parents = nuclide_data.decay_table['parent']
+    shape = (len(nuclide_data.nuclide_table), len(names))
+
+    matrices = np.zeros((2,) + shape)
+    for matrix, coefficients in zip(matrices, [rates, energies]):
+        np.add.at(matrix, (parents, mode_index), coefficients)
+    return _read_only(*matrices)
+
+
+def _by_mode(amounts, nuc_ids, matrix):
+    """Sum amounts times per-decay-mode coefficients by mode."""
+    amounts, rows = _rows(amounts, nuc_ids)
+    if nuc_ids is not None:
+        matrix = matrix[rows]
+    # One 2-D product, which uses BLAS, for any shape of amounts
+    results = np.dot(amounts.reshape(-1, len(rows)), matrix)
+    return results.reshape(amounts.shape[:-1] + matrix.shape[1:])
+
+
+def activity_by_mode(amounts, nuc_ids=None):
+    """
+    Return the activity in Bq of amounts, in atoms, by decay mode: the last
+    axis of amounts (as for activity()) is replaced by one over
+    mode_names().
+    """
+    return _by_mode(amounts, nuc_ids, _mode_matrices()[0])
+
+
+def decay_heat_by_mode(amounts, nuc_ids=None):
+    """
+    Return the decay heat in W of amounts, in atoms, by decay mode, like
+    activity_by_mode().
+    """
+    return joules_per_mev * _by_mode(amounts, nuc_ids, _mode_matrices()[1])
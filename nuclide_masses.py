@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Reaction Q-values, separation energies and binding energies from the
+Nuclear Wallet Card mass excesses in nuclide_data.
+
+Each function takes nuclide ids (anything accepted by
+nuclide_data.nuclide_arrays, e.g., 'U-235', 92235, 'Am242m'), or None for
+every row of nuclide_data.nuclide_table, and returns an array of energies
+in MeV, NaN where a product is not on the chart.  Targets may be excited
+states; products are taken in their ground state.  Values are nominal,
+without uncertainties.
+
+Mass excesses are atomic, so protons are counted as hydrogen atoms and the
+electrons balance in any reaction that conserves charge.
+
+"""
+
+import functools
+import re
+
+import numpy as np
+
+import nuclide_data
+
+# Light particles of reaction strings -> (Z, A), with None for a photon
+light_particles = {'n': (0, 1), 'p': (1, 1), 'd': (1, 2), 't': (1, 3),
+                   'h': (2, 3), 'a': (2, 4), 'g': None}
+
+_reaction_re = re.compile(r'^\(?\s*([a-z]+)\s*,\s*((?:\d*[a-z])+)\s*\)?$')
+_particles_re = re.compile(r'(\d*)([a-z])')
+
+
+@functools.lru_cache(maxsize=None)
+def ground_state_mass_excesses():
+    """
+    Return the ground-state mass excess in MeV of every (Z, A), as a
+    read-only grid indexed [Z, A], NaN off the chart.
+    """
+    table = nuclide_data.nuclide_table
+
+    # Rows are sorted by (Z, A, E), so the first row of each (Z, A) is the
+    #  ground state
+    _, first = np.unique(table['Z'] * 1000 + table['A'], return_index=True)
+    grid = np.full((table['Z'].max() + 1, table['A'].max() + 1), np.nan)
+    grid[table['Z'][first], table['A'][first]] = table['mass_excess'][first]
+    grid.setflags(write=False)
+    return grid
+
+
+def _ground_state_mass_excess(Z, A):
+    """Ground-state mass excesses of arrays Z, A, NaN off the chart."""
+    grid = ground_state_mass_excesses()
+    Z, A = np.broadcast_arrays(Z, A)
+    on_grid = (Z >= 0) & (Z < grid.shape[0]) & (A >= 0) & (A < grid.shape[1])
+    excess = np.full(Z.shape, np.nan)
+    excess[on_grid] = grid[Z[on_grid], A[on_grid]]
+    return excess
+
+
+def _particles(string):
+    """The (Z, A) of the light particles in a string like '2n' or 'np'."""
+    if _particles_re.sub('', string):
+        raise ValueError("unrecognized particles {!r}".format(string))
+    found = []
+    for count, symbol in _particles_re.findall(string):
+        if not (symbol in light_particles):
+            raise ValueError("unrecognized particle {!r}".format(symbol))
+        if light_particles[symbol] is not None:
+            found.extend([light_particles[symbol]] * int(count or 1))
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def _reaction(reaction):
+    """
+    Return (change of Z, change of A, mass excess of the light particles
+    in minus out) of a reaction string like '(n,2n)'.
+    """
+    match = _reaction_re.match(reaction.strip().lower())
+    if match is None:
+        raise ValueError("unrecognized reaction {!r}".format(reaction))
+    incoming, outgoing = map(_particles, match.groups())
+
+    change_Z = sum(Z for Z, A in incoming) - sum(Z for Z, A in outgoing)
+    change_A = sum(A for Z, A in incoming) - sum(A for Z, A in outgoing)
+    excess = (sum(_ground_state_mass_excess(Z, A) for Z, A in incoming)
+              - sum(_ground_state_mass_excess(Z, A) for Z, A in outgoing))
+    return change_Z, change_A, float(excess)
+
+
+def _targets(nuc_ids):
+    """Return Z, A and mass excess arrays of nuc_ids, or of every row."""
+    table = nuclide_data.nuclide_table
+    if nuc_ids is None:
+        rows = slice(None)
+    else:
+        rows = nuclide_data.table_index(*nuclide_data.nuclide_arrays(nuc_ids))
+        if (rows < 0).any():
+            missing = np.array(nuc_ids, dtype=object)[rows < 0]
+            raise KeyError("no mass data for {}".format(list(missing)))
+    return table['Z'][rows], table['A'][rows], table['mass_excess'][rows]
+
+
+def q_value(reaction, nuc_ids=None):
+    """
+    Return the Q-value in MeV of a reaction on each target, e.g.,
+    q_value('(n,2n)', ['U-238', 'Pu-239']).  The reaction is written
+    '(in,out)' with the particles n, p, d, t, h (He-3), a (alpha) and g
+    (photon), and counts, e.g., '(n,g)', '(n,np)', '(p,2n)' or '(g,a)'.
+    """
+    change_Z, change_A, excess = _reaction(reaction)
+    Z, A, target = _targets(nuc_ids)
+    return target + excess - _ground_state_mass_excess(Z + change_Z, A + change_A)
+
+
+def separation_energy(particles, nuc_ids=None):
+    """
+    Return the energy in MeV needed to remove `particles` from each
+    nuclide, e.g., separation_energy('n') or separation_energy('2n').
+    """
+    return -q_value('(g,{})'.format(particles), nuc_ids)
+
+
+def binding_energy(nuc_ids=None):
+    """Return the total binding energy in MeV of each nuclide."""
+    Z, A, excess = _targets(nuc_ids)
+    return (Z * _ground_state_mass_excess(*light_particles['p'])
+            + (A - Z) * _ground_state_mass_excess(*light_particles['n']) - excess)
+
+
+def binding_energy_per_nucleon(nuc_ids=None):
+    """Return the binding energy per nucleon in MeV of each nuclide."""
+    return binding_energy(nuc_ids) / _targets(nuc_ids)[1]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+Isotopic compositions and number densities of materials, from the natural
+abundances and weights in nuclide_data.
+
+A composition is a dictionary {component: fraction}, with components
+elements ('Fe', 'fe', 26000), expanded to their natural isotopes, or
+nuclides (anything accepted by nuclide_data.nuclide_arrays, e.g.,
+'U-235', 92235, 'Am242m').  Fractions are atom fractions, or weight
+fractions with fractions='weight', and are normalized to sum to 1.
+
+Results are arrays over the rows of nuclide_data.nuclide_table, one row per
+isomer, with shape (len(compositions), n) for a list of compositions.  All
+compositions are computed together: each distinct component is expanded
+once, and the expansion is cached for later calls.
+
+"""
+
+import functools
+
+import numpy as np
+
+import nuclide_data
+
+# Avogadro constant, 1/mol
+avogadro = 6.02214076e23
+
+# 1 barn in cm^2
+barn = 1e-24
+
+
+@functools.lru_cache(maxsize=None)
+def natural_abundances(Z):
+    """
+    Return the natural isotopes of element Z as read-only arrays
+    (rows of nuclide_table, atom fractions), with the fractions normalized
+    to sum to 1.  Raises ValueError for elements with no stable isotopes.
+    """
+    table = nuclide_data.nuclide_table
+    rows = np.flatnonzero((table['Z'] == Z) & (table['abundance'] > 0.))
+    if len(rows) == 0:
+        raise ValueError("element {} has no natural abundances".format(Z))
+
+    fractions = table['abundance'][rows] / table['abundance'][rows].sum()
+    rows.setflags(write=False)
+    fractions.setflags(write=False)
+    return rows, fractions
+
+
+@functools.lru_cache(maxsize=None)
+def isotope_weights():
+    """
+    Return the atomic weight of each row of nuclide_table, from the mass
+    excess where NIST has no weight.
+    """
+    table = nuclide_data.nuclide_table
+    weights = np.where(np.isnan(table['weight']),
+                       table['A'] + table['mass_excess'] * nuclide_data.mev_per_c_2_amu,
+                       table['weight'])
+    weights.setflags(write=False)
+    return weights
+
+
+@functools.lru_cache(maxsize=None)
+def _component(component):
+    """
+    Return (rows of nuclide_table, atom fractions, molar mass in g/mol) for
+    an element or nuclide identifier.
+    """
+    if isinstance(component, str) and component.strip().title() in nuclide_data.sym2z:
+        Z, A, E = nuclide_data.sym2z[component.strip().title()], 0, 0.
+    else:
+        Z, A, E = [x[0] for x in nuclide_data.nuclide_arrays([component])]
+
+    if A == 0:
+        rows, fractions = natural_abundances(Z)
+    else:
+        rows = nuclide_data.table_index(Z, A, E).reshape(1)
+        if rows[0] < 0:
+            raise KeyError("no data for {!r}".format(component))
+        fractions = np.ones(1)
+
+    return rows, fractions, np.dot(fractions, isotope_weights()[rows])
+
+
+def _component_matrix(compositions, fractions):
+    """
+    Return the atom fractions of each component in each composition, as a
+    (len(compositions), k) array, and the k distinct components.
+    """
+    names = [name for composition in compositions for name in composition]
+    amounts = [a for composition in compositions for a in composition.values()]
+    counts = [len(composition) for composition in compositions]
+
+    # distinct component -> column
+    columns = {}
+    j = [columns.setdefault(name, len(columns)) for name in names]
+    i = np.repeat(np.arange(len(compositions)), counts)
+
+    matrix = np.zeros((len(compositions), len(columns)))
+    np.add.at(matrix, (i, np.array(j, dtype=np.intp)), amounts)
+
+    components = [_component(name) for name in columns]
+
+    # Convert weight fractions to moles
+    weight = np.broadcast_to(np.asarray(fractions) == 'weight', len(compositions))
+    if weight.any():
+        molar_masses = np.array([c[2] for c in components])
+        matrix[weight] /= molar_masses
+
+    totals = matrix.sum(axis=1, keepdims=True)
+    return matrix / np.where(totals == 0., 1., totals), components
+
+
+def _compact_atom_fractions(compositions, fractions):
+    """
+    Return (rows, atoms): the rows of nuclide_table present in any of the
+    compositions, and the atom fractions of these rows in each composition.
+    """
+    matrix, components = _component_matrix(compositions, fractions)
+
+    rows = np.unique(np.concatenate([c[0] for c in components] or [[]])
+                     ).astype(np.intp)
+    isotopes = np.zeros((len(components), len(rows)))
+    for j, (component_rows, component_fractions, _) in enumerate(components):
+        isotopes[j, np.searchsorted(rows, component_rows)] = component_fractions
+
+    return rows, matrix.dot(isotopes)
+
+
+def _expand(rows, compact):
+    """Scatter compact columns to arrays over all rows of nuclide_table."""
+    full = np.zeros((len(compact), len(nuclide_data.nuclide_table)))
+    full[:, rows] = compact
+    return full
+
+
+def atom_fractions(compositions, fractions='atom'):
+    """
+    Return the isotopic atom fractions of a composition, or of a list of
+    compositions.  fractions is 'atom' or 'weight', or a list of these, one
+    per composition.
+    """
+    if isinstance(compositions, dict):
+        return atom_fractions([compositions], fractions)[0]
+
+    return _expand(*_compact_atom_fractions(compositions, fractions))
+
+
+def molar_masses(compositions, fractions='atom'):
+    """
+    Return the mean atomic weight, in g/mol, of a composition, or an array
+    for a list of compositions.
+    """
+    if isinstance(compositions, dict):
+        return molar_masses([compositions], fractions)[0]
+
+    rows, atoms = _compact_atom_fractions(compositions, fractions)
+    return atoms.dot(isotope_weights()[rows])
+
+
+def mass_fractions(compositions, fractions='atom'):
+    """
+    Return the isotopic mass fractions of a composition, or of a list of
+    compositions.
+    """
+    if isinstance(compositions, dict):
+        return mass_fractions([compositions], fractions)[0]
+
+    rows, atoms = _compact_atom_fractions(compositions, fractions)
+    masses = atoms * isotope_weights()[rows]
+    totals = masses.sum(axis=1, keepdims=True)
+    return _expand(rows, masses / np.where(totals == 0., 1., totals))
+
+
+def number_densities(compositions, densities, fractions='atom'):
+    """
+    Return the isotopic number densities, in atoms/(barn cm), of a
+    composition, or of a list of compositions.  densities are in g/cm^3,
+    a scalar or one per composition.
+    """
+    if isinstance(compositions, dict):
+        return number_densities([compositions], [densities], fractions)[0]
+
+    rows, atoms = _compact_atom_fractions(compositions, fractions)
+    molar_mass = atoms.dot(isotope_weights()[rows])
+    densities = np.broadcast_to(np.asarray(densities, dtype=float), len(atoms))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scale = np.where(molar_mass > 0.,
+                         densities * avogadro * barn / molar_mass, 0.)
+    return _expand(rows, atoms * scale[:, np.newaxis])
@@ -4,11 +4,39 @@ Tests for nuclide_data
 
 """
 
+import gzip
+import os
+import os.path
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
 import numpy as np
 import uncertainties as unc
 import unittest
 import nuclide_data
 
+# Keep the tests out of the user's cache, as run_python does
+nuclide_data.cache_dir = ''
+
+basepath = os.path.dirname(os.path.abspath(__file__))
+
+def run_python(code, cache_dir='', nominal_only=False, store_file=''):
+    """
+    Run `code` in a fresh interpreter and return its standard output.
+
+    The nuclide data cache is disabled unless a `cache_dir` is given.
+    """
+    env = dict(os.environ, NUCLIDE_DATA_CACHE_DIR=cache_dir,
+               NUCLIDE_DATA_NOMINAL_ONLY='1' if nominal_only else '',
+               NUCLIDE_DATA_STORE=store_file)
+    return subprocess.check_output([sys.executable, '-c', code],
+                                   cwd=basepath, env=env,
+                                   stderr=subprocess.DEVNULL,
+                                   universal_newlines=True)
+
 class TestNuclideData(unittest.TestCase):
 
     def test_isotopes(self):
@@ -38,6 +66,36 @@ class TestNuclideData(unittest.TestCase):
             isomers = nuclide_data.isomers(*n)
             assert ref_isomers == isomers
 
+    def test_isomer_lookup(self):
+        """Are isomers matched by nearest energy, within a tolerance?"""
+
+        assert nuclide_data.isomer_levels[(7, 14)] == (0., 8.49, 8.964, 9.129)
+        # isomers() hands out a copy
+        nuclide_data.isomers(7, 14).append(10.)
+        assert nuclide_data.isomers(7, 14) == [0., 8.49, 8.964, 9.129]
+
+        for E, state in [(0., 0), (8.49, 1), (8.4900000001, 1), (8.9639999, 2),
+                         (9.129, 3)]:
+            assert nuclide_data.isomer_index(7, 14, E) == state
+            assert nuclide_data.isomer_energy(7, 14, state) == (
+                nuclide_data.isomers(7, 14)[state])
+        self.assertRaises(KeyError, nuclide_data.isomer_index, 7, 14, 8.5)
+        assert nuclide_data.isomer_index(7, 14, 8.5, tolerance=0.1) == 1
+        self.assertRaises(KeyError, nuclide_data.isomer_energy, 7, 14, 4)
+        self.assertRaises(KeyError, nuclide_data.isomer_index, 7, 300, 0.)
+
+        for E, nearest in [(-1., 0.), (4.2, 0.), (4.3, 8.49), (8.8, 8.964),
+                           (20., 9.129)]:
+            assert nuclide_data.nearest_isomer(7, 14, E) == nearest
+
+        E = 0.0486 * (1 + 1e-12)
+        self.assertRaises(KeyError, nuclide_data.nuc, 95, 242, E)
+        assert nuclide_data.nuc(95, 242, E, tolerance=1e-6) is (
+            nuclide_data.nuc(95, 242, 0.0486))
+        assert nuclide_data.return_nominal_value(
+            95, 242, E, 'weight', tolerance=1e-6) == nuclide_data.weight(95, 242)
+        self.assertRaises(KeyError, nuclide_data.nuc, 95, 242, 0.05, 1e-6)
+
     def ufloat_equiv(self, a, b):
         try:
             return ( np.allclose([a.nominal_value], [b.nominal_value])
@@ -68,6 +126,36 @@ class TestNuclideData(unittest.TestCase):
             assert d['stable'] == stable[i]
 
 
+    def test_read_only(self):
+        """Are the dictionaries from nuc() shared and read-only?"""
+
+        d = nuclide_data.nuc(92, 235)
+        assert d is nuclide_data.nuc(92, 235)
+        assert isinstance(d['decay modes'], nuclide_data.ReadOnlyDict)
+
+        self.assertRaises(TypeError, d.__setitem__, 'weight', 235.)
+        self.assertRaises(TypeError, d.pop, 'weight')
+        self.assertRaises(TypeError, d.update, weight=235.)
+        self.assertRaises(TypeError, d['decay modes']['A'].__setitem__,
+                          'branch fraction', 0.5)
+
+        # A copy can be modified
+        copy = d.copy()
+        copy['weight'] = 235.
+        assert d['weight'] != 235.
+
+        # Down to the decay modes
+        copy['decay modes']['A']['branch fraction'] = 0.5
+        del copy['decay modes']['SF']
+        assert d['decay modes']['A']['branch fraction'] != 0.5
+        assert 'SF' in d['decay modes'] and copy == copy.copy()
+
+        # And read-only dictionaries survive pickling, e.g., in the cache
+        d = pickle.loads(pickle.dumps(d))
+        assert isinstance(d['decay modes'], nuclide_data.ReadOnlyDict)
+        self.assertRaises(TypeError, d.clear)
+
+
     def test_weight(self):
         """
         Does weight() function work as expected?
@@ -83,6 +171,27 @@ class TestNuclideData(unittest.TestCase):
             assert weights[i] == nuclide_data.weight(
                                   "{0}-{1}".format(symbols[i], nuclides[i][1]))
 
+    def test_nominal_values(self):
+        """Do the precomputed nominal values match the nuc() dictionaries?"""
+
+        for Z, A, E in [(92, 235, 0.), (95, 242, 0.0486), (1, 1, 0.), (27, 60, 0.)]:
+            d = nuclide_data.nuc(Z, A, E)
+            for attribute in ['weight', 'half-life', 'lambda', 'stable', 'Jpi']:
+                ref = getattr(d[attribute], 'nominal_value', d[attribute])
+                symbol = nuclide_data.z2sym[Z]
+                for args in [(Z, A, E), (np.int64(Z), A, E), (symbol, A, E),
+                             ('{}-{}'.format(symbol, A), None, E)]:
+                    value = nuclide_data.return_nominal_value(*(args + (attribute,)))
+                    assert value == ref, (args, attribute)
+
+        assert nuclide_data.weight(92) == nuclide_data.weight('U') == (
+            nuclide_data.atomic_weights[92].nominal_value)
+        self.assertRaises(KeyError, nuclide_data.weight, 92, 300)
+        self.assertRaises(KeyError, nuclide_data.weight, 92, 235, 0.5)
+        self.assertRaises(KeyError, nuclide_data.weight, 'Xx', 235)
+        self.assertRaises(KeyError, nuclide_data.return_nominal_value,
+                          92, 235, 0., 'no such attribute')
+
 
     def test_zaids(self):
         """Does zaid conversion work correctly?"""
@@ -93,6 +202,42 @@ class TestNuclideData(unittest.TestCase):
             za = nuclide_data.zaid2za(zaid)
             assert ref_za == za
 
+    def test_zaid_arrays(self):
+        """Do the vectorized ZAID conversions round-trip in each convention?"""
+
+        Z = np.array([92, 3, 54, 8, 95, 1])
+        A = np.array([235, 6, 135, 16, 242, 1])
+        m = np.array([0, 0, 0, 0, 1, 0])
+        zaids = {'zaid': [92235, 3006, 54135, 8016, 95242, 1001],
+                 'mcnp': [92235, 3006, 54135, 8016, 95642, 1001],
+                 'zzaaas': [922350, 30060, 541350, 80160, 952421, 10010]}
+        for convention in nuclide_data.zaid_conventions:
+            ref_m = m if convention != 'zaid' else 0 * m
+            converted = nuclide_data.zam2zaids(Z, A, ref_m, convention)
+            assert converted.tolist() == zaids[convention], convention
+            for Z2, ref in zip(nuclide_data.zaids2zam(converted, convention),
+                               (Z, A, ref_m)):
+                assert Z2.tolist() == ref.tolist(), convention
+
+        # Library suffixes, as floats, strings and bytes
+        names = nuclide_data.zam2zaids(Z, A, m, suffix='80c')
+        assert names[4] == '95642.80c'
+        for zaids_in in [names, names.astype(bytes), [92235.80, 3006.80, 54135.,
+                                                      8016.8, 95642.80, 1001.]]:
+            assert np.array_equal(np.stack(nuclide_data.zaids2zam(zaids_in)),
+                                  np.stack((Z, A, m)))
+        assert nuclide_data.zaids2zam(95742)[2] == 1
+        assert nuclide_data.zam2zaids(95, 242, 2) == 95642
+
+        E = [0., 0., 0., 0., 0.0486, 0.]
+        assert nuclide_data.isomer_states(Z, A, E).tolist() == m.tolist()
+        assert nuclide_data.isomer_states(
+            95, 242, [2.2, float('inf'), 1.]).tolist() == [2, 1, -1]
+
+        self.assertRaises(ValueError, nuclide_data.zaids2zam, zaids['mcnp'],
+                          'endf')
+        self.assertRaises(ValueError, nuclide_data.zam2zaids, Z, A, m, 'endf')
+
     def test_Nuclide_class_init(self):
         """Does Nuclide class correctly identify nuclide for a variety of inputs?"""
 
@@ -267,6 +412,682 @@ class TestNuclideData(unittest.TestCase):
         for nuc_id in nuc_ids:
             assert nuclide_data.Nuclide(nuc_id).mat == nuc_ids[nuc_id]
 
+    def test_endf_libraries(self):
+        """Are MATs looked up both ways in other registered libraries?"""
+
+        assert nuclide_data.mat_nuclides()[9547] == (95, 242, True)
+        assert nuclide_data.library_mats()[(92, 235, False)] == 9228
+
+        # The default library is mats itself, which the views do not expose
+        with self.assertRaises(TypeError):
+            nuclide_data.library_mats()[(92, 235, False)] = 0
+        with self.assertRaises(TypeError):
+            del nuclide_data.mat_nuclides()[9228]
+        assert nuclide_data.mats[(92, 235, False)] == 9228
+
+        # A library with two of the default library's lines, one MAT changed
+        lines = [line for line in open(nuclide_data.mat_file)
+                 if not line.startswith('#')]
+        list_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, list_dir)
+        list_file = os.path.join(list_dir, 'n-test.endf.list')
+        with open(list_file, 'w') as f:
+            f.write(lines[0])
+            f.write(lines[-1][:72] + '9999\n')
+
+        nuclide_data.register_library('test', list_file)
+        self.addCleanup(nuclide_data.endf_libraries.pop, 'test')
+        self.addCleanup(nuclide_data._library_indexes.pop, 'test', None)
+        assert not ('test' in nuclide_data._library_indexes)
+
+        Z, A, metastable = nuclide_data.mat_nuclides()[int(lines[-1][72:76])]
+        assert nuclide_data.mat_nuclides('test') == {
+            125: (1, 1, False), 9999: (Z, A, metastable)}
+        assert nuclide_data.Nuclide('H-1').library_mat('test') == 125
+        assert nuclide_data.Nuclide('H-1').library_mat() == 125
+        self.assertRaises(KeyError, nuclide_data.Nuclide('U-235').library_mat,
+                          'test')
+        self.assertRaises(KeyError, nuclide_data.library_mats, 'missing')
+
+    def test_wallet_columns(self):
+        """Does the column parser agree with parse_one_wallet_line?"""
+
+        columns = nuclide_data.read_wallet_columns()
+        lines = nuclide_data.wallet_lines
+        assert len(columns['Z']) == len(lines)
+
+        for i in range(0, len(lines), 7):
+            d = nuclide_data.parse_one_wallet_line(lines[i])
+            for k, v in d.items():
+                value = columns[k][i]
+                if isinstance(value, bytes):
+                    value = value.decode('ascii')
+                    if k == 'decay mode':
+                        value = value or None
+                elif v is None:
+                    assert np.isnan(value), (i, k)
+                    continue
+                assert unc.nominal_value(v) == value, (i, k, v, value)
+            if d['abundance']:
+                assert (unc.std_dev(d['abundance'])
+                        == columns['abundance sigma'][i])
+
+        # Lines with DOS line endings
+        dos = [line.encode('ascii') + b'\r\n' for line in lines[:50]]
+        dos_columns = nuclide_data.parse_wallet_columns(dos)
+        for k in columns:
+            assert np.array_equal(dos_columns[k], columns[k][:50],
+                                  equal_nan=columns[k].dtype.kind == 'f')
+
+        # A branch fraction numpy cannot parse, as in other editions
+        start, end = nuclide_data.wallet_layout['branch fraction']
+        odd = [line.encode('ascii') for line in lines[:50]]
+        i = next(i for i in range(50) if odd[i][start:end].strip())
+        odd[i] = odd[i][:start] + b'   ?  ' + odd[i][end:]
+        branches = nuclide_data.parse_wallet_columns(odd)['branch fraction']
+        assert np.isnan(branches[i])
+        assert nuclide_data.parse_one_wallet_line(odd[i].decode('ascii'))[
+            'branch fraction'] is None
+        others = np.arange(50) != i
+        assert np.array_equal(branches[others],
+                              columns['branch fraction'][:50][others],
+                              equal_nan=True)
+
+        # Empty and blank files give empty columns of the same types
+        wallet_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, wallet_dir)
+        for content in [b'', b'\n  \n']:
+            filename = os.path.join(wallet_dir, 'empty.txt.gz')
+            with gzip.open(filename, 'wb') as f:
+                f.write(content)
+            empty = nuclide_data.read_wallet_columns(filename)
+            assert sorted(empty) == sorted(columns)
+            for k in columns:
+                assert len(empty[k]) == 0
+                assert empty[k].dtype.kind == columns[k].dtype.kind
+
+    def test_nuclide_table(self):
+        """Does the columnar table agree with the nuclides dictionary?"""
+
+        table = nuclide_data.nuclide_table
+        assert len(table) == sum(map(len, nuclide_data.nuclides.values()))
+
+        for Z, A, E in [ (1,1,0.), (19,49,0.), (52,115,0.02), (95,242,0.0486) ]:
+            row = table[nuclide_data.table_index(Z, A, E)]
+            d = nuclide_data.nuc(Z, A, E)
+
+            assert (row['Z'], row['A'], row['E']) == (Z, A, E)
+            assert row['half_life'] == d['half-life']
+            assert row['weight'] == d['weight'].nominal_value
+            assert row['weight_sigma'] == d['weight'].std_dev
+            assert row['mass_excess'] == d['mass excess'].nominal_value
+            assert row['stable'] == d['stable']
+
+            i = nuclide_data.table_index(Z, A, E)
+            decays = nuclide_data.decay_table[
+                nuclide_data.decay_offsets[i]:nuclide_data.decay_offsets[i+1]]
+            assert sorted(decays['mode']) == sorted(
+                m for m in d['decay modes'] if m is not None)
+            assert (decays['parent'] == i).all()
+
+    def test_table_index(self):
+        """Does table_index find rows for arrays of nuclides?"""
+
+        rows = nuclide_data.table_index([92, 95, 95, 92], [235, 242, 242, 300],
+                                        [0., np.inf, 0.04860001, 0.])
+        table = nuclide_data.nuclide_table
+
+        assert list(table[rows[:3]]['E']) == [0., 0.0486, 0.0486]
+        assert rows[3] == -1
+        assert nuclide_data.table_index(1, 1, np.inf) == -1
+        assert nuclide_data.table_index(1, 1, 0.001) == -1
+
+    def test_nuclide_table_filtering(self):
+        """Can the columnar table be filtered with array expressions?"""
+
+        table = nuclide_data.nuclide_table
+
+        natural = table[table['abundance'] > 0.]
+        assert set(zip(natural['Z'][natural['Z'] == 8],
+                       natural['A'][natural['Z'] == 8])) == {(8,16), (8,17), (8,18)}
+
+        day = 86400.
+        short = table[(table['half_life'] > 1.) & (table['half_life'] < day)]
+        assert len(short) == sum(
+            1. < nuclide_data.nuc(Z, A, E)['half-life'] < day
+            for (Z, A) in nuclide_data.nuclides
+            for E in nuclide_data.nuclides[(Z,A)])
+
+    def test_query(self):
+        """Do queries find the same nuclides as a scan of the dictionary?"""
+
+        table = nuclide_data.nuclide_table
+        nuclides = nuclide_data.nuclides
+
+        def found(rows):
+            return set(zip(table['Z'][rows], table['A'][rows], table['E'][rows]))
+
+        def scan(condition):
+            return set( (Z, A, E) for (Z, A) in nuclides
+                        for E, isomer in nuclides[(Z,A)].items()
+                        if condition(Z, A, E, isomer) )
+
+        assert found(nuclide_data.query(half_life=(1., 86400.))) == scan(
+            lambda Z, A, E, n: 1. <= n['half-life'] <= 86400.)
+        assert found(nuclide_data.query(E=(1., None))) == scan(
+            lambda Z, A, E, n: E >= 1.)
+        assert found(nuclide_data.query(decay_mode='SF', stable=False)) == scan(
+            lambda Z, A, E, n: 'SF' in n['decay modes'])
+        assert found(nuclide_data.query(
+            Z=(50, 60), A=(100, 140), decay_mode=['B-', 'EC'], isomeric=False)) == scan(
+            lambda Z, A, E, n: 50 <= Z <= 60 and 100 <= A <= 140 and not n['isomeric']
+                and ('B-' in n['decay modes'] or 'EC' in n['decay modes']))
+        assert found(nuclide_data.query(Z=92, stable=True)) == scan(
+            lambda Z, A, E, n: Z == 92 and n['stable'])
+
+        rows = nuclide_data.query(mass_excess=(None, -90.))
+        assert (np.diff(rows) > 0).all()
+        assert (table['mass_excess'][rows] <= -90.).all()
+
+        assert len(nuclide_data.query(decay_mode='XX')) == 0
+        assert len(nuclide_data.query()) == len(table)
+        self.assertRaises(TypeError, nuclide_data.query, spin=(0, 1))
+
+    def test_stats(self):
+        """Are load phases, lookups and warnings recorded when enabled?"""
+
+        output = run_python("import nuclide_data as nd\n"
+                            "nd.enable_stats()\n"
+                            "nd.weight('U-235')\n"
+                            "print(' '.join(nd.stats()['load']))\n")
+        phases = output.split()
+        for phase in ['nist:', 'chunking', 'parsing', 'wallet:',
+                      'decompression', 'nuclides']:
+            assert phase in phases
+
+        nuc, init = nuclide_data.nuc, nuclide_data.Nuclide.__init__
+        nuclide_data.enable_stats()
+        self.addCleanup(nuclide_data.enable_stats, False)
+        nuclide_data.reset_stats()
+
+        nuclide_data.nuc(92, 235)
+        self.assertRaises(KeyError, nuclide_data.nuc, 92, 300)
+        nuclide_data.weight('U-235')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            nuclide_data.Nuclide('Co60')
+
+        stats = nuclide_data.stats()
+        assert stats['enabled']
+        assert stats['calls']['nuc'] == dict(stats['calls']['nuc'],
+                                             count=2, failures=1)
+        assert stats['calls']['return_nominal_value']['count'] == 2
+        assert stats['calls']['Nuclide']['count'] == 1
+        assert stats['warnings'] == {'not on ENDF/B-VII.1 library': 1}
+
+        # Disabled, the original functions are back
+        nuclide_data.enable_stats(False)
+        assert nuclide_data.nuc is nuc
+        assert nuclide_data.Nuclide.__init__ is init
+        nuclide_data.nuc(92, 235)
+        assert nuclide_data.stats()['calls']['nuc']['count'] == 2
+
+    def test_tables(self):
+        """Do the exported tables round-trip in each format?"""
+
+        tables = nuclide_data.tables()
+        assert sorted(tables) == sorted(nuclide_data.table_names)
+        assert (tables['nuclides']['Jpi'][tables['nuclides']['Z'] == 92]
+                != '').any()
+        nist = tables['nist'][(tables['nist']['Z'] == 92)
+                              & (tables['nist']['A'] == 235)][0]
+        assert nist['mass'] == nuclide_data.weight(92, 235)
+        assert tables['mats'][tables['mats']['mat'] == 9547][0].tolist() == (
+            95, 242, True, 9547)
+
+        table_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, table_dir)
+        formats = [('npz', 'tables.npz'), ('csv', 'csv')]
+        try:
+            import pyarrow
+            formats.append(('parquet', 'parquet'))
+        except ImportError:
+            pass
+
+        for format, name in formats:
+            path = os.path.join(table_dir, name)
+            nuclide_data.write_tables(path, format)
+            read = nuclide_data.read_tables(path, format)
+            for table in tables:
+                assert read[table].dtype == tables[table].dtype, (format, table)
+                for field in tables[table].dtype.names:
+                    assert np.array_equal(
+                        read[table][field], tables[table][field],
+                        equal_nan=tables[table].dtype[field].kind == 'f'), (
+                        format, table, field)
+
+        self.assertRaises(ValueError, nuclide_data.write_tables,
+                          os.path.join(table_dir, 'x'), 'xlsx')
+
+    def test_parallel_loading(self):
+        """Do concurrent loaders give the same data as loading in turn?"""
+
+        code = ("import nuclide_data as nd\n"
+                "nd.load_all(workers={}, processes={})\n"
+                "print(sorted(nd._loaded_sources))\n"
+                "print(sorted(nd.nuc(95, 242, 0.0486).items()))\n"
+                "print(nd.weight('U'), nd.mats[(92, 235, False)])\n"
+                "print(len(nd.nuclide_table), nd.nuclide_table['weight'].sum())\n")
+        serial = run_python(code.format(1, False))
+        assert run_python(code.format(4, False)) == serial
+        assert run_python(code.format(4, True), nominal_only=True) == run_python(
+            code.format(1, False), nominal_only=True)
+
+        # Worker processes use the parent's data files, even when spawned
+        mat_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, mat_dir)
+        mat_file = os.path.join(mat_dir, 'short.endf.list')
+        with open(nuclide_data.mat_file) as full, open(mat_file, 'w') as short:
+            short.writelines(full.readlines()[:11])
+        code = ("import multiprocessing\n"
+                "multiprocessing.set_start_method('spawn')\n"
+                "import nuclide_data as nd\n"
+                "nd.mat_file = {!r}\n"
+                "nd.load_all(workers=4, processes=True)\n"
+                "print(len(nd.mats))\n").format(mat_file)
+        assert run_python(code) == run_python(
+            "import nuclide_data as nd\n"
+            "print(len(nd._parse_mat_list({!r})))\n".format(mat_file))
+
+    def test_store(self):
+        """Do the lookups give the same results from a memory-mapped store?"""
+
+        store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_dir)
+        store_file = os.path.join(store_dir, 'nuclides.store')
+        nuclide_data.write_store(store_file)
+
+        code = ("import nuclide_data as nd\n"
+                "rows = nd.nuclide_table[['Z', 'A', 'E']].tolist()\n"
+                "for Z, A, E in rows:\n"
+                "    print(sorted(nd.nuc(Z, A, E).items()))\n"
+                "    try:\n"
+                "        print(nd.weight(Z, A, E))\n"
+                "    except KeyError:\n"
+                "        print('KeyError')\n"
+                "for Z, A, E in [(92, 235, 0.), (95, 242, 0.0486), (1, 1, 0.),\n"
+                "                (73, 180, 0.0771), (27, 60, 0.)]:\n"
+                "    print(nd.isomers(Z, A))\n"
+                "    print(sorted(nd.nuc(Z, A, E + 1e-9, tolerance=1e-6).items()))\n"
+                "print(sorted(nd.isomer_levels.items()))\n"
+                "for args in [(95, 242, 0.04860001), (95, 242, 0.0486000001),\n"
+                "             (1, 1, 1e-9)]:\n"
+                "    for lookup in [nd.nuc, nd.weight]:\n"
+                "        try:\n"
+                "            print(lookup(*args))\n"
+                "        except KeyError:\n"
+                "            print('KeyError')\n"
+                "print(nd.weight('U-235'), nd.weight('U'), nd.weight(43, 99))\n"
+                "n = nd.Nuclide('Am242m')\n"
+                "print(n, n.E, n.weight, n.mat)\n"
+                "print(sorted(nd._loaded_sources))\n")
+        parsed = run_python(code).splitlines()
+        stored = run_python(code, store_file=store_file).splitlines()
+
+        assert stored[:-1] == parsed[:-1]
+        loaded = stored[-1]
+        assert "'table'" in loaded
+        assert "'nuclides'" not in loaded and "'nist'" not in loaded
+
+        # The data is already loaded in this process
+        self.assertRaises(ValueError, nuclide_data.use_store, store_file)
+
+    def test_batch_lookups(self):
+        """Do the batch functions agree with the scalar lookups?"""
+
+        ids = ['H-1', 'K49', '148Eu', 'cm-240', 'Am242m', 'Xx-300']
+        zaids = [1001, 19049, 63148, 96240, 95642, 54300]
+        Z = [1, 19, 63, 96, 95, 54]
+        A = [1, 49, 148, 240, 242, 300]
+        E = [0., 0., 0., 0., 0.0486, 0.]
+
+        ref_weights = [nuclide_data.weight(z, a, e)
+                       for z, a, e in zip(Z[:5], A[:5], E[:5])]
+        ref_half_lives = [nuclide_data.Nuclide((z, a, e)).half_life()
+                          for z, a, e in zip(Z[:5], A[:5], E[:5])]
+        ref_decay_consts = [nuclide_data.Nuclide((z, a, e)).decay_const()
+                            for z, a, e in zip(Z[:5], A[:5], E[:5])]
+
+        for args in [(zaids,), (np.array(zaids),), (Z, A, E)]:
+            w = nuclide_data.weights(*args)
+            assert list(w[:5]) == ref_weights
+            assert np.isnan(w[5])
+
+            assert list(nuclide_data.half_lives(*args)[:5]) == ref_half_lives
+            assert list(nuclide_data.decay_consts(*args)[:5]) == ref_decay_consts
+
+        # Unparseable identifiers (unknown element symbols, malformed
+        #  strings) fail the whole batch, rather than being missing data
+        for lookup in [nuclide_data.weights, nuclide_data.half_lives,
+                       nuclide_data.decay_consts]:
+            self.assertRaises(ValueError, lookup, ids)
+            self.assertRaises(ValueError, lookup, ['U-235', 'U235x'])
+        assert list(nuclide_data.weights(ids[:5])) == ref_weights
+
+        # Well-formed identifiers of nuclides not in the data give NaN
+        for lookup in [nuclide_data.weights, nuclide_data.half_lives,
+                       nuclide_data.decay_consts]:
+            assert np.isnan(lookup(['U-235', 'U-400'])[1:]).all()
+            assert np.isnan(lookup([92235, 92400, 54300])[1:]).all()
+
+        # Element weights from A = 0
+        assert list(nuclide_data.weights([92000, 6000])) == [
+            nuclide_data.weight('U'), nuclide_data.weight(6)]
+
+    def test_parse_nuclide_id(self):
+        """Does the identifier parser accept every string form?"""
+
+        forms = {
+            (92, 235, 0.): ['U235', 'U-235', '235U', '235-U', 'u235', ' U -235 ',
+                            '92235', '92235.80c', '92235.', '92235.71nc'],
+            (8, 16, 0.): ['O16', '16o', '08016', '8016.70c'],
+            (95, 242, np.inf): ['Am242m', 'AM-242M', 'am242M', '95642',
+                                '95642.70c', 'Am642'],
+            (27, 58, np.inf): ['Co- 58M'],
+            }
+
+        for ref, nuc_ids in forms.items():
+            for nuc_id in nuc_ids:
+                assert nuclide_data.parse_nuclide_id(nuc_id) == ref
+
+            Z, A, E = nuclide_data.parse_nuclide_ids(nuc_ids)
+            assert list(zip(Z, A, E)) == [ref] * len(nuc_ids)
+
+        for nuc_id in ['', 'U', '235', 'Xx235', 'U235x', '235Um', 'U-235-1',
+                       '92235.80c.1']:
+            self.assertRaises(ValueError, nuclide_data.parse_nuclide_id, nuc_id)
+
+        self.assertRaises(ValueError, nuclide_data.parse_nuclide_ids,
+                          ['U235', 'U', 'U235'])
+
+        # Nuclide raises KeyError for an unknown symbol, as sym2z does
+        for nuc_id in ['Xx235', 'Xx-235', '235Xx']:
+            self.assertRaises(KeyError, nuclide_data.Nuclide, nuc_id)
+            self.assertRaises(KeyError, nuclide_data.intern_nuclide, nuc_id)
+        self.assertRaises(ValueError, nuclide_data.Nuclide, 'U235x')
+
+    def test_Nuclide_hash_and_eq(self):
+        """Are Nuclide equality, hashing and ordering consistent?"""
+
+        a = nuclide_data.Nuclide((13, 26, 0.2283))
+        b = nuclide_data.Nuclide((13, 26, 0.2283 + 1e-12))
+        ground = nuclide_data.Nuclide('Al26')
+
+        assert a == b and hash(a) == hash(b)
+        assert len({a, b, ground}) == 2
+        assert {a: 1}[b] == 1
+
+        assert ground < a and not (a < b) and not (b < a)
+        assert sorted([a, nuclide_data.Nuclide('U235'), ground]) == [
+            ground, a, nuclide_data.Nuclide('U235')]
+
+        assert nuclide_data.Nuclide('Li6m') == nuclide_data.Nuclide('LI-6M')
+        assert nuclide_data.Nuclide('Li6m') != nuclide_data.Nuclide('Li6')
+
+        assert ground != 'Al26' and ground != None
+        self.assertRaises(TypeError, lambda: ground < 5)
+
+        # Other objects with Z, A and E compare by the same rounded key
+        from types import SimpleNamespace
+        other = SimpleNamespace(Z=13, A=26, E=0.2283 + 1e-12)
+        assert a == other and other == a and ground != other
+        assert ground < other and not (a < other) and not (other < a)
+        assert sorted([other, ground]) == [ground, other]
+
+        assert not hasattr(ground, '__dict__')
+
+    def test_intern_nuclide(self):
+        """Does intern_nuclide share read-only instances across spellings?"""
+
+        intern = nuclide_data.intern_nuclide
+        intern.cache_clear()
+
+        u235 = intern('U235')
+        assert u235 == nuclide_data.Nuclide('U235')
+        assert u235.weight == nuclide_data.weight('U-235')
+
+        for nuc_id in ['U235', 'u-235', '235U', 92235, "92235",
+                       (92, 235), [92, 235], {'Z': 92, 'A': 235}]:
+            assert intern(nuc_id) is u235
+
+        info = intern.cache_info()
+        assert info['misses'] == 1
+        assert info['hits'] == 1
+        assert info['canonical_hits'] == 7
+
+        # Unspecified isomer energy resolves to the same instance
+        am242m = intern('Am242m')
+        assert intern(95642) is am242m
+        assert intern((95, 242, 0.0486)) is am242m
+        assert am242m.E == 0.0486
+        assert intern((95, 242, 0.04860000001)) is am242m
+        info = intern.cache_info()
+        assert info['misses'] == 2 and info['nuclides'] == 2
+
+        # Identified in either order
+        intern.cache_clear()
+        assert intern((95, 242, 0.0486)) is intern('Am242m')
+        assert intern.cache_info()['nuclides'] == 1
+        intern.cache_clear()
+        am242m = intern('Am242m')
+        assert intern((95, 242, 0.0486)) is am242m
+        assert intern.cache_info()['misses'] == 1
+        assert intern.cache_info()['nuclides'] == 1
+        u235 = intern('U235')
+
+        self.assertRaises(AttributeError, setattr, u235, 'A', 238)
+        assert u235.A == 235
+
+        # Copies and pickles resolve to the shared instance
+        import copy
+        for nuclide in [u235, am242m]:
+            assert pickle.loads(pickle.dumps(nuclide)) is nuclide
+            assert copy.copy(nuclide) is nuclide
+            assert copy.deepcopy(nuclide) is nuclide
+        nuclides = [(intern('Sr90'), 1.), (intern('Y90'), 1.)]
+        assert pickle.loads(pickle.dumps(nuclides)) == nuclides
+
+    def test_intern_nuclide_bounded(self):
+        """Does intern_nuclide evict least recently used entries?"""
+
+        intern = nuclide_data._NuclideInterner(maxsize=2)
+        li6 = intern('Li6')
+        intern('Li7')
+        intern('Li6')
+        intern('Be9')
+
+        info = intern.cache_info()
+        assert info['ids'] == 2 and info['nuclides'] == 2
+        assert info['misses'] == 3
+
+        # 'Li7' was evicted from the identifiers, but not from (Z, A, E)
+        assert intern('Li6') is li6
+        intern('Li7')
+        assert intern.cache_info()['misses'] == 3
+        assert intern.cache_info()['canonical_hits'] == 1
+
+    def test_lazy_loading(self):
+        """Are data sources only loaded when first accessed?"""
+
+        output = run_python(
+            "import nuclide_data as nd\n"
+            "print(sorted(nd._loaded_sources))\n"
+            "nd.mats\n"
+            "print(sorted(nd._loaded_sources))\n"
+            "nd.weight('U')\n"
+            "print(sorted(nd._loaded_sources))\n"
+            "nd.weight('U-235')\n"
+            "print(sorted(nd._loaded_sources))\n")
+
+        assert output.split('\n')[:4] == [
+            "[]",
+            "['mats']",
+            "['elements', 'mats', 'nist']",
+            "['elements', 'mats', 'nist', 'nuclides', 'wallet']"]
+
+    def test_star_import(self):
+        """Does a star import provide the lazily loaded tables?"""
+
+        output = run_python(
+            "from nuclide_data import *\n"
+            "print(len(isotopes[92]), mats[(92, 235, False)])\n")
+
+        assert output.split() == [str(len(nuclide_data.isotopes[92])), '9228']
+
+        # Only the public API and data tables
+        names = nuclide_data.__all__
+        assert 'Nuclide' in names and 'nuclide_table' in names
+        for name in ['OrderedDict', 'lru_cache', 'wraps', '_table_keys',
+                     '_row_masks', 'wallet_lines']:
+            assert not (name in names), name
+
+        # In store mode, only the tables of the store
+        store_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store_dir)
+        store_file = os.path.join(store_dir, 'nuclides.store')
+        nuclide_data.write_store(store_file)
+        output = run_python("import nuclide_data as nd\n"
+                            "from nuclide_data import *\n"
+                            "print(len(nuclide_table), mats[(92, 235, False)])\n"
+                            "print(sorted(nd._loaded_sources))\n",
+                            store_file=store_file).split('\n')
+        assert output[0] == '{} 9228'.format(len(nuclide_data.nuclide_table))
+        assert not ("'nuclides'" in output[1] or "'nist'" in output[1])
+
+        # The package forwards the tables without loading them on import
+        output = run_python(
+            "import importlib.util, sys\n"
+            "import nuclide_data as nd\n"
+            "spec = importlib.util.spec_from_file_location('package',\n"
+            "    '__init__.py', submodule_search_locations=['.'])\n"
+            "package = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(package)\n"
+            "print(sorted(nd._loaded_sources))\n"
+            "print(package.mats[(92, 235, False)], package.weight('U-235'))\n"
+            "nd.enable_stats()\n"
+            "nd.nominal_only = True\n"
+            "print(package.nuc is nd.nuc, package.nominal_only)\n"
+            "print('nuclide_table' in dir(package))\n"
+            ).split('\n')
+        assert output[:4] == ['[]', '9228 {}'.format(nuclide_data.weight('U-235')),
+                              'True True', 'True']
+
+    def test_cache(self):
+        """Is the cache written, reused, and rebuilt when data files change?"""
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        # Use copies of the NIST file and the MAT list so that they can be
+        #  modified.
+        data_file = os.path.join(cache_dir, 'nist.txt')
+        shutil.copy(nuclide_data.data_file, data_file)
+        mat_file = os.path.join(cache_dir, 'mats.list')
+        shutil.copy(nuclide_data.mat_file, mat_file)
+
+        setup = ("import nuclide_data as nd\n"
+                 "nd.data_file = {!r}\n"
+                 "nd.mat_file = {!r}\n").format(data_file, mat_file)
+        code = setup + ("print(nd.weight('U-235'), nd.mats[(92, 235, False)])\n"
+                        "print(sorted(nd._loaded_sources))\n")
+
+        def cache_files():
+            return sorted(f for f in os.listdir(cache_dir)
+                          if f.endswith('.pickle'))
+
+        # First run parses the data files and writes the cache.
+        output = run_python(code, cache_dir).split('\n')
+        assert output[0] == '235.0439299 9228'
+        assert 'wallet' in output[1]
+        assert len(cache_files()) == 1
+
+        # Second run reads the cache, without the raw wallet card data.
+        output = run_python(code, cache_dir).split('\n')
+        assert output[0] == '235.0439299 9228'
+        assert 'wallet' not in output[1]
+        assert len(cache_files()) == 1
+
+        # The MAT list is read directly, without the cache.
+        output = run_python(setup + "nd.mats\n"
+                            "print(sorted(nd._loaded_sources))\n", cache_dir)
+        assert output.split('\n')[0] == "['mats']"
+
+        with open(mat_file) as f:
+            lines = f.read().replace('9228', '9229')
+        with open(mat_file, 'w') as f:
+            f.write(lines)
+        output = run_python(code, cache_dir).split('\n')
+        assert output[0] == '235.0439299 9229'
+        assert 'wallet' not in output[1]
+        assert len(cache_files()) == 1
+
+        # Changing a cached data file invalidates the cache, and the new
+        #  cache replaces the old one.
+        old_cache_files = cache_files()
+        os.utime(data_file, ns=(0, 0))
+        output = run_python(code, cache_dir).split('\n')
+        assert output[0] == '235.0439299 9229'
+        assert 'wallet' in output[1]
+        assert len(cache_files()) == 1 and cache_files() != old_cache_files
+
+    def test_nominal_only(self):
+        """Does the nominal-only mode give floats, and the same tables?"""
+
+        code = ("import nuclide_data as nd\n"
+                "import numpy as np\n"
+                "n = nd.nuclides[(92, 235)][0.]\n"
+                "print(type(n['mass excess']).__name__, n.get('mass excess sigma'),\n"
+                "      type(n['weight']).__name__, nd.weight('U-235'))\n"
+                "np.save({!r}, nd.nuclide_table)\n"
+                "np.save({!r}, nd.element_table)\n")
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        nominal = [os.path.join(cache_dir, name)
+                   for name in ['nuclides.npy', 'elements.npy']]
+
+        # The same output from parsing and from the cache
+        for i in range(2):
+            output = run_python(code.format(*nominal), cache_dir,
+                                nominal_only=True).split()
+            assert output == ['float', '0.001', 'float', '235.0439299']
+
+        for table, filename in zip([nuclide_data.nuclide_table,
+                                    nuclide_data.element_table], nominal):
+            nominal_table = np.load(filename)
+            for field in table.dtype.names:
+                assert np.array_equal(table[field], nominal_table[field],
+                                      equal_nan=table.dtype[field].kind == 'f')
+
+        # Cache files are separate for each mode, and a new cache in one
+        #  mode replaces only the older caches of that mode
+        stale = os.path.join(cache_dir, 'nuclide_data-ufloat-0.pickle')
+        open(stale, 'w').close()
+        run_python(code.format(*nominal), cache_dir)
+        assert not os.path.exists(stale)
+        assert len([f for f in os.listdir(cache_dir)
+                    if f.endswith('.pickle')]) == 2
+
+        # The mode cannot change once data is loaded
+        output = run_python("import nuclide_data as nd\n"
+                            "nd.load_all(nominal_only=True)\n"
+                            "print(type(nd.atomic_weights[92]).__name__)\n"
+                            "try:\n"
+                            "    nd.load_all(nominal_only=False)\n"
+                            "except ValueError:\n"
+                            "    print('ValueError')\n")
+        assert output.split() == ['float', 'ValueError']
+
 
 if __name__ == '__main__':
     unittest.main()
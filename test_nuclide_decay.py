@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Tests for nuclide_decay
+
+"""
+
+import numpy as np
+import unittest
+import warnings
+import nuclide_data
+import nuclide_decay
+
+# Keep the tests out of the user's cache
+nuclide_data.cache_dir = ''
+
+def row(nuc_id):
+    Z, A, E = nuclide_data.parse_nuclide_id(nuc_id)
+    return int(nuclide_data.table_index(Z, A, E))
+
+class TestNuclideDecay(unittest.TestCase):
+
+    def test_transitions(self):
+        """Are decay products and branch fractions correct?"""
+
+        parents, products, yields, modes = nuclide_decay.decay_transitions()
+
+        def products_of(nuc_id):
+            p = parents == row(nuc_id)
+            return dict( (nuclide_data.nuclide_table['A'][i] * 1000
+                          + nuclide_data.nuclide_table['Z'][i], y)
+                         for i, y in zip(products[p], yields[p]) )
+
+        # Alpha decay produces the daughter and He-4; spontaneous fission
+        #  is not followed
+        u238 = products_of('U238')
+        assert sorted(u238) == [4002, 234090]
+        assert np.allclose(list(u238.values()), 1.)
+
+        # Beta-delayed neutron branch is a part of the B- branch
+        li9 = products_of('Li9')
+        assert np.allclose(li9[9004] + li9[8004], 1.)
+        assert np.allclose(li9[1000], li9[8004])
+
+        # Isomeric transition to the ground state
+        am242m = parents == nuclide_data.table_index(95, 242, np.inf)
+        assert row('Am242') in products[am242m]
+
+    def test_decay_levels(self):
+        """Do parents come before their daughters?"""
+
+        parents, products, yields, modes = nuclide_decay.decay_transitions()
+        levels = nuclide_decay.decay_levels()
+        assert (levels[parents] < levels[products]).all()
+
+        # A cycle is reported by its nodes, whatever leads into it
+        parents = np.array([0, 1, 2, 3, 4, 2])
+        products = np.array([1, 2, 3, 4, 2, 5])
+        assert nuclide_decay._graph_levels(parents, products, 6) is None
+        cycle = nuclide_decay._graph_cycle(parents, products, 6)
+        assert sorted(cycle) == [2, 3, 4]
+        i = cycle.index(2)
+        assert cycle[i:] + cycle[:i] == [2, 3, 4]
+        assert nuclide_decay._graph_cycle(parents[:3], products[:3], 6) is None
+
+    def test_decay_graph(self):
+        """Are daughters, parents and chains consistent?"""
+
+        u238 = row('U238')
+        assert [d for d, y in nuclide_decay.daughters(u238)] == [row('Th234')]
+        assert (sorted(d for d, y in nuclide_decay.daughters(u238, True))
+                == sorted([row('Th234'), row('He4')]))
+        assert u238 in [p for p, y in nuclide_decay.parents(row('Th234'))]
+        assert u238 not in [p for p, y in nuclide_decay.parents(row('He4'))]
+        assert u238 in [p for p, y in nuclide_decay.parents(row('He4'), True)]
+
+        order = nuclide_decay.decay_order()
+        position = np.argsort(order)
+        parents, products, yields, modes = nuclide_decay.decay_transitions()
+        assert (position[parents] < position[products]).all()
+
+        # Every chain of U-238 ends at a stable nuclide, mostly Pb-206, and
+        #  the branches add up
+        chains = nuclide_decay.decay_chains(u238)
+        ends = [chain[-1] for chain, branch in chains]
+        assert nuclide_data.nuclide_table['stable'][ends].all()
+        assert max(chains, key=lambda c: c[1])[0][-1] == row('Pb206')
+        assert np.allclose(sum(branch for chain, branch in chains), 1.,
+                           atol=1e-6)
+
+        short = nuclide_decay.decay_chains(u238, max_depth=3)
+        assert [len(chain) for chain, branch in short] == [4]
+        assert nuclide_decay.decay_chains(row('Pb206')) == [((row('Pb206'),), 1.)]
+
+        pruned = nuclide_decay.decay_chains(u238, min_branch=1e-3)
+        assert len(pruned) < len(chains)
+        assert all(branch > 1e-3 for chain, branch in pruned)
+
+    def test_nuclide_graph(self):
+        """Are daughters, parents and chains given as Nuclide objects?"""
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            sr90 = nuclide_data.Nuclide('Sr90')
+            y90 = nuclide_data.Nuclide('Y90')
+
+            assert nuclide_decay.daughter_nuclides(sr90) == [(y90, 1.)]
+            assert nuclide_decay.daughter_nuclides('Sr-90') == [(y90, 1.)]
+            assert (sr90, 1.) in nuclide_decay.parent_nuclides(y90)
+            assert nuclide_decay.nuclide_decay_chains(sr90) == [
+                ((sr90, y90, nuclide_data.Nuclide('Zr90')), 1.)]
+            self.assertRaises(KeyError, nuclide_decay.daughter_nuclides,
+                              (92, 400))
+
+    def test_single_nuclide(self):
+        """Does a single nuclide decay exponentially to its daughter?"""
+
+        N0 = nuclide_decay.inventory({'Co60': 2.})
+        lam = nuclide_data.Nuclide('Co60').decay_const()
+        times = np.array([0., 1e6, 1e8, 1e9])
+
+        N = nuclide_decay.decay(N0, times)
+
+        assert N.shape == (4, len(N0))
+        assert np.allclose(N[:, row('Co60')], 2. * np.exp(-lam * times),
+                           rtol=1e-12)
+        assert np.allclose(N[:, row('Ni60')], 2. * (1. - np.exp(-lam * times)),
+                           rtol=1e-12)
+
+    def test_bateman_chain(self):
+        """Does a two-member chain agree with the Bateman solution?"""
+
+        l1 = nuclide_data.Nuclide('Sr90').decay_const()
+        l2 = nuclide_data.Nuclide('Y90').decay_const()
+
+        for t in [1e3, 1e5, 1e6, 1e9]:
+            N = nuclide_decay.decay(nuclide_decay.inventory({'Sr90': 1.}), t)
+            y90 = l1 / (l2 - l1) * (np.exp(-l1 * t) - np.exp(-l2 * t))
+            assert np.allclose(N[row('Y90')], y90, rtol=1e-10)
+            assert np.allclose(N[row('Zr90')], 1. - np.exp(-l1 * t) - y90,
+                               rtol=1e-10, atol=1e-15)
+
+    def test_nucleon_conservation(self):
+        """Is the number of nucleons conserved in a long alpha decay chain?"""
+
+        A = nuclide_data.nuclide_table['A']
+        N = nuclide_decay.decay(nuclide_decay.inventory({'Ra226': 1.}),
+                                [1e3, 1e10, 1e15])
+
+        assert np.allclose((N * A).sum(axis=1), 226.)
+        assert np.allclose(N[-1, row('Pb206')], 1.)
+        assert np.allclose(N[-1, row('He4')], 5.)
+
+    def test_batch(self):
+        """Does decaying a batch give the same as decaying one at a time?"""
+
+        compositions = [ {'U235': 1.}, {'Cs137': 0.5, 'Sr90': 0.5},
+                         {'Am242m': 1e-3, 'Pu241': 2.}, {} ]
+        inventories = nuclide_decay.inventory(compositions)
+        times = [0., 3.15e7, 3.15e9]
+
+        batch = nuclide_decay.decay(inventories, times)
+        assert batch.shape == (3, 4, len(nuclide_data.nuclide_table))
+
+        for i in range(len(compositions)):
+            single = nuclide_decay.decay(inventories[i], times)
+            assert np.allclose(batch[:, i], single, rtol=1e-14, atol=0.)
+
+        assert (batch[:, 3] == 0.).all()
+
+    def test_bad_times(self):
+        """Are decreasing or negative times rejected?"""
+
+        N0 = nuclide_decay.inventory({'Co60': 1.})
+        self.assertRaises(ValueError, nuclide_decay.decay, N0, [1., 0.5])
+        self.assertRaises(ValueError, nuclide_decay.decay, N0, -1.)
+
+
+    def test_activity(self):
+        """Are activities and decay heat right, per nuclide and per mode?"""
+
+        N = 1e20
+        co60 = nuclide_decay.inventory({'Co60': N})
+        Q = nuclide_data.nuc(27, 60)['decay modes']['B-']['Q-value']
+        activity = N * np.log(2.) / nuclide_data.nuc(27, 60)['half-life']
+
+        assert np.allclose(nuclide_decay.activity(co60).sum(), activity)
+        assert np.allclose(nuclide_decay.decay_heat(co60).sum(),
+                           activity * Q * nuclide_decay.joules_per_mev)
+        by_mode = nuclide_decay.activity_by_mode(co60)
+        assert by_mode.shape == nuclide_decay.mode_names().shape
+        assert np.allclose(by_mode[nuclide_decay.mode_names() == 'B-'], activity)
+        assert (by_mode[nuclide_decay.mode_names() != 'B-'] == 0.).all()
+
+        # Stable nuclides
+        assert (nuclide_decay.activity([1., 1.], ['Fe56', 'O16']) == 0.).all()
+
+        # Decayed inventories at several times, by nuclide id or over the
+        #  whole table
+        compositions = [ {'U235': 1e20, 'U238': 1e20}, {'Cs137': 1e18},
+                         {'Am242m': 1e15, 'Pu241': 2e18} ]
+        nuc_ids = ['U235', 'U238', 'Cs137', 'Am242m', 'Pu241']
+        amounts = np.array([ [c.get(nuc_id, 0.) for nuc_id in nuc_ids]
+                             for c in compositions ])
+        inventories = nuclide_decay.decay(
+            nuclide_decay.inventory(compositions), [0., 3.15e7, 3.15e9])
+        assert np.array_equal(
+            nuclide_decay.activity(amounts, nuc_ids),
+            nuclide_decay.activity(inventories[0])[:, [row(n) for n in nuc_ids]])
+
+        for function in [nuclide_decay.activity_by_mode,
+                         nuclide_decay.decay_heat_by_mode]:
+            assert np.allclose(function(amounts, nuc_ids),
+                               function(inventories[0]), rtol=1e-14, atol=0.)
+
+        heat = nuclide_decay.decay_heat(inventories)
+        heat_by_mode = nuclide_decay.decay_heat_by_mode(inventories)
+        assert heat_by_mode.shape == (3, 3, len(nuclide_decay.mode_names()))
+        assert np.allclose(heat.sum(axis=-1), heat_by_mode.sum(axis=-1),
+                           rtol=1e-12, atol=0.)
+
+        self.assertRaises(ValueError, nuclide_decay.activity, amounts)
+        self.assertRaises(KeyError, nuclide_decay.activity, [1.], ['U400'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Tests for nuclide_masses
+
+"""
+
+import numpy as np
+import unittest
+import nuclide_data
+import nuclide_masses
+
+# Keep the tests out of the user's cache
+nuclide_data.cache_dir = ''
+
+class TestNuclideMasses(unittest.TestCase):
+
+    def test_q_values(self):
+        """Are reaction Q-values right?"""
+
+        assert np.allclose(nuclide_masses.q_value('(n,g)', ['U-235']), 6.5453)
+        assert np.allclose(nuclide_masses.q_value('(n,a)', ['B10']), 2.7893)
+        assert np.allclose(nuclide_masses.q_value('n,p', ['He3']), 0.7637)
+
+        # (n,2n) takes the neutron separation energy
+        targets = ['U238', 'Pb208', 'Be9']
+        assert np.allclose(nuclide_masses.q_value('(n,2n)', targets),
+                           -nuclide_masses.separation_energy('n', targets))
+
+        # An isomer target releases its excitation energy too
+        ground, isomer = nuclide_masses.q_value('(n,g)', ['Am242', 'Am242m'])
+        assert np.allclose(isomer - ground, 0.0486)
+
+        # Products off the chart
+        assert np.isnan(nuclide_masses.q_value('(n,2n)', ['H1']))
+
+        self.assertRaises(ValueError, nuclide_masses.q_value, '(n,x)')
+        self.assertRaises(ValueError, nuclide_masses.q_value, 'n2n')
+        self.assertRaises(KeyError, nuclide_masses.q_value, '(n,g)', ['U400'])
+
+    def test_whole_chart(self):
+        """Do the whole-chart arrays agree with the arrays for a few ids?"""
+
+        table = nuclide_data.nuclide_table
+        rows = [int(nuclide_data.table_index(92, 235)),
+                int(nuclide_data.table_index(26, 56))]
+        for function, args in [(nuclide_masses.q_value, ('(n,p)',)),
+                               (nuclide_masses.separation_energy, ('2n',)),
+                               (nuclide_masses.binding_energy, ())]:
+            chart = function(*args)
+            assert chart.shape == table.shape
+            assert np.array_equal(chart[rows], function(*(args + (['U235', 'Fe56'],))))
+
+    def test_binding_energies(self):
+        """Are binding energies per nucleon right?"""
+
+        B = nuclide_masses.binding_energy_per_nucleon(['Fe56', 'Ni62', 'He4', 'H1'])
+        assert np.allclose(B, [8.7903, 8.7945, 7.0739, 0.], atol=1e-4)
+
+        # The alpha separation energy of Po-212 is negative: it alpha decays
+        assert np.allclose(
+            nuclide_masses.separation_energy('a', ['Po212']),
+            -nuclide_data.nuc(84, 212)['decay modes']['A']['Q-value'], atol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
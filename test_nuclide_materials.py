@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Tests for nuclide_materials
+
+"""
+
+import numpy as np
+import unittest
+import nuclide_data
+import nuclide_materials
+
+# Keep the tests out of the user's cache
+nuclide_data.cache_dir = ''
+
+def row(nuc_id):
+    Z, A, E = nuclide_data.parse_nuclide_id(nuc_id)
+    return int(nuclide_data.table_index(Z, A, E))
+
+class TestNuclideMaterials(unittest.TestCase):
+
+    def test_natural_abundances(self):
+        """Do natural elements expand to their stable isotopes?"""
+
+        rows, fractions = nuclide_materials.natural_abundances(92)
+        assert sorted(rows) == [row('U234'), row('U235'), row('U238')]
+        assert np.allclose(fractions.sum(), 1.)
+
+        # Natural tantalum includes the Ta-180m isomer
+        rows, fractions = nuclide_materials.natural_abundances(73)
+        assert nuclide_data.table_index(73, 180, np.inf) in rows
+
+        self.assertRaises(ValueError, nuclide_materials.natural_abundances, 43)
+
+    def test_water(self):
+        """Are the number densities of water right?"""
+
+        water = {'H': 2., 'O': 1.}
+        assert np.allclose(nuclide_materials.molar_masses(water),
+                           (2 * nuclide_data.weight('H')
+                            + nuclide_data.weight('O')) / 3.)
+
+        N = nuclide_materials.number_densities(water, 1.)
+        assert np.allclose(N.sum(), 3. * 0.6022140 / 18.01528 * 1., rtol=1e-4)
+        assert np.allclose(N[row('H1')] / N[row('H2')], 0.999885 / 0.000115)
+
+        # The same element given as a symbol or a ZAID
+        assert np.allclose(N, nuclide_materials.number_densities(
+            {1000: 2., 'o': 1.}, 1.))
+
+    def test_weight_fractions(self):
+        """Are weight fractions converted to atom fractions?"""
+
+        fuel = {'U235': 0.05, 'U238': 0.95}
+        atoms = nuclide_materials.atom_fractions(fuel, 'weight')
+        masses = nuclide_materials.mass_fractions(fuel, 'weight')
+
+        assert np.allclose(masses[row('U235')], 0.05)
+        w235, w238 = nuclide_data.weight('U-235'), nuclide_data.weight('U-238')
+        assert np.allclose(atoms[row('U235')],
+                           0.05 / w235 / (0.05 / w235 + 0.95 / w238))
+        assert np.allclose(nuclide_materials.atom_fractions(
+            {'U235': atoms[row('U235')], 'U238': atoms[row('U238')]}), atoms)
+
+    def test_batch(self):
+        """Does a batch give the same as one composition at a time?"""
+
+        compositions = [ {'Fe': 0.7, 'Cr': 0.18, 'Ni': 0.12},
+                         {'U235': 1.},
+                         {'H': 2., 'O': 1., 'B10': 1e-3},
+                         {} ]
+        fractions = ['weight', 'atom', 'atom', 'atom']
+        densities = np.array([7.9, 19.1, 1.0, 1.0])
+
+        N = nuclide_materials.number_densities(compositions, densities, fractions)
+        assert N.shape == (4, len(nuclide_data.nuclide_table))
+        for i, composition in enumerate(compositions[:3]):
+            assert np.allclose(N[i], nuclide_materials.number_densities(
+                composition, densities[i], fractions[i]), rtol=1e-14, atol=0.)
+        assert (N[3] == 0.).all()
+
+        self.assertRaises(KeyError, nuclide_materials.number_densities,
+                          [{(92, 400): 1.}], 1.)
+
+
+if __name__ == '__main__':
+    unittest.main()